@@ -11,6 +11,9 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'helpers'))
 
 from data_cleaning import DataCleaner
 from metric_calculator import MetricsCalculator
+from output_writers import DEFAULT_FORMAT, output_formats
+from background_task import BackgroundTask, poll_events
+from instrumentation import RunProfile
 
 class LeadAnalysisApp:
     def __init__(self, root):
@@ -21,6 +24,7 @@ class LeadAnalysisApp:
         self.cleaner = DataCleaner()
         self.metrics_calculator = MetricsCalculator()
         self.current_output_folder = None
+        self.task = None
         
         self.setup_ui()
     
@@ -57,13 +61,32 @@ class LeadAnalysisApp:
         process_frame = ttk.LabelFrame(main_frame, text="2. Process Data", padding="15")
         process_frame.pack(fill=tk.X, pady=10)
         
-        ttk.Button(process_frame, text="🚀 Start Data Processing & Call Analysis", 
-                  command=self.process_data).pack(pady=10)
+        buttons_frame = ttk.Frame(process_frame)
+        buttons_frame.pack(pady=10)
+        
+        self.start_button = ttk.Button(buttons_frame, text="🚀 Start Data Processing & Call Analysis", 
+                                       command=self.process_data)
+        self.start_button.pack(side=tk.LEFT, padx=5)
+        
+        self.cancel_button = ttk.Button(buttons_frame, text="⏹ Cancel", 
+                                        command=self.cancel_processing, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        
+        # Output format for the saved reports
+        format_frame = ttk.Frame(process_frame)
+        format_frame.pack()
+        ttk.Label(format_frame, text="Save reports as:").pack(side=tk.LEFT, padx=5)
+        self.output_format = tk.StringVar(value=DEFAULT_FORMAT)
+        ttk.Combobox(format_frame, textvariable=self.output_format, values=output_formats(),
+                     state="readonly", width=10).pack(side=tk.LEFT)
         
         # Progress
-        self.progress = ttk.Progressbar(main_frame, mode='indeterminate')
+        self.progress = ttk.Progressbar(main_frame, mode='determinate', maximum=100)
         self.progress.pack(fill=tk.X, pady=5)
         
+        self.progress_label = ttk.Label(main_frame, text="")
+        self.progress_label.pack()
+        
         # Results
         self.results_frame = ttk.LabelFrame(main_frame, text="3. Processing Results", padding="15")
         self.results_frame.pack(fill=tk.BOTH, expand=True, pady=10)
@@ -95,40 +118,104 @@ class LeadAnalysisApp:
             messagebox.showerror("Error", "Please select a folder first!")
             return
         
+        if self.task is not None and self.task.is_running():
+            return
+        
+        self.log_message("🔄 Starting data processing and call analysis...")
+        self.log_message("=" * 60)
+        self.progress['value'] = 0
+        self.start_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        
+        # Processing runs on a worker thread; progress comes back as events polled with after()
+        self.task = BackgroundTask(self.run_processing, self.folder_path.get(), self.output_format.get()).start()
+        poll_events(self.root, self.task, self.handle_task_event)
+    
+    def run_processing(self, reporter, folder_path, output_format):
+        """Worker thread: clean, analyse and save - must not touch Tk widgets"""
+        # One profile per run, saved as run_profile.json with the reports
+        self.cleaner.profile = self.metrics_calculator.profile = RunProfile()
+        self.cleaner.progress_callback = reporter.progress
         try:
-            self.progress.start()
-            self.log_message("🔄 Starting data processing and call analysis...")
-            self.log_message("=" * 60)
-            self.root.update()
-            
             # Process all data (leads, updates, call logs)
-            leads_df, updates_df, call_logs_df = self.cleaner.process_all_data(self.folder_path.get())
-            
-            if leads_df.empty and updates_df.empty and call_logs_df.empty:
-                self.progress.stop()
-                self.log_message("❌ No valid data found to process!")
-                return
-            
-            # Generate call analysis from call logs only
-            self.log_message("\n📊 Generating call analysis table...")
+            leads_df, updates_df, call_logs_df = self.cleaner.process_all_data(folder_path)
+        finally:
+            self.cleaner.progress_callback = None
+        
+        if leads_df.empty and updates_df.empty and call_logs_df.empty:
+            return None
+        
+        # Generate call analysis from call logs only (cancellable between source files)
+        reporter.log("\n📊 Generating call analysis table...")
+        self.metrics_calculator.progress_callback = reporter.progress
+        try:
             call_analysis_df = self.metrics_calculator.generate_call_analysis_table(call_logs_df)
+        finally:
+            self.metrics_calculator.progress_callback = None
+        
+        # Save all results - the last cancellation point, saving itself runs to the end
+        # so a cancelled run never leaves a half-written report folder
+        reporter.progress('saving', done=0, total=1)
+        base_output_folder = os.path.join(os.path.dirname(__file__), 'results')
+        output_folder = self.metrics_calculator.save_all_reports(
+            base_output_folder, 
+            leads_df, updates_df, call_logs_df, call_analysis_df,
+            output_format
+        )
+        
+        return leads_df, updates_df, call_logs_df, call_analysis_df, output_folder, self.metrics_calculator.cleaned_folder
+    
+    def cancel_processing(self):
+        if self.task is not None and self.task.is_running():
+            self.task.cancel()
+            self.cancel_button.config(state=tk.DISABLED)
+            self.progress_label.config(text="Cancelling after the current file...")
+    
+    def handle_task_event(self, event):
+        """Tk thread: apply one event from the worker"""
+        kind = event['kind']
+        
+        if kind == 'progress':
+            self.show_progress(event)
+            if event['stage'] == 'saving':
+                # Saving can't be interrupted
+                self.cancel_button.config(state=tk.DISABLED)
+        elif kind == 'log':
+            self.log_message(event['message'])
+        else:
+            self.start_button.config(state=tk.NORMAL)
+            self.cancel_button.config(state=tk.DISABLED)
+            self.progress_label.config(text="")
             
-            # Save all results
-            base_output_folder = os.path.join(os.path.dirname(__file__), 'results')
-            output_folder = self.metrics_calculator.save_all_reports(
-                base_output_folder, 
-                leads_df, updates_df, call_logs_df, call_analysis_df
-            )
-            
-            self.progress.stop()
-            self.show_results(leads_df, updates_df, call_logs_df, call_analysis_df, output_folder)
-            
-        except Exception as e:
-            self.progress.stop()
-            self.log_message(f"❌ Error: {str(e)}")
-            messagebox.showerror("Processing Error", f"An error occurred: {str(e)}")
+            if kind == 'done':
+                self.progress['value'] = 100
+                if event['result'] is None:
+                    self.log_message("❌ No valid data found to process!")
+                else:
+                    self.show_results(*event['result'])
+            elif kind == 'cancelled':
+                self.progress['value'] = 0
+                self.log_message("⏹ Processing cancelled - nothing was saved.")
+            else:
+                self.progress['value'] = 0
+                self.log_message(f"❌ Error: {str(event['error'])}")
+                messagebox.showerror("Processing Error", f"An error occurred: {str(event['error'])}")
+    
+    def show_progress(self, event):
+        """Determinate bar: each stage owns a slice of the bar, filled by done/total"""
+        stages = ['reading', 'leads', 'updates', 'call_logs', 'analysis', 'saving']
+        position = stages.index(event['stage']) if event['stage'] in stages else 0
+        fraction = event['done'] / event['total'] if event['total'] else 0
+        self.progress['value'] = 100 * (position + fraction) / len(stages)
+        
+        text = f"{event['stage'].replace('_', ' ').title()}: {event['done']}/{event['total']}"
+        if event['file']:
+            text += f" - {os.path.basename(event['file'])}"
+        if event['rows'] is not None:
+            text += f" ({event['rows']:,} rows)"
+        self.progress_label.config(text=text)
     
-    def show_results(self, leads_df, updates_df, call_logs_df, call_analysis_df, output_folder):
+    def show_results(self, leads_df, updates_df, call_logs_df, call_analysis_df, output_folder, cleaned_folder):
         self.log_message("\n🎉 DATA PROCESSING COMPLETE!")
         self.log_message("=" * 60)
         
@@ -155,18 +242,16 @@ class LeadAnalysisApp:
             for i, (_, row) in enumerate(top_called.iterrows()):
                 self.log_message(f"   {i+1}. {row['phone']} - {int(row['no_of_times_called'])} calls")
         
-        # Show the exact folder path
+        # Show the exact folder paths and the files actually written (their extension follows the output format)
         folder_name = os.path.basename(output_folder)
         self.log_message(f"\n💾 REPORTS SAVED TO:")
-        self.log_message(f"   📁 {output_folder}")
-        self.log_message(f"   📄 cleaned_leads.csv")
-        self.log_message(f"   📄 cleaned_updates.csv")
-        self.log_message(f"   📄 cleaned_call_logs.csv")
-        self.log_message(f"   📄 overall_performance.csv")
-        self.log_message(f"   📄 call_analysis_table.csv ← NEW! (Detailed call metrics)")
+        for folder in [cleaned_folder, output_folder]:
+            self.log_message(f"   📁 {folder}")
+            for file_name in sorted(os.listdir(folder)):
+                self.log_message(f"      📄 {file_name}")
         self.log_message(f"\n⏰ Timestamp: {folder_name}")
         
-        self.log_message(f"\n✅ Processing complete! Check the call_analysis_table.csv for detailed call insights.")
+        self.log_message(f"\n✅ Processing complete! Check the call analysis table for detailed call insights.")
         
         # Store the output folder for the open button
         self.current_output_folder = output_folder
@@ -208,13 +293,13 @@ class LeadAnalysisApp:
             widget.destroy()
         self.action_frame.pack_forget()
         self.current_output_folder = None
+        self.progress['value'] = 0
         self.log_message("🔄 Ready to process another folder...")
         self.log_message("Please select a new folder and click 'Start Data Processing & Call Analysis'")
     
     def log_message(self, message):
         self.results_text.insert(tk.END, message + "\n")
         self.results_text.see(tk.END)
-        self.root.update()
 
 if __name__ == "__main__":
     # Check if pandas is installed
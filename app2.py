@@ -1,9 +1,17 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import os
+import sys
+
+# Add helpers to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'helpers'))
+
+from virtual_table import VirtualTable, format_datetime
+from duration_parser import parse_durations, unparseable_durations
+from call_gaps import phone_call_records
 
 class CallLogProcessor:
     def __init__(self):
@@ -32,7 +40,7 @@ class CallLogProcessor:
             self.df = self.df[self.df['To Number'].str.len() >= 7]  # Minimum reasonable phone number length
             
             # Convert Duration to seconds
-            self.df['Duration_Seconds'] = self.df['Duration'].apply(self.parse_duration)
+            self.df['Duration_Seconds'] = self.parse_duration_column(self.df['Duration'])
             
             return True
             
@@ -41,88 +49,25 @@ class CallLogProcessor:
             return False
     
     def parse_duration(self, duration_str):
-        """Convert duration string to total seconds"""
-        try:
-            if pd.isna(duration_str) or duration_str == '':
-                return 0
-            
-            # Handle different duration formats
-            if 'h' in duration_str and 'm' in duration_str and 's' in duration_str:
-                # Format: "00h 00m 00s"
-                parts = duration_str.split()
-                hours = int(parts[0].replace('h', '')) if len(parts) > 0 else 0
-                minutes = int(parts[1].replace('m', '')) if len(parts) > 1 else 0
-                seconds = int(parts[2].replace('s', '')) if len(parts) > 2 else 0
-                return hours * 3600 + minutes * 60 + seconds
-            else:
-                return 0
-        except:
-            return 0
+        """Convert duration string to total seconds (0 if missing or unparseable)"""
+        return int(self.parse_duration_column(pd.Series([duration_str], dtype=object), report=False).iloc[0])
     
-    def calculate_time_gaps(self, dates):
-        """Calculate average gap between consecutive calls"""
-        if len(dates) <= 1:
-            return 0
-        
-        dates_sorted = sorted(dates)
-        gaps = []
-        
-        for i in range(1, len(dates_sorted)):
-            gap = (dates_sorted[i] - dates_sorted[i-1]).total_seconds() / 3600  # Gap in hours
-            gaps.append(gap)
-        
-        return np.mean(gaps) if gaps else 0
+    def parse_duration_column(self, durations, report=True):
+        """Whole seconds for a Duration column; missing and unparseable cells count as 0"""
+        seconds = parse_durations(durations)
+        if report:
+            unparseable = int(unparseable_durations(durations, seconds).sum())
+            if unparseable:
+                print(f"⚠️ {unparseable} durations could not be parsed and count as 0 seconds")
+        return seconds.fillna(0).round().astype(np.int64)
     
     def process_data(self):
         """Process the data and create records for each phone number"""
         if self.df is None:
             return None
         
-        records = []
-        
-        # Group by phone number
-        for phone_number, group in self.df.groupby('To Number'):
-            total_calls = len(group)
-            total_duration = group['Duration_Seconds'].sum()
-            call_dates = group['Date Time'].tolist()
-            call_times = group['Time'].tolist()
-            
-            # Calculate metrics
-            avg_gap_hours = self.calculate_time_gaps(call_dates)
-            first_call = min(call_dates) if call_dates else None
-            last_call = max(call_dates) if call_dates else None
-            
-            # Get name (most frequent one)
-            names = group['Name'].value_counts()
-            most_common_name = names.index[0] if len(names) > 0 else 'Unknown'
-            
-            # Format date-time called column - ALL dates and times
-            date_time_called = []
-            for date, time in zip(call_dates, call_times):
-                if pd.notna(date):
-                    date_str = date.strftime('%Y-%m-%d')
-                    date_time_called.append(f"{date_str} {time}")
-                else:
-                    date_time_called.append(f"Unknown Date {time}")
-            
-            # Join all dates and times with comma separation
-            all_dates_times = ', '.join(date_time_called)
-            
-            records.append({
-                'Phone Number': phone_number,
-                'Name': most_common_name,
-                'Total Calls': total_calls,
-                'Total Duration (seconds)': total_duration,
-                'Total Duration (HH:MM:SS)': str(timedelta(seconds=int(total_duration))),
-                'First Call Date': first_call,
-                'Last Call Date': last_call,
-                'Avg Gap (hours)': round(avg_gap_hours, 2),
-                'All Dates and Times': all_dates_times,  # NEW: All dates and times in one column
-                'Call Dates': call_dates,
-                'Call Times': call_times
-            })
-        
-        self.processed_data = pd.DataFrame(records)
+        # All phones at once: one sort by (phone, time) instead of a loop per phone
+        self.processed_data = phone_call_records(self.df)
         return self.processed_data
     
     def save_results(self, file_path):
@@ -134,7 +79,6 @@ class CallLogProcessor:
         try:
             # Create export version - KEEP the 'All Dates and Times' column
             export_df = self.processed_data.copy()
-            export_df = export_df.drop(['Call Dates', 'Call Times'], axis=1)
             
             # Format dates
             export_df['First Call Date'] = export_df['First Call Date'].dt.strftime('%Y-%m-%d %H:%M:%S')
@@ -209,6 +153,10 @@ class CallLogApp:
         self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         
+        # Virtualized rows with sorting (click a heading) and filtering
+        self.table = VirtualTable(self.tree, scrollbar)
+        self.table.build_filter_bar(results_frame).grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        
         # Save button
         ttk.Button(main_frame, text="Save Results", 
                  command=self.save_results).grid(row=3, column=0, pady=10)
@@ -251,21 +199,20 @@ class CallLogApp:
     
     def display_results(self, results):
         """Display results in the treeview"""
-        # Clear existing data
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Add new data
-        for _, row in results.iterrows():
-            self.tree.insert('', tk.END, values=(
-                row['Phone Number'],
-                row['Name'],
-                row['Total Calls'],
-                row['Total Duration (HH:MM:SS)'],
-                row['First Call Date'].strftime('%Y-%m-%d %H:%M') if pd.notna(row['First Call Date']) else 'N/A',
-                row['Last Call Date'].strftime('%Y-%m-%d %H:%M') if pd.notna(row['Last Call Date']) else 'N/A',
-                row['Avg Gap (hours)']
-            ))
+        # Only the visible window of rows is materialized in the tree
+        self.table.set_data(
+            results,
+            columns={
+                'Phone': 'Phone Number',
+                'Name': 'Name',
+                'Total Calls': 'Total Calls',
+                'Total Duration': 'Total Duration (HH:MM:SS)',
+                'First Call': 'First Call Date',
+                'Last Call': 'Last Call Date',
+                'Avg Gap': 'Avg Gap (hours)'
+            },
+            formatters={'First Call': format_datetime, 'Last Call': format_datetime}
+        )
     
     def save_results(self):
         """Save processed results to file"""
@@ -4,7 +4,14 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import os
 import glob
-import re
+import sys
+
+# Add helpers to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'helpers'))
+
+from phone_normalizer import normalize_phone, normalize_phone_series, COUNTRY_CODE_FORMAT
+from virtual_table import VirtualTable
+from column_roles import APP4_COLUMNS, APP4_UPDATE_COLUMNS
 
 class LeadsProcessor:
     def __init__(self):
@@ -13,82 +20,11 @@ class LeadsProcessor:
         
     def standardize_phone_number(self, phone_str):
         """Standardize phone number to start with 94 country code"""
-        if pd.isna(phone_str) or phone_str == '':
-            return phone_str
-            
-        # Convert to string and remove all non-digit characters using regex
-        clean_number = re.sub(r'\D', '', str(phone_str))
-        
-        # Remove trailing zeros
-        clean_number = clean_number.rstrip('0')
-        
-        # If number is empty after cleaning, return as is
-        if not clean_number:
-            return phone_str
-            
-        # Standardize to 94 country code
-        if clean_number.startswith('94'):
-            # Already starts with 94, ensure proper length
-            if len(clean_number) >= 9:  # 94 + 7 digits minimum
-                return clean_number
-            else:
-                return phone_str  # Return original if too short
-        elif len(clean_number) == 9:
-            # 9-digit number without country code, add 94
-            return '94' + clean_number
-        elif len(clean_number) == 10 and clean_number.startswith('0'):
-            # 10-digit number starting with 0, replace 0 with 94
-            return '94' + clean_number[1:]
-        elif len(clean_number) == 7:
-            # 7-digit local number, add 94
-            return '94' + clean_number
-        else:
-            # For other formats, try to make it start with 94
-            if len(clean_number) > 9:
-                # If longer than 9 digits, assume it includes country code but not 94
-                # Try to extract last 9 digits and add 94
-                last_9_digits = clean_number[-9:]
-                return '94' + last_9_digits
-            else:
-                return '94' + clean_number  # Default: add 94 prefix
+        return normalize_phone(phone_str, COUNTRY_CODE_FORMAT)
     
     def identify_update_columns(self, df_columns):
-        """Identify update/follow-up columns based on common naming patterns"""
-        update_patterns = [
-            # Numbered calls
-            r'.*call.*1.*', r'.*1.*call.*', r'first.*call', r'call.*one',
-            r'.*call.*2.*', r'.*2.*call.*', r'second.*call', r'call.*two',
-            r'.*call.*3.*', r'.*3.*call.*', r'third.*call', r'call.*three',
-            r'.*call.*4.*', r'.*4.*call.*', r'fourth.*call',
-            r'.*call.*5.*', r'.*5.*call.*', r'fifth.*call',
-            r'.*call.*6.*', r'.*6.*call.*', r'sixth.*call',
-            r'.*call.*7.*', r'.*7.*call.*', r'seventh.*call',
-            
-            # Follow-ups
-            r'.*follow.*up.*1.*', r'.*1.*follow.*up.*', r'first.*follow.*up',
-            r'.*follow.*up.*2.*', r'.*2.*follow.*up.*', r'second.*follow.*up',
-            r'.*follow.*up.*3.*', r'.*3.*follow.*up.*', r'third.*follow.*up',
-            r'.*follow.*up.*4.*', r'.*4.*follow.*up.*', r'fourth.*follow.*up',
-            r'.*follow.*up.*5.*', r'.*5.*follow.*up.*', r'fifth.*follow.*up',
-            r'.*follow.*up.*6.*', r'.*6.*follow.*up.*', r'sixth.*follow.*up',
-            r'.*follow.*up.*7.*', r'.*7.*follow.*up.*', r'seventh.*follow.*up',
-            
-            # Weekend calls
-            r'weekend.*call', r'weekend.*follow.*up',
-            
-            # General update patterns
-            r'update', r'followup', r'follow.*up', r'status'
-        ]
-        
-        update_columns = []
-        for col in df_columns:
-            col_lower = str(col).lower()
-            for pattern in update_patterns:
-                if re.search(pattern, col_lower):
-                    update_columns.append(col)
-                    break
-        
-        return update_columns
+        """Identify update/follow-up columns based on common naming patterns (column_roles.APP4_UPDATE_COLUMNS)"""
+        return APP4_UPDATE_COLUMNS.columns(df_columns, 'Update')
     
     def merge_update_columns(self, row, update_columns):
         """Merge multiple update columns into one"""
@@ -169,27 +105,11 @@ class LeadsProcessor:
             # Map common column names to standard names
             column_mapping = {}
             for col in self.df.columns:
-                col_lower = str(col).lower()
-                
-                # Identify name columns
-                if any(pattern in col_lower for pattern in ['name', 'fullname', 'full name', 'contact name']):
-                    column_mapping[col] = 'Name'
-                    required_columns.append('Name')
-                
-                # Identify email columns
-                elif any(pattern in col_lower for pattern in ['email', 'e-mail', 'mail']):
-                    column_mapping[col] = 'Email'
-                    required_columns.append('Email')
-                
-                # Identify phone columns
-                elif any(pattern in col_lower for pattern in ['phone', 'mobile', 'contact', 'number', 'telephone']):
-                    column_mapping[col] = 'Phone'
-                    required_columns.append('Phone')
-                
-                # Identify city columns
-                elif any(pattern in col_lower for pattern in ['city', 'location', 'area']):
-                    column_mapping[col] = 'City'
-                    required_columns.append('City')
+                # Name, email, phone or city - the first of these the header matches
+                role = APP4_COLUMNS.role(col)
+                if role is not None:
+                    column_mapping[col] = role
+                    required_columns.append(role)
             
             # Rename columns
             self.df = self.df.rename(columns=column_mapping)
@@ -203,7 +123,7 @@ class LeadsProcessor:
             
             # Clean and standardize phone numbers
             if 'Phone' in self.df.columns:
-                self.df['Phone'] = self.df['Phone'].apply(self.standardize_phone_number)
+                self.df['Phone'] = normalize_phone_series(self.df['Phone'], COUNTRY_CODE_FORMAT)
             
             # Merge update columns into one
             if update_columns:
@@ -298,6 +218,10 @@ class LeadsApp:
         self.tree.configure(yscrollcommand=scrollbar.set)
         scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         
+        # Virtualized rows with sorting (click a heading) and filtering
+        self.table = VirtualTable(self.tree, scrollbar)
+        self.table.build_filter_bar(results_frame).grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        
         # Save button
         ttk.Button(main_frame, text="Save Results", 
                  command=self.save_results).grid(row=3, column=0, pady=10)
@@ -339,26 +263,8 @@ class LeadsApp:
     
     def display_results(self, results):
         """Display results in the treeview"""
-        # Clear existing data
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Configure treeview columns based on data
-        self.tree["columns"] = list(results.columns)
-        for col in results.columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=150)
-        
-        # Add data to treeview
-        for _, row in results.iterrows():
-            values = []
-            for col in results.columns:
-                value = row[col]
-                if pd.isna(value):
-                    values.append('')
-                else:
-                    values.append(str(value))
-            self.tree.insert('', tk.END, values=values)
+        # Only the visible window of rows is materialized in the tree; columns follow the data
+        self.table.set_data(results)
     
     def save_results(self):
         """Save processed results to file"""
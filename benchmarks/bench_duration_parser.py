@@ -0,0 +1,156 @@
+# benchmarks/bench_duration_parser.py
+"""Compare the vectorized duration parser with the old cell-by-cell parsers
+
+Usage: python benchmarks/bench_duration_parser.py [--rows 5000000] [--min-speedup 10] [--repeat 1]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'helpers'))
+
+from duration_parser import parse_durations, unparseable_durations
+
+
+def legacy_parse_duration(duration_str):
+    """Row-wise UnifiedProcessor/CallLogProcessor.parse_duration as it was before duration_parser"""
+    try:
+        if pd.isna(duration_str) or duration_str == '':
+            return 0
+        if 'h' in duration_str and 'm' in duration_str and 's' in duration_str:
+            parts = duration_str.split()
+            hours = int(parts[0].replace('h', '')) if len(parts) > 0 else 0
+            minutes = int(parts[1].replace('m', '')) if len(parts) > 1 else 0
+            seconds = int(parts[2].replace('s', '')) if len(parts) > 2 else 0
+            return hours * 3600 + minutes * 60 + seconds
+        else:
+            return 0
+    except:
+        return 0
+
+
+def legacy_parse_duration_to_seconds(duration):
+    """Row-wise MetricsCalculator._parse_duration_to_seconds as it was before duration_parser"""
+    try:
+        if isinstance(duration, (int, float)):
+            return float(duration)
+        duration_str = str(duration).lower().strip()
+        if ':' in duration_str:
+            parts = duration_str.split(':')
+            if len(parts) == 3:
+                hours, minutes, seconds = map(float, parts)
+                return hours * 3600 + minutes * 60 + seconds
+            elif len(parts) == 2:
+                minutes, seconds = map(float, parts)
+                return minutes * 60 + seconds
+        if 'hour' in duration_str or 'hr' in duration_str:
+            numbers = re.findall(r'\d+', duration_str)
+            return (float(numbers[0]) if numbers else 1) * 3600
+        elif 'min' in duration_str:
+            numbers = re.findall(r'\d+', duration_str)
+            return (float(numbers[0]) if numbers else 5) * 60
+        elif 'sec' in duration_str:
+            numbers = re.findall(r'\d+', duration_str)
+            return float(numbers[0]) if numbers else 30
+        numbers = re.findall(r'\d+', duration_str)
+        if numbers:
+            return float(numbers[0]) * 60
+    except:
+        pass
+    return 0
+
+
+def make_scenarios(rows, seed=0):
+    """Duration columns as they arrive from the exports
+
+    - dialer export: "00h 02m 49s" text, the only format the app parsers read
+    - spreadsheet durations: H:MM:SS, MM:SS, "5 min"/"1 hour"/"45 sec" text and
+      numbers in one object column - the formats MetricsCalculator read
+    - mixed: both of the above plus blanks and junk, where the old parsers disagree
+    Talk times repeat (a few thousand distinct values), like real call logs.
+    Returns {name: (durations, legacy parser or None when the parsers disagree, speedup_is_gated)} -
+    the --min-speedup gate applies to the dialer export; object columns holding
+    numbers are bounded by hashing the Python objects.
+    """
+    rng = np.random.default_rng(seed)
+    talk = rng.gamma(1.5, 90, rows).astype(np.int64)
+    hours, minutes, seconds = talk // 3600, talk // 60 % 60, talk % 60
+
+    dialer = pd.Series(hours.astype(str), dtype=object).str.zfill(2) + 'h ' \
+        + pd.Series(minutes.astype(str)).str.zfill(2) + 'm ' + pd.Series(seconds.astype(str)).str.zfill(2) + 's'
+
+    clock = pd.Series(hours.astype(str)) + ':' + pd.Series(minutes.astype(str)).str.zfill(2) + ':' \
+        + pd.Series(seconds.astype(str)).str.zfill(2)
+    short_clock = pd.Series((talk // 60).astype(str)) + ':' + pd.Series(seconds.astype(str)).str.zfill(2)
+    spoken = np.array(['1 hour', '2 hours', '5 min', '10 mins', '45 sec', '30 secs'], dtype=object)
+    kind = rng.integers(0, 4, rows)
+    spreadsheet = pd.Series(np.select(
+        [kind == 0, kind == 1, kind == 2],
+        [clock.to_numpy(dtype=object), short_clock.to_numpy(dtype=object), rng.choice(spoken, rows)],
+        talk.astype(object),
+    ), dtype=object)
+
+    mixed = dialer.where(rng.random(rows) < 0.5, spreadsheet)
+    mixed[rng.random(rows) < 0.01] = ''
+    mixed[rng.random(rows) < 0.01] = 'not answered'
+    mixed[rng.random(rows) < 0.01] = None
+
+    return {
+        'dialer export ("00h 02m 49s")': (dialer, legacy_parse_duration, True),
+        'spreadsheet durations (mixed object)': (spreadsheet, legacy_parse_duration_to_seconds, False),
+        'mixed with blanks and junk': (mixed, None, False),
+    }
+
+
+def time_call(func, repeat):
+    """Best wall time of `repeat` runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    parser.add_argument('--min-speedup', type=float, default=10.0)
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+
+    scenarios = make_scenarios(args.rows)
+    print(f"⏱️ {args.rows:,} durations per scenario")
+
+    failed = False
+    for name, (durations, legacy, gated) in scenarios.items():
+        print(f"\n{name}")
+        actual, vectorized_seconds = time_call(lambda: parse_durations(durations), args.repeat)
+        unparseable = int(unparseable_durations(durations, actual).sum())
+
+        if legacy is None:
+            for label, parse in [('app parse_duration', legacy_parse_duration),
+                                 ('metrics parser', legacy_parse_duration_to_seconds)]:
+                expected, legacy_seconds = time_call(lambda: durations.apply(parse), args.repeat)
+                agree = int((expected.astype(float) == actual.fillna(0)).sum())
+                print(f"   {label}: apply {legacy_seconds:.2f}s | agrees on {agree:,} of {len(durations):,} cells")
+            print(f"   vectorized {vectorized_seconds:.2f}s | {unparseable:,} cells flagged unparseable")
+            continue
+
+        expected, legacy_seconds = time_call(lambda: durations.apply(legacy), args.repeat)
+        same = np.array_equal(expected.to_numpy(dtype=float), actual.to_numpy())
+        speedup = legacy_seconds / vectorized_seconds
+        print(f"   apply {legacy_seconds:.2f}s | vectorized {vectorized_seconds:.2f}s "
+              f"| {speedup:.1f}x | identical output: {same} | unparseable: {unparseable:,}")
+        failed |= not same or (gated and speedup < args.min_speedup)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_lead_resolution.py
+"""Time fuzzy lead resolution on a synthetic lead list with known duplicates
+
+Usage: python benchmarks/bench_lead_resolution.py [--leads 1000000] [--duplicates 0.3] [--max-seconds 0]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'helpers'))
+
+from lead_resolution import canonical_leads, resolve_leads
+
+SYLLABLES = ['ka', 'ma', 'ni', 'su', 'ra', 'de', 'wi', 'la', 'pe', 'sa', 'tha', 'ri', 'ya', 'go', 'na', 'di', 'ku',
+             'ha', 'ba', 'je']
+DOMAINS = ['gmail.com', 'yahoo.com', 'hotmail.com']
+CITIES = ['Colombo', 'Kandy', 'Galle', 'Kurunegala', 'Negombo', 'Matara', 'Jaffna', 'Anuradhapura']
+
+
+def _misspell(names, rng):
+    """Each name with one letter doubled ("Nimal" -> "Nimmal")"""
+    return np.array([name[:at] + name[at] + name[at:] for name, at in
+                     zip(names, rng.integers(1, 6, len(names)))], dtype=object)
+
+
+def make_leads(count, duplicate_share, seed=0):
+    """Leads where duplicate_share of the rows re-enter an earlier person; returns (leads, person of each row)
+
+    Re-entries misspell the name half the time and are one of:
+    - same phone in another notation, email often left out
+    - a new phone but the same email
+    - the phone with a mistyped operator prefix and no email
+    - a new phone and the same mailbox at another email domain
+    """
+    rng = np.random.default_rng(seed)
+    people = int(count * (1 - duplicate_share))
+    first = np.array([''.join(rng.choice(SYLLABLES, 3)).title() for _ in range(3000)])
+    last = np.array([''.join(rng.choice(SYLLABLES, 4)).title() for _ in range(2000)])
+    names = np.char.add(np.char.add(rng.choice(first, people), ' '), rng.choice(last, people)).astype(object)
+    subscribers = rng.integers(700_000_000, 789_999_999, people)
+    mailboxes = pd.Series(names).str.lower().str.replace(' ', '.') + rng.integers(0, 99, people).astype(str)
+    leads = pd.DataFrame({
+        'name': names,
+        'phone': '0' + pd.Series(subscribers.astype(str)),
+        'email': mailboxes + '@' + rng.choice(DOMAINS, people),
+        'city': rng.choice(CITIES, people),
+    })
+
+    person = rng.integers(0, people, count - people)
+    again = leads.iloc[person].reset_index(drop=True)
+    typo = rng.random(len(again)) < 0.5
+    again.loc[typo, 'name'] = _misspell(again.loc[typo, 'name'].to_numpy(), rng)
+
+    kind = rng.integers(0, 4, len(again))
+    same_phone, same_email, mistyped, other_domain = (kind == k for k in range(4))
+    again.loc[same_phone, 'phone'] = '94' + again.loc[same_phone, 'phone'].str[1:]
+    again.loc[same_phone & (rng.random(len(again)) < 0.5), 'email'] = None
+    new_phones = '0' + pd.Series(rng.integers(700_000_000, 789_999_999, len(again)).astype(str))
+    again.loc[same_email | other_domain, 'phone'] = new_phones[same_email | other_domain]
+    again.loc[mistyped, 'phone'] = '07' + pd.Series(rng.integers(0, 9, len(again)).astype(str))[mistyped] \
+        + again.loc[mistyped, 'phone'].str[3:]
+    again.loc[mistyped, 'email'] = None
+    again.loc[other_domain, 'email'] = again.loc[other_domain, 'email'].str.split('@').str[0] + '@outlook.com'
+
+    leads = pd.concat([leads, again], ignore_index=True)
+    persons = np.concatenate([np.arange(people), person])
+    shuffle = rng.permutation(len(leads))
+    return leads.iloc[shuffle].reset_index(drop=True), persons[shuffle]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--leads', type=int, default=1_000_000)
+    parser.add_argument('--duplicates', type=float, default=0.3, help="share of leads re-entering an earlier person")
+    parser.add_argument('--max-seconds', type=float, default=0, help="fail when resolving takes longer (0 = no limit)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    leads, persons = make_leads(args.leads, args.duplicates, args.seed)
+    print(f"⏱️ {len(leads):,} leads, {len(np.unique(persons)):,} people")
+
+    start = time.perf_counter()
+    resolved = resolve_leads(leads)
+    resolve_seconds = time.perf_counter() - start
+    canonical = canonical_leads(resolved)
+    total_seconds = time.perf_counter() - start
+
+    clusters = resolved['cluster_id'].to_numpy()
+    merged_people = int((pd.Series(persons).groupby(clusters).nunique() > 1).sum())
+    split_people = int((pd.Series(clusters).groupby(persons).nunique() > 1).sum())
+    print(f"   resolve {resolve_seconds:.1f}s | with canonical records {total_seconds:.1f}s")
+    print(f"   {len(canonical):,} clusters | {merged_people:,} clusters mix people "
+          f"| {split_people:,} people split across clusters")
+
+    sys.exit(1 if args.max_seconds and resolve_seconds > args.max_seconds else 0)
+
+
+if __name__ == '__main__':
+    main()
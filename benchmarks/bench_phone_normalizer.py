@@ -0,0 +1,160 @@
+# benchmarks/bench_phone_normalizer.py
+"""Compare the vectorized phone normalizer with the old row-by-row .apply cleaners
+
+Usage: python benchmarks/bench_phone_normalizer.py [--rows 1000000] [--distinct 200000] [--min-speedup N] [--repeat 3]
+
+Each scenario has its own speedup floor (SCENARIO_MIN_SPEEDUP); --min-speedup
+holds every scenario to one bar instead.
+"""
+import argparse
+import io
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'helpers'))
+
+from phone_normalizer import normalize_phone_series, LOCAL_FORMAT, COUNTRY_CODE_FORMAT
+from schema import whole_numbers
+
+# Speedup each scenario must reach over .apply
+SCENARIO_MIN_SPEEDUP = {
+    'call log To Number (float64)': 10.0,
+    'call log To Number (Int64)': 10.0,
+    'lead sheet phones (text)': 10.0,
+    'mixed Excel column (object)': 10.0,
+}
+
+
+def legacy_clean_phone_number(phone):
+    """Row-wise DataCleaner.clean_phone_number as it was before phone_normalizer"""
+    if pd.isna(phone) or phone in ['', 'nan', 'None', 'null']:
+        return None
+    cleaned = re.sub(r'[^\d]', '', str(phone).strip())
+    if cleaned.startswith('94'):
+        cleaned = '0' + cleaned[2:]
+    elif len(cleaned) == 9 and not cleaned.startswith('0'):
+        cleaned = '0' + cleaned
+    if len(cleaned) == 10 and cleaned.startswith('0'):
+        return cleaned
+    return None
+
+
+def legacy_standardize_phone_number(phone_str):
+    """Row-wise UnifiedProcessor.standardize_phone_number as it was before phone_normalizer"""
+    if pd.isna(phone_str) or phone_str == '':
+        return phone_str
+    clean_number = re.sub(r'\D', '', str(phone_str)).rstrip('0')
+    if not clean_number:
+        return phone_str
+    if clean_number.startswith('94'):
+        return clean_number if len(clean_number) >= 9 else phone_str
+    elif len(clean_number) == 9:
+        return '94' + clean_number
+    elif len(clean_number) == 10 and clean_number.startswith('0'):
+        return '94' + clean_number[1:]
+    elif len(clean_number) == 7:
+        return '94' + clean_number
+    elif len(clean_number) > 9:
+        return '94' + clean_number[-9:]
+    return '94' + clean_number
+
+
+def make_scenarios(rows, distinct, seed=0):
+    """Phone columns as they arrive from the exports
+
+    - call log 'To Number': read_csv turns it into float64 (9476724296.0), and
+      the cleaned call logs hold it as nullable Int64 (schema.whole_numbers)
+    - lead sheet phones: text in mixed notations (+94, 0-prefixed, dashed, blanks),
+      read back through read_csv so it has the dtype the app really sees
+    - mixed Excel column: floats and text in one object column
+    Numbers repeat like real call logs (~400k rows for ~90k numbers).
+    Returns {name: phones}; each is held to its SCENARIO_MIN_SPEEDUP floor.
+    """
+    rng = np.random.default_rng(seed)
+    subscribers = rng.integers(700_000_000, 789_999_999, distinct)
+
+    notations = np.array(
+        [94 * 10**9 + number for number in subscribers[: distinct // 5]]
+        + ['0' + str(number) for number in subscribers[distinct // 5: 2 * distinct // 5]]
+        + ['+94 ' + str(number) for number in subscribers[2 * distinct // 5: 3 * distinct // 5]]
+        + [f'0{str(number)[:2]}-{str(number)[2:]}' for number in subscribers[3 * distinct // 5: 4 * distinct // 5]]
+        + [str(number) for number in subscribers[4 * distinct // 5:]]
+        + ['', 'nan', 'N/A'],
+        dtype=object,
+    )
+    text = np.array([str(value) for value in notations], dtype=object)
+    text[text == 'nan'] = None
+
+    call_log = (94 * 10**9 + rng.choice(subscribers, rows)).astype(float)
+    call_log[rng.random(rows) < 0.01] = np.nan
+
+    return {
+        'call log To Number (float64)': pd.Series(call_log),
+        'call log To Number (Int64)': whole_numbers(pd.Series(call_log)),
+        'lead sheet phones (text)': read_csv_column(rng.choice(text, rows)),
+        'mixed Excel column (object)': pd.Series(rng.choice(notations, rows), dtype=object),
+    }
+
+
+def read_csv_column(values):
+    """A text column as file_reader.read_table hands it over (pandas 3: Arrow-backed str)"""
+    buffer = io.StringIO()
+    pd.DataFrame({'phone': values}).to_csv(buffer, index=False)
+    buffer.seek(0)
+    return pd.read_csv(buffer)['phone']
+
+
+def time_call(func, repeat):
+    """Best wall time of `repeat` runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--distinct', type=int, default=200_000)
+    parser.add_argument('--min-speedup', type=float, default=None,
+                        help='one speedup floor for every scenario (default: SCENARIO_MIN_SPEEDUP)')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    scenarios = make_scenarios(args.rows, args.distinct)
+    print(f"📞 {args.rows:,} phone numbers per scenario ({args.distinct:,} distinct)")
+
+    failed = False
+    cases = [
+        (LOCAL_FORMAT, legacy_clean_phone_number),
+        (COUNTRY_CODE_FORMAT, legacy_standardize_phone_number),
+    ]
+    for name, phones in scenarios.items():
+        min_speedup = args.min_speedup if args.min_speedup is not None else SCENARIO_MIN_SPEEDUP[name]
+        print(f"\n{name} (at least {min_speedup:g}x)")
+        # .apply hands nullable Int64 values over as floats; the row cleaners get the column's own ints
+        row_values = pd.Series(phones.to_numpy(dtype=object, na_value=None), dtype=object) if phones.dtype == 'Int64' else phones
+        for output_format, legacy in cases:
+            expected, legacy_seconds = time_call(lambda: row_values.apply(legacy), args.repeat)
+            actual, vectorized_seconds = time_call(lambda: normalize_phone_series(phones, output_format), args.repeat)
+
+            same = expected.fillna('<NA>').astype(str).equals(actual.fillna('<NA>').astype(str))
+            speedup = legacy_seconds / vectorized_seconds
+            fast_enough = speedup >= min_speedup
+            print(f"   {output_format:>5}: apply {legacy_seconds:.2f}s | vectorized {vectorized_seconds:.2f}s "
+                  f"| {speedup:.1f}x{'' if fast_enough else f' (below {min_speedup:g}x)'} | identical output: {same}")
+
+            failed |= not same or not fast_enough
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
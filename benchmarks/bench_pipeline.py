@@ -0,0 +1,213 @@
+# benchmarks/bench_pipeline.py
+"""Time every pipeline stage on synthetic data and compare with the previous run
+
+Stages: DataCleaner.process_all_data, MetricsCalculator.generate_call_analysis_table,
+MetricsCalculator.save_all_reports, and UnifiedProcessor's call log / leads / auto-save steps.
+Each stage records wall seconds, rows, rows/sec and peak traced memory (tracemalloc, so
+numpy/pandas buffers are included; --no-memory times without its overhead).
+
+Usage: python benchmarks/bench_pipeline.py [--rows 10000 100000] [--employees 8] [--workers 1]
+                                           [--data-dir DIR] [--history benchmarks/history.jsonl]
+                                           [--threshold 20] [--fail-on-regression]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(ROOT, 'helpers'))
+sys.path.append(ROOT)
+
+from synthetic_data import generate_tree, flatten_tree
+from data_cleaning import DataCleaner
+from metric_calculator import MetricsCalculator
+from merged_app import UnifiedProcessor
+
+DEFAULT_HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'history.jsonl')
+
+
+class StageTimer:
+    """Runs stages one after another and keeps their measurements"""
+
+    def __init__(self, track_memory=True, verbose=False):
+        self.track_memory = track_memory
+        self.verbose = verbose
+        self.stages = {}
+
+    def run(self, name, rows, func, *args):
+        """Time func(*args); rows is an int or a callable taking the result"""
+        output = io.StringIO()
+        if self.track_memory:
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(sys.stdout if self.verbose else output):
+            result = func(*args)
+        seconds = time.perf_counter() - start
+
+        peak_mb = None
+        if self.track_memory:
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+
+        rows = rows(result) if callable(rows) else rows
+        self.stages[name] = {
+            'seconds': round(seconds, 4),
+            'rows': int(rows),
+            'rows_per_sec': round(rows / seconds, 1) if seconds > 0 else None,
+            'peak_mb': round(peak_mb, 1) if peak_mb is not None else None,
+        }
+        print(f"   {name:<34} {seconds:>9.2f}s {int(rows):>11,} rows "
+              f"{self.stages[name]['rows_per_sec'] or 0:>12,.0f} rows/s "
+              f"{'' if peak_mb is None else f'{peak_mb:>9.1f} MB peak'}")
+        return result
+
+
+def prepare_data(data_dir, rows, employees, seed):
+    """Generate (or reuse) the employee tree and its flat copy for one scale"""
+    scale_dir = os.path.join(data_dir, f"rows_{rows}_employees_{employees}_seed_{seed}")
+    marker = os.path.join(scale_dir, 'synthetic.json')
+    tree, flat = os.path.join(scale_dir, 'tree'), os.path.join(scale_dir, 'flat')
+
+    if os.path.exists(marker):
+        with open(marker, encoding='utf-8') as f:
+            return tree, flat, json.load(f)
+
+    shutil.rmtree(scale_dir, ignore_errors=True)
+    start = time.perf_counter()
+    counts = generate_tree(tree, rows, employees, seed)
+    flatten_tree(tree, flat)
+    print(f"   generated {counts['files']} files in {time.perf_counter() - start:.1f}s")
+    with open(marker, 'w', encoding='utf-8') as f:
+        json.dump(counts, f)
+    return tree, flat, counts
+
+
+def bench_scale(tree, flat, counts, workers, output_dir, timer):
+    """All pipeline stages for one generated tree"""
+    cleaner = DataCleaner(max_workers=workers, use_cache=False)
+    metrics_calculator = MetricsCalculator()
+    input_rows = counts['call_logs'] + counts['leads'] + counts['updates']
+
+    leads_df, updates_df, call_logs_df = timer.run(
+        'cleaner.process_all_data', input_rows, cleaner.process_all_data, tree)
+    call_analysis_df = timer.run(
+        'metrics.generate_call_analysis_table', len(call_logs_df),
+        metrics_calculator.generate_call_analysis_table, call_logs_df)
+    timer.run(
+        'metrics.save_all_reports', len(leads_df) + len(updates_df) + len(call_logs_df) + len(call_analysis_df),
+        metrics_calculator.save_all_reports, output_dir, leads_df, updates_df, call_logs_df, call_analysis_df)
+
+    processor = UnifiedProcessor()
+    timer.run('unified.process_call_logs', counts['call_logs'], processor.process_call_logs, flat)
+    timer.run('unified.process_leads', counts['leads'], processor.process_leads, flat)
+    saved_rows = sum(len(df) for df in [processor.processed_call_logs, processor.processed_leads] if df is not None)
+    timer.run('unified.auto_save_results', saved_rows, processor.auto_save_results, output_dir)
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def previous_run(history_path, rows, employees, workers, memory_tracked):
+    """Most recent history record for the same scale (timings under tracemalloc only compare with each other)"""
+    if not os.path.exists(history_path):
+        return None
+    previous = None
+    with open(history_path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            key = (record['rows'], record['employees'], record['workers'], record.get('memory_tracked', True))
+            if key == (rows, employees, workers, memory_tracked):
+                previous = record
+    return previous
+
+
+def compare(previous, stages, threshold):
+    """Print the change per stage; returns the stages slower by more than threshold percent"""
+    regressions = []
+    print(f"   vs {previous['timestamp']} ({previous.get('revision') or 'unknown revision'}):")
+    for name, stage in stages.items():
+        before = previous['stages'].get(name)
+        if not before or not before['seconds']:
+            continue
+        change = (stage['seconds'] - before['seconds']) / before['seconds'] * 100
+        flag = ' ⚠️ slower' if change > threshold else ''
+        print(f"     {name:<34} {before['seconds']:>9.2f}s -> {stage['seconds']:>9.2f}s ({change:+.0f}%){flag}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000], help="call-log rows per scale (10k to 10M)")
+    parser.add_argument('--employees', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=1, help="DataCleaner file parsing processes")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', help="keep generated data here and reuse it on later runs")
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help="JSON lines file runs are appended to")
+    parser.add_argument('--threshold', type=float, default=20.0, help="percent slowdown reported as a regression")
+    parser.add_argument('--fail-on-regression', action='store_true')
+    parser.add_argument('--no-memory', action='store_true', help="skip tracemalloc (pure timing)")
+    parser.add_argument('--verbose', action='store_true', help="show the pipeline's own output")
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='leads_bench_')
+    output_dir = tempfile.mkdtemp(prefix='leads_bench_out_')
+    regressions = []
+
+    try:
+        for rows in args.rows:
+            print(f"\n📊 {rows:,} call-log rows, {args.employees} employees, {args.workers} worker(s)")
+            tree, flat, counts = prepare_data(data_dir, rows, args.employees, args.seed)
+
+            timer = StageTimer(track_memory=not args.no_memory, verbose=args.verbose)
+            bench_scale(tree, flat, counts, args.workers, output_dir, timer)
+
+            record = {
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'revision': git_revision(),
+                'rows': rows,
+                'employees': args.employees,
+                'workers': args.workers,
+                'memory_tracked': not args.no_memory,
+                'input': counts,
+                'stages': timer.stages,
+            }
+            previous = previous_run(args.history, rows, args.employees, args.workers, not args.no_memory)
+            if previous is not None:
+                regressions += [f"{rows:,} rows: {name}" for name in compare(previous, timer.stages, args.threshold)]
+
+            with open(args.history, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + '\n')
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    print(f"\n📝 Results appended to {args.history}")
+    if regressions:
+        print(f"⚠️ Slower than the previous run by more than {args.threshold:.0f}%: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+# benchmarks/synthetic_data.py
+"""Synthetic employee folder trees shaped like the real exports
+
+Each employee folder gets:
+- "<campaign> leads.xlsx": messy lead sheets (column names vary per file, phones in mixed notations)
+- "<campaign> updated.xlsx": the same leads with "1st call"/"2nd call"/"status" columns
+- "Report <range>.csv": call logs in the Sr.No/Name/To Number/Date/Time/Date Time/Duration/Type schema
+
+Usage: python benchmarks/synthetic_data.py <folder> [--rows 100000] [--employees 8] [--seed 0]
+"""
+import argparse
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Sheets above this many rows are written as CSV; openpyxl would take longer than the benchmark
+EXCEL_MAX_ROWS = 50_000
+
+FIRST_NAMES = ['Nimal', 'Kasun', 'Dilini', 'Sanduni', 'Tharindu', 'Ishara', 'Chamari', 'Ruwan', 'Hasaru', 'Neranjan',
+               'Susil', 'Amaya', 'Pathum', 'Sachini', 'Lahiru', 'Malsha']
+LAST_NAMES = ['Perera', 'Silva', 'Fernando', 'Jayasinghe', 'Bandara', 'Ransith', 'Maliyagoda', 'Premarathna',
+              'Wickramasinghe', 'Gunawardena', 'Dissanayake', 'Rathnayake']
+CITIES = ['Colombo', 'Kandy', 'Galle', 'Kurunegala', 'Negombo', 'Matara', 'Jaffna', 'Anuradhapura', '', None]
+CAMPAIGNS = ['Study Globally - Sweden', 'Study Globally - Canada', 'UK Intake', 'Australia Fair', 'Germany Webinar']
+CALL_NOTES = ['no answer', 'call back later', 'agreed to visit the fair, details sent', 'not interested',
+              'asked for fee structure', 'hung up', 'wrong number', '', None]
+CALL_TYPES = ['Outgoing', 'Outgoing', 'Outgoing', 'Missed', 'Incoming']
+
+# Column name variants seen across lead sheets: (name, phone, email, city)
+LEAD_COLUMN_VARIANTS = [
+    ('full_name', 'phone_number', 'email', 'city'),
+    ('Name', 'Phone', 'Email', 'City'),
+    ('Customer Name', 'Mobile No', 'E-mail Address', 'Location'),
+    ('Contact Person', 'Contact Number', 'Mail', 'Town'),
+]
+
+
+def _phone_notations(subscribers, rng):
+    """Same subscriber numbers written the ways people type them"""
+    text = pd.Series(subscribers.astype(str))
+    notations = [text, '0' + text, '+94 ' + text, '94' + text, '0' + text.str[:2] + '-' + text.str[2:]]
+    style = rng.integers(0, len(notations), len(subscribers))
+    phones = text.astype(object).copy()
+    for number, notation in enumerate(notations):
+        phones[style == number] = notation[style == number]
+    return phones.to_numpy(dtype=object, copy=True)
+
+
+def _names(rng, count):
+    return np.char.add(np.char.add(rng.choice(FIRST_NAMES, count), ' '), rng.choice(LAST_NAMES, count)).astype(object)
+
+
+def _write_sheet(df, path_without_extension):
+    """xlsx like the real sheets, or csv once a sheet gets too large for openpyxl"""
+    if len(df) <= EXCEL_MAX_ROWS:
+        path = path_without_extension + '.xlsx'
+        df.to_excel(path, index=False)
+    else:
+        path = path_without_extension + '.csv'
+        df.to_csv(path, index=False)
+    return path
+
+
+def make_leads(rng, count, variant):
+    """One messy lead sheet; returns (sheet, subscriber numbers)"""
+    subscribers = rng.integers(700_000_000, 789_999_999, count)
+    name_col, phone_col, email_col, city_col = LEAD_COLUMN_VARIANTS[variant % len(LEAD_COLUMN_VARIANTS)]
+
+    names = _names(rng, count)
+    emails = np.char.add(np.char.lower(np.char.replace(names.astype(str), ' ', '.')), '@gmail.com').astype(object)
+    emails[rng.random(count) < 0.2] = None
+    phones = _phone_notations(subscribers, rng)
+    phones[rng.random(count) < 0.02] = None
+
+    leads = pd.DataFrame({
+        name_col: names,
+        email_col: emails,
+        phone_col: phones,
+        city_col: rng.choice(np.array(CITIES, dtype=object), count),
+        'are_you_looking_for_september_2025_intake?': rng.choice(['Yes', 'No', None], count),
+    })
+
+    # Re-submitted form rows
+    duplicates = leads.sample(frac=0.05, random_state=int(rng.integers(1 << 31)))
+    return pd.concat([leads, duplicates], ignore_index=True), subscribers
+
+
+def make_updates(rng, leads, variant):
+    """The lead sheet as employees fill it in after calling"""
+    name_col, phone_col, email_col, city_col = LEAD_COLUMN_VARIANTS[variant % len(LEAD_COLUMN_VARIANTS)]
+    count = len(leads)
+    notes = np.array(CALL_NOTES, dtype=object)
+    dates = np.char.add(rng.integers(1, 28, count).astype(str), '/09- ').astype(object)
+    first = dates + rng.choice(notes[:-2], count)
+    first[rng.random(count) < 0.1] = None
+    return pd.DataFrame({
+        name_col: leads[name_col],
+        phone_col: leads[phone_col],
+        city_col: leads[city_col],
+        '1st call': first,
+        '2nd call': rng.choice(notes, count),
+        'status': rng.choice(['hot', 'warm', 'cold', '', None], count),
+    })
+
+
+def make_call_log(rng, count, subscribers, names):
+    """Dialer export; To Number is the full 94XXXXXXXXX number, read back as int64 by read_csv"""
+    callees = rng.integers(0, len(subscribers), count)
+    start = pd.Timestamp('2025-01-01').value // 10**9
+    seconds = np.sort(rng.integers(start, start + 300 * 86_400, count))
+    moments = pd.to_datetime(seconds, unit='s')
+    talk = rng.exponential(90, count).astype(int) * (rng.random(count) < 0.6)
+
+    to_number = 94 * 10**9 + subscribers[callees]
+
+    # Unpadded month/day/hour like the dialer ("5/30/2025", "2:20 PM", "5/30/2025 14:20")
+    moments = pd.Series(moments)
+    date = moments.dt.month.astype(str) + '/' + moments.dt.day.astype(str) + '/' + moments.dt.year.astype(str)
+    hour12 = (moments.dt.hour % 12).replace(0, 12).astype(str)
+    time = hour12 + moments.dt.strftime(':%M %p')
+    date_time = date + ' ' + moments.dt.strftime('%H:%M')
+
+    talk = pd.Series(talk)
+    duration = ((talk // 3600).astype(str).str.zfill(2) + 'h ' + (talk // 60 % 60).astype(str).str.zfill(2) + 'm '
+                + (talk % 60).astype(str).str.zfill(2) + 's')
+
+    return pd.DataFrame({
+        'Sr.No': np.arange(1, count + 1),
+        'Name': names[callees],
+        'To Number': to_number,
+        'Date': date,
+        'Time': time,
+        'Date Time': date_time,
+        'Duration': duration,
+        'Type': rng.choice(CALL_TYPES, count),
+    })
+
+
+def generate_tree(folder, rows, employees=8, seed=0):
+    """Employee tree with `rows` call-log rows in total (and about rows/8 leads)
+
+    Returns {'call_logs': rows, 'leads': lead rows, 'updates': update rows, 'files': n}.
+    """
+    rng = np.random.default_rng(seed)
+    counts = {'call_logs': 0, 'leads': 0, 'updates': 0, 'files': 0}
+    calls_per_employee = np.full(employees, rows // employees)
+    calls_per_employee[: rows % employees] += 1
+
+    for employee in range(employees):
+        employee_folder = os.path.join(folder, f"{FIRST_NAMES[employee % len(FIRST_NAMES)]}_{employee:03d}")
+        os.makedirs(employee_folder, exist_ok=True)
+        campaign = CAMPAIGNS[employee % len(CAMPAIGNS)]
+
+        lead_count = max(10, int(calls_per_employee[employee]) // 8)
+        leads, subscribers = make_leads(rng, lead_count, employee)
+        _write_sheet(leads, os.path.join(employee_folder, f"{campaign} leads"))
+
+        updates = make_updates(rng, leads, employee)
+        _write_sheet(updates, os.path.join(employee_folder, f"{campaign} updated"))
+
+        call_log = make_call_log(rng, int(calls_per_employee[employee]), subscribers, _names(rng, len(subscribers)))
+        call_log.to_csv(os.path.join(employee_folder, "Report 2025-01-01 00_00_00 to 2025-10-23 23_59_59.csv"), index=False)
+
+        counts['call_logs'] += len(call_log)
+        counts['leads'] += len(leads)
+        counts['updates'] += len(updates)
+        counts['files'] += 3
+
+    return counts
+
+
+def flatten_tree(tree_folder, flat_folder):
+    """Single-folder copy for UnifiedProcessor (it reads *.csv as call logs and '*leads*' files as leads)
+
+    Lead sheets written as CSV (above EXCEL_MAX_ROWS) are also read as call
+    logs there; their rows have no To Number and are dropped by its cleaning.
+    """
+    os.makedirs(flat_folder, exist_ok=True)
+    for employee in sorted(os.listdir(tree_folder)):
+        employee_folder = os.path.join(tree_folder, employee)
+        if not os.path.isdir(employee_folder):
+            continue
+        for file in os.listdir(employee_folder):
+            if file.startswith('Report') or ' leads.' in file:
+                target = os.path.join(flat_folder, f"{employee} {file}")
+                if not os.path.exists(target):
+                    shutil.copyfile(os.path.join(employee_folder, file), target)
+    return flat_folder
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('folder')
+    parser.add_argument('--rows', type=int, default=100_000, help="call-log rows in total")
+    parser.add_argument('--employees', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    counts = generate_tree(args.folder, args.rows, args.employees, args.seed)
+    print(f"📁 {args.folder}: {counts['files']} files, {counts['call_logs']:,} call rows, "
+          f"{counts['leads']:,} leads, {counts['updates']:,} updates")
+
+
+if __name__ == '__main__':
+    main()
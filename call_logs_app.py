@@ -1,11 +1,19 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import os
 import glob
-import re
+import sys
+
+# Add helpers to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'helpers'))
+
+from phone_normalizer import normalize_phone, normalize_phone_series, COUNTRY_CODE_FORMAT
+from virtual_table import VirtualTable, format_datetime
+from duration_parser import parse_durations, unparseable_durations
+from call_gaps import phone_call_records
 
 class CallLogProcessor:
     def __init__(self):
@@ -14,44 +22,7 @@ class CallLogProcessor:
         
     def standardize_phone_number(self, phone_str):
         """Standardize phone number to start with 94 country code"""
-        if pd.isna(phone_str) or phone_str == '':
-            return phone_str
-            
-        # Convert to string and remove all non-digit characters using regex
-        clean_number = re.sub(r'\D', '', str(phone_str))
-        
-        # Remove trailing zeros
-        clean_number = clean_number.rstrip('0')
-        
-        # If number is empty after cleaning, return as is
-        if not clean_number:
-            return phone_str
-            
-        # Standardize to 94 country code
-        if clean_number.startswith('94'):
-            # Already starts with 94, ensure proper length
-            if len(clean_number) >= 9:  # 94 + 7 digits minimum
-                return clean_number
-            else:
-                return phone_str  # Return original if too short
-        elif len(clean_number) == 9:
-            # 9-digit number without country code, add 94
-            return '94' + clean_number
-        elif len(clean_number) == 10 and clean_number.startswith('0'):
-            # 10-digit number starting with 0, replace 0 with 94
-            return '94' + clean_number[1:]
-        elif len(clean_number) == 7:
-            # 7-digit local number, add 94
-            return '94' + clean_number
-        else:
-            # For other formats, try to make it start with 94
-            if len(clean_number) > 9:
-                # If longer than 9 digits, assume it includes country code but not 94
-                # Try to extract last 9 digits and add 94
-                last_9_digits = clean_number[-9:]
-                return '94' + last_9_digits
-            else:
-                return '94' + clean_number  # Default: add 94 prefix
+        return normalize_phone(phone_str, COUNTRY_CODE_FORMAT)
     
     def load_files_from_folder(self, folder_path):
         """Load and merge all call log files from a folder"""
@@ -92,14 +63,14 @@ class CallLogProcessor:
             self.df['Date Time'] = pd.to_datetime(self.df['Date Time'], errors='coerce')
             
             # Clean and standardize phone numbers
-            self.df['To Number'] = self.df['To Number'].apply(self.standardize_phone_number)
+            self.df['To Number'] = normalize_phone_series(self.df['To Number'], COUNTRY_CODE_FORMAT)
             
             # Remove scientific notation numbers and invalid phone numbers
             self.df = self.df[~self.df['To Number'].str.contains('E', na=False)]
             self.df = self.df[self.df['To Number'].str.len() >= 9]  # Minimum 9 digits (94 + 7)
             
             # Convert Duration to seconds
-            self.df['Duration_Seconds'] = self.df['Duration'].apply(self.parse_duration)
+            self.df['Duration_Seconds'] = self.parse_duration_column(self.df['Duration'])
             
             # REMOVE DUPLICATES AFTER ALL CLEANING AND MERGING - MOVED THIS STEP
             initial_count = len(self.df)
@@ -115,88 +86,25 @@ class CallLogProcessor:
             return False
     
     def parse_duration(self, duration_str):
-        """Convert duration string to total seconds"""
-        try:
-            if pd.isna(duration_str) or duration_str == '':
-                return 0
-            
-            # Handle different duration formats
-            if 'h' in duration_str and 'm' in duration_str and 's' in duration_str:
-                # Format: "00h 00m 00s"
-                parts = duration_str.split()
-                hours = int(parts[0].replace('h', '')) if len(parts) > 0 else 0
-                minutes = int(parts[1].replace('m', '')) if len(parts) > 1 else 0
-                seconds = int(parts[2].replace('s', '')) if len(parts) > 2 else 0
-                return hours * 3600 + minutes * 60 + seconds
-            else:
-                return 0
-        except:
-            return 0
+        """Convert duration string to total seconds (0 if missing or unparseable)"""
+        return int(self.parse_duration_column(pd.Series([duration_str], dtype=object), report=False).iloc[0])
     
-    def calculate_time_gaps(self, dates):
-        """Calculate average gap between consecutive calls"""
-        if len(dates) <= 1:
-            return 0
-        
-        dates_sorted = sorted(dates)
-        gaps = []
-        
-        for i in range(1, len(dates_sorted)):
-            gap = (dates_sorted[i] - dates_sorted[i-1]).total_seconds() / 3600  # Gap in hours
-            gaps.append(gap)
-        
-        return np.mean(gaps) if gaps else 0
+    def parse_duration_column(self, durations, report=True):
+        """Whole seconds for a Duration column; missing and unparseable cells count as 0"""
+        seconds = parse_durations(durations)
+        if report:
+            unparseable = int(unparseable_durations(durations, seconds).sum())
+            if unparseable:
+                print(f"⚠️ {unparseable} durations could not be parsed and count as 0 seconds")
+        return seconds.fillna(0).round().astype(np.int64)
     
     def process_data(self):
         """Process the data and create records for each phone number"""
         if self.df is None:
             return None
         
-        records = []
-        
-        # Group by phone number
-        for phone_number, group in self.df.groupby('To Number'):
-            total_calls = len(group)
-            total_duration = group['Duration_Seconds'].sum()
-            call_dates = group['Date Time'].tolist()
-            call_times = group['Time'].tolist()
-            
-            # Calculate metrics
-            avg_gap_hours = self.calculate_time_gaps(call_dates)
-            first_call = min(call_dates) if call_dates else None
-            last_call = max(call_dates) if call_dates else None
-            
-            # Get name (most frequent one)
-            names = group['Name'].value_counts()
-            most_common_name = names.index[0] if len(names) > 0 else 'Unknown'
-            
-            # Format date-time called column - ALL dates and times
-            date_time_called = []
-            for date, time in zip(call_dates, call_times):
-                if pd.notna(date):
-                    date_str = date.strftime('%Y-%m-%d')
-                    date_time_called.append(f"{date_str} {time}")
-                else:
-                    date_time_called.append(f"Unknown Date {time}")
-            
-            # Join all dates and times with comma separation
-            all_dates_times = ', '.join(date_time_called)
-            
-            records.append({
-                'Phone Number': phone_number,
-                'Name': most_common_name,
-                'Total Calls': total_calls,
-                'Total Duration (seconds)': total_duration,
-                'Total Duration (HH:MM:SS)': str(timedelta(seconds=int(total_duration))),
-                'First Call Date': first_call,
-                'Last Call Date': last_call,
-                'Avg Gap (hours)': round(avg_gap_hours, 2),
-                'All Dates and Times': all_dates_times,  # All dates and times in one column
-                'Call Dates': call_dates,
-                'Call Times': call_times
-            })
-        
-        self.processed_data = pd.DataFrame(records)
+        # All phones at once: one sort by (phone, time) instead of a loop per phone
+        self.processed_data = phone_call_records(self.df)
         return self.processed_data
     
     def save_results(self, file_path):
@@ -208,7 +116,6 @@ class CallLogProcessor:
         try:
             # Create export version - KEEP the 'All Dates and Times' column
             export_df = self.processed_data.copy()
-            export_df = export_df.drop(['Call Dates', 'Call Times'], axis=1)
             
             # Format dates
             export_df['First Call Date'] = export_df['First Call Date'].dt.strftime('%Y-%m-%d %H:%M:%S')
@@ -283,6 +190,10 @@ class CallLogApp:
         self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         
+        # Virtualized rows with sorting (click a heading) and filtering
+        self.table = VirtualTable(self.tree, scrollbar)
+        self.table.build_filter_bar(results_frame).grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        
         # Save button
         ttk.Button(main_frame, text="Save Results", 
                  command=self.save_results).grid(row=3, column=0, pady=10)
@@ -324,21 +235,20 @@ class CallLogApp:
     
     def display_results(self, results):
         """Display results in the treeview"""
-        # Clear existing data
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Add new data
-        for _, row in results.iterrows():
-            self.tree.insert('', tk.END, values=(
-                row['Phone Number'],
-                row['Name'],
-                row['Total Calls'],
-                row['Total Duration (HH:MM:SS)'],
-                row['First Call Date'].strftime('%Y-%m-%d %H:%M') if pd.notna(row['First Call Date']) else 'N/A',
-                row['Last Call Date'].strftime('%Y-%m-%d %H:%M') if pd.notna(row['Last Call Date']) else 'N/A',
-                row['Avg Gap (hours)']
-            ))
+        # Only the visible window of rows is materialized in the tree
+        self.table.set_data(
+            results,
+            columns={
+                'Phone': 'Phone Number',
+                'Name': 'Name',
+                'Total Calls': 'Total Calls',
+                'Total Duration': 'Total Duration (HH:MM:SS)',
+                'First Call': 'First Call Date',
+                'Last Call': 'Last Call Date',
+                'Avg Gap': 'Avg Gap (hours)'
+            },
+            formatters={'First Call': format_datetime, 'Last Call': format_datetime}
+        )
     
     def save_results(self):
         """Save processed results to file"""
@@ -0,0 +1,118 @@
+# cli.py
+"""Run the lead cleaning + call analysis pipeline without the Tk window
+
+Same steps and results/ layout as app.py:
+    python cli.py <data folder> [--output-dir results] [--workers 4] [--format csv] [--no-cache]
+                                [--chunk-rows 100000 | --incremental] [--lazy] [--store]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add helpers to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'helpers'))
+
+from data_cleaning import CACHE_FOLDER, DataCleaner
+from metric_calculator import CALL_STATE_NAME, MetricsCalculator
+from lead_store import STORE_NAME
+from output_writers import DEFAULT_FORMAT, ensure_available, output_formats
+from instrumentation import RunProfile
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('folder', help="main folder containing the employee subfolders")
+    parser.add_argument('--output-dir', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results'),
+                        help="where the timestamped cleaned_data_*/lead_analysis_* folders go (default: ./results)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processes used to parse files (default: one per CPU, 1 = no pool)")
+    parser.add_argument('--format', dest='output_format', default=DEFAULT_FORMAT, choices=output_formats(),
+                        help=f"report file format (default: {DEFAULT_FORMAT})")
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f"re-parse every file instead of reusing cleaned frames of unchanged files "
+                             f"(cached in <output-dir>/{CACHE_FOLDER})")
+    parser.add_argument('--chunk-rows', type=int, default=None,
+                        help="stream call logs this many rows at a time into the call analysis "
+                             "(bounded memory; cleaned call logs are not saved)")
+    parser.add_argument('--lazy', action='store_true',
+                        help="classify files by their header row and parse only the columns the cleaning uses "
+                             "(cleaned call logs keep only their date/time, duration, email and type columns)")
+    parser.add_argument('--incremental', action='store_true',
+                        help=f"keep per-phone call totals in <output-dir>/{CALL_STATE_NAME} and only fold in "
+                             "call-log rows added since the last run")
+    parser.add_argument('--store', action='store_true',
+                        help=f"also upsert the cleaned data into the SQLite store <output-dir>/{STORE_NAME}, "
+                             "queryable across runs")
+    return parser.parse_args(argv)
+
+
+def run(folder, output_dir, workers=None, output_format=DEFAULT_FORMAT, use_cache=True, chunk_rows=None, incremental=False,
+        lazy=False, store=False):
+    """Clean, analyse and save; returns the report folder, or None when there was nothing to process"""
+    profile = RunProfile()
+    cleaner = DataCleaner(max_workers=workers, use_cache=use_cache, profile=profile, call_log_chunk_rows=chunk_rows,
+                          lazy=lazy, cache_dir=os.path.join(output_dir, CACHE_FOLDER))
+    metrics_calculator = MetricsCalculator(profile=profile, store_path=os.path.join(output_dir, STORE_NAME) if store else None)
+
+    leads_df, updates_df, call_logs_df = cleaner.process_all_data(folder)
+    streamed_files = cleaner.call_logs_files if chunk_rows else []
+    if leads_df.empty and updates_df.empty and call_logs_df.empty and not streamed_files:
+        print("❌ No valid data found to process!")
+        return None
+
+    print("\n📊 Generating call analysis table...")
+    if chunk_rows:
+        chunks = cleaner.iter_call_log_chunks(streamed_files, chunk_rows)
+        call_analysis_df = metrics_calculator.generate_call_analysis_streaming(chunks)
+    elif incremental:
+        call_analysis_df = metrics_calculator.update_call_analysis(call_logs_df, os.path.join(output_dir, CALL_STATE_NAME))
+    else:
+        call_analysis_df = metrics_calculator.generate_call_analysis_table(call_logs_df)
+
+    output_folder = metrics_calculator.save_all_reports(
+        output_dir,
+        leads_df, updates_df, call_logs_df, call_analysis_df,
+        output_format
+    )
+    
+    for line in profile.summary():
+        print(f"   ⏱️ {line}")
+    return output_folder
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if not os.path.isdir(args.folder):
+        print(f"❌ Folder not found: {args.folder}")
+        return 2
+    if args.workers is not None and args.workers < 1:
+        print("❌ --workers must be at least 1")
+        return 2
+    if args.chunk_rows is not None and args.chunk_rows < 1:
+        print("❌ --chunk-rows must be at least 1")
+        return 2
+    if args.chunk_rows is not None and args.incremental:
+        print("❌ --incremental needs the call logs in memory and can't be combined with --chunk-rows")
+        return 2
+
+    try:
+        ensure_available(args.output_format)
+    except ImportError as e:
+        print(f"❌ {e}")
+        return 2
+
+    start = time.perf_counter()
+    output_folder = run(args.folder, args.output_dir, args.workers, args.output_format, not args.no_cache, args.chunk_rows,
+                        args.incremental, args.lazy, args.store)
+
+    if output_folder is None:
+        return 1
+
+    print(f"⏱️ Finished in {time.perf_counter() - start:.1f}s - reports in {output_folder}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
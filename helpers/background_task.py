@@ -0,0 +1,83 @@
+# helpers/background_task.py
+import queue
+import threading
+import traceback
+
+
+class TaskCancelled(BaseException):
+    """Raised inside the worker when the user cancels
+
+    Derives from BaseException (like KeyboardInterrupt) so the per-file
+    `except Exception` handlers in the processors don't swallow it.
+    """
+
+
+class ProgressReporter:
+    """Worker-side handle: puts structured progress events on the queue and checks for cancellation"""
+
+    def __init__(self, events, cancel_event):
+        self.events = events
+        self.cancel_event = cancel_event
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+
+    def progress(self, stage, file=None, done=0, total=0, rows=None):
+        """Report `done` of `total` steps of a stage (file = item being worked on, rows = rows so far)"""
+        self.check_cancelled()
+        self.events.put({'kind': 'progress', 'stage': stage, 'file': file,
+                         'done': done, 'total': total, 'rows': rows})
+
+    def log(self, message):
+        """Show a line in the UI log"""
+        self.check_cancelled()
+        self.events.put({'kind': 'log', 'message': message})
+
+
+class BackgroundTask:
+    """Runs func(reporter, *args) on a worker thread; the Tk side polls events with after()"""
+
+    def __init__(self, func, *args):
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.reporter = ProgressReporter(self.events, self.cancel_event)
+        self.thread = threading.Thread(target=self._run, args=(func, args), daemon=True)
+
+    def _run(self, func, args):
+        try:
+            result = func(self.reporter, *args)
+            self.events.put({'kind': 'done', 'result': result})
+        except TaskCancelled:
+            self.events.put({'kind': 'cancelled'})
+        except Exception as e:
+            traceback.print_exc()
+            self.events.put({'kind': 'error', 'error': e})
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        """Ask the worker to stop at its next progress report"""
+        self.cancel_event.set()
+
+    def is_running(self):
+        return self.thread.is_alive()
+
+
+FINISHED_EVENTS = ['done', 'error', 'cancelled']
+
+
+def poll_events(root, task, handle_event, interval=100):
+    """Drain the task's queue on the Tk thread every `interval` ms until it finishes"""
+    while True:
+        try:
+            event = task.events.get_nowait()
+        except queue.Empty:
+            break
+        handle_event(event)
+        if event['kind'] in FINISHED_EVENTS:
+            return
+
+    root.after(interval, poll_events, root, task, handle_event, interval)
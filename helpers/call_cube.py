@@ -0,0 +1,138 @@
+# helpers/call_cube.py
+import os
+
+import numpy as np
+import pandas as pd
+
+# File name of the cube saved with the cleaned data
+CALL_CUBE_NAME = 'call_cube'
+
+# One cube row per combination of these; hour is -1 and call_date NaT for calls without a time
+CUBE_KEYS = ['employee', 'call_date', 'hour', 'call_type']
+CUBE_MEASURES = ['calls', 'connected_calls', 'talk_seconds']
+
+# Rollup periods -> pandas period of call_date (weeks start on Monday)
+PERIODS = {'day': 'D', 'week': 'W-SUN', 'month': 'M'}
+
+UNKNOWN = 'Unknown'
+
+
+def _labels(values, count):
+    """Trimmed text labels, UNKNOWN where missing or blank"""
+    if values is None:
+        return np.full(count, UNKNOWN, dtype=object)
+    text = pd.Series(values, dtype=object).reset_index(drop=True)
+    labels = text.where(text.notna(), '').astype(str).str.strip()
+    return labels.where(labels != '', UNKNOWN).to_numpy(dtype=object)
+
+
+def call_cube(employees, moments, seconds, call_types=None):
+    """Pre-aggregated call counts and talk time per employee, call date, hour and call type
+
+    moments are the call datetimes and seconds the talk time of each call
+    (NaN = unknown, counted as 0). A call is connected when it has talk time.
+    The cube is additive - cubes of separate batches of calls can be merged
+    with combine_cubes - and small enough to answer rollups without the raw
+    call logs.
+    """
+    moments = pd.to_datetime(pd.Series(moments).reset_index(drop=True), errors='coerce')
+    seconds = pd.to_numeric(pd.Series(seconds).reset_index(drop=True), errors='coerce').fillna(0).to_numpy()
+    calls = pd.DataFrame({
+        'employee': _labels(employees, len(moments)),
+        'call_date': moments.dt.normalize(),
+        'hour': moments.dt.hour.fillna(-1).astype(np.int8),
+        'call_type': pd.Series(_labels(call_types, len(moments))).str.title(),
+        'calls': 1,
+        'connected_calls': (seconds > 0).astype(np.int64),
+        'talk_seconds': seconds,
+    })
+    return _aggregate(calls)
+
+
+def _aggregate(rows):
+    cube = rows.groupby(CUBE_KEYS, sort=True, dropna=False)[CUBE_MEASURES].sum().reset_index()
+    cube['calls'] = cube['calls'].astype(np.int64)
+    cube['connected_calls'] = cube['connected_calls'].astype(np.int64)
+    return cube
+
+
+def empty_cube():
+    return pd.DataFrame({
+        'employee': pd.Series(dtype=object),
+        'call_date': pd.Series(dtype='datetime64[ns]'),
+        'hour': pd.Series(dtype=np.int8),
+        'call_type': pd.Series(dtype=object),
+        'calls': pd.Series(dtype=np.int64),
+        'connected_calls': pd.Series(dtype=np.int64),
+        'talk_seconds': pd.Series(dtype=float),
+    })
+
+
+def combine_cubes(cubes):
+    """One cube from several (e.g. one per streamed chunk), summing the cells they share"""
+    cubes = [cube for cube in cubes if cube is not None and not cube.empty]
+    if not cubes:
+        return empty_cube()
+    return _aggregate(pd.concat(cubes, ignore_index=True))
+
+
+def load_call_cube(path):
+    """A cube saved with output_writers.write_frame (csv, excel, parquet or feather)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        cube = pd.read_csv(path)
+    elif extension in ('.xlsx', '.xls'):
+        cube = pd.read_excel(path)
+    elif extension == '.parquet':
+        cube = pd.read_parquet(path)
+    elif extension == '.feather':
+        cube = pd.read_feather(path)
+    else:
+        raise ValueError(f"Can't read a call cube from '{extension}' files")
+    cube['call_date'] = pd.to_datetime(cube['call_date'], errors='coerce')
+    cube['hour'] = cube['hour'].fillna(-1).astype(np.int8)
+    for col in ['employee', 'call_type']:
+        cube[col] = cube[col].fillna(UNKNOWN).astype(str).to_numpy(dtype=object)
+    return cube
+
+
+def rollup(cube, by='employee', period=None, call_types=None, start=None, end=None):
+    """Totals of the cube grouped by cube keys and/or a calendar period
+
+    by is one key or a list of 'employee', 'call_type' and 'hour' (None or []
+    for overall totals). period ('day', 'week' or 'month') adds a 'period'
+    column holding the first day of each period; calls without a date fall
+    in a NaT period. call_types keeps only those types and start/end keep
+    call dates in [start, end]. Adds connect_rate (% of calls connected) and
+    avg_talk_seconds (per connected call).
+    """
+    by = [by] if isinstance(by, str) else list(by or [])
+    unknown = [key for key in by if key not in CUBE_KEYS or key == 'call_date']
+    if unknown:
+        raise ValueError(f"Can't roll up by {unknown}, expected some of ['employee', 'hour', 'call_type']")
+    if period is not None and period not in PERIODS:
+        raise ValueError(f"Unknown period '{period}', expected one of {list(PERIODS)}")
+
+    keep = np.ones(len(cube), dtype=bool)
+    if call_types is not None:
+        keep &= cube['call_type'].str.lower().isin([call_type.lower() for call_type in call_types]).to_numpy()
+    if start is not None:
+        keep &= (cube['call_date'] >= pd.Timestamp(start)).to_numpy()
+    if end is not None:
+        keep &= (cube['call_date'] <= pd.Timestamp(end)).to_numpy()
+    cube = cube[keep]
+
+    keys = list(by)
+    if period is not None:
+        cube = cube.assign(period=cube['call_date'].dt.to_period(PERIODS[period]).dt.start_time)
+        keys.insert(0, 'period')
+    if keys:
+        totals = cube.groupby(keys, sort=True, dropna=False)[CUBE_MEASURES].sum().reset_index()
+    else:
+        totals = pd.DataFrame({col: [cube[col].sum()] for col in CUBE_MEASURES})
+
+    calls, connected = totals['calls'].to_numpy(dtype=float), totals['connected_calls'].to_numpy(dtype=float)
+    talk = totals['talk_seconds'].to_numpy(dtype=float)
+    totals['connect_rate'] = np.round(np.divide(connected * 100, calls, out=np.zeros(len(totals)), where=calls > 0), 1)
+    totals['avg_talk_seconds'] = np.round(np.divide(talk, connected, out=np.zeros(len(totals)), where=connected > 0), 2)
+    return totals
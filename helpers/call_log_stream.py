@@ -0,0 +1,327 @@
+# helpers/call_log_stream.py
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+from file_reader import read_table
+
+# Rows per chunk when streaming call logs - bounds the memory of one chunk
+DEFAULT_CHUNK_ROWS = 100_000
+
+NS_PER_SECOND = 10**9
+NS_PER_DAY = 86_400 * NS_PER_SECOND
+
+# Bump when CallAggregates' fields change so saved states from older versions are rebuilt
+STATE_VERSION = 3
+
+# row_hashes: every missing cell hashes to this, whatever the column's dtype in its chunk
+MISSING_HASH = np.uint64(0)
+_HASH_MULTIPLIER = np.uint64(0x100000001B3)
+
+
+def average_gap_days(gap_ns, gaps):
+    """Mean gap in days from the gaps' int64 nanosecond sum
+
+    The sum is exact, so every engine - per phone, grouped or folded from
+    chunks - rounds the same mean whatever order it added the gaps in.
+    """
+    return np.asarray(gap_ns, dtype=np.int64) / NS_PER_DAY / np.maximum(np.asarray(gaps), 1)
+
+
+def read_csv_chunks(file, chunk_rows=DEFAULT_CHUNK_ROWS, **read_csv_kwargs):
+    """Yield a call log as DataFrames of at most chunk_rows rows
+
+    Excel files can't be read incrementally and come back as one frame.
+    """
+    if not file.endswith('.csv'):
+        yield read_table(file, read_csv_kwargs.get('usecols'))
+        return
+    with pd.read_csv(file, chunksize=chunk_rows, **read_csv_kwargs) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def csv_columns(files):
+    """Union of the CSV headers in file order - the columns pd.concat of the whole files would have"""
+    columns = []
+    for file in files:
+        try:
+            header = pd.read_csv(file, nrows=0).columns
+        except Exception:
+            continue
+        columns.extend(col for col in header if col not in columns)
+    return columns
+
+
+def row_hashes(chunk, columns=None):
+    """uint64 hash of every row, equal for rows drop_duplicates of the concatenated files calls equal
+
+    Rows are hashed over columns (missing ones count as NaN) in that order.
+    Numbers are hashed as float64 and every missing value alike, since a
+    column read as int in one chunk and float or text in another is unified
+    when the files are concatenated.
+    """
+    if columns is not None:
+        chunk = chunk.reindex(columns=columns)
+    combined = np.zeros(len(chunk), dtype=np.uint64)
+    for col in chunk.columns:
+        values = chunk[col]
+        if is_numeric_dtype(values.dtype) and not is_bool_dtype(values.dtype):
+            values = values.astype(np.float64)
+        hashed = pd.util.hash_array(values.to_numpy())
+        hashed[values.isna().to_numpy()] = MISSING_HASH
+        combined = combined * _HASH_MULTIPLIER + hashed
+    return combined
+
+
+class SeenRows:
+    """Hashes of the call rows kept so far, to drop exact duplicates across chunks and files
+
+    Holds 8 bytes per distinct row, not the rows themselves, in a few sorted
+    blocks: a new chunk's block is merged into the previous one once it is
+    at least half its size, so there are O(log rows) blocks to search and
+    each hash is re-sorted O(log rows) times.
+    """
+
+    def __init__(self):
+        self.blocks = []
+
+    def __len__(self):
+        return sum(len(block) for block in self.blocks)
+
+    def first_seen(self, hashes):
+        """Mask of the rows not seen before - in an earlier chunk or earlier in this one - which are then remembered"""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        # Searching in sorted order walks each block forward instead of jumping around it
+        order = np.argsort(hashes, kind='stable')
+        ordered = hashes[order]
+        new = np.ones(len(hashes), dtype=bool)
+        new[1:] = ordered[1:] != ordered[:-1]
+        for block in self.blocks:
+            positions = np.minimum(np.searchsorted(block, ordered), len(block) - 1)
+            new &= block[positions] != ordered
+
+        keep = np.zeros(len(hashes), dtype=bool)
+        keep[order] = new
+        if new.any():
+            self.blocks.append(ordered[new])
+        while len(self.blocks) > 1 and 2 * len(self.blocks[-1]) >= len(self.blocks[-2]):
+            newest = self.blocks.pop()
+            self.blocks[-1] = np.sort(np.concatenate([self.blocks[-1], newest]), kind='stable')
+        return keep
+
+
+class CallAggregates:
+    """Per-phone call aggregates folded in one chunk at a time
+
+    Memory grows with the number of distinct phones (and phone/name pairs),
+    not with the number of call rows. Counts, durations, first/last call
+    and the average gap are exact in any order - the gaps between
+    consecutive calls always add up to last - first. The gaps' running sum
+    (gap_ns) is kept too, so the average gap is average_gap_days like the
+    call analysis engines take it. Min/max gap and call days are exact as
+    long as each phone's calls arrive in time order across chunks (dialer
+    exports are chronological); phones where a later chunk went back in time
+    are marked gaps_exact=False.
+    """
+
+    def __init__(self):
+        self.state = pd.DataFrame({
+            'calls': pd.Series(dtype='int64'),
+            'dated_calls': pd.Series(dtype='int64'),
+            'timed_calls': pd.Series(dtype='int64'),
+            'seconds': pd.Series(dtype='float64'),
+            'first': pd.Series(dtype='int64'),     # ns since epoch, only meaningful when dated_calls > 0
+            'last': pd.Series(dtype='int64'),
+            'min_gap': pd.Series(dtype='float64'),  # seconds, NaN until a phone has two dated calls
+            'max_gap': pd.Series(dtype='float64'),
+            'gap_ns': pd.Series(dtype='int64'),     # sum of the gaps
+            'call_days': pd.Series(dtype='int64'),
+            'gaps_exact': pd.Series(dtype='bool'),
+        })
+        self.name_counts = pd.Series(dtype='int64')  # (phone, name) -> calls
+        self.rows = 0
+        self.chunks = 0
+        # Kept with a saved state for incremental updates: (rows folded, fingerprint of
+        # those rows) per source file, each file's (date column, duration column) and
+        # each phone's dated calls as MetricsCalculator lists them in dates_times_called
+        self.sources = {}
+        self.column_roles = {}
+        self.dates_called = pd.Series(dtype=object)
+
+    def add(self, phones, dates=None, seconds=None, names=None):
+        """Fold one chunk; phones are normalized numbers (missing ones are skipped)
+
+        dates are call datetimes, seconds call durations (only positive ones
+        count as timed calls) and names the contact names, all aligned with phones.
+        """
+        count = len(phones)
+        chunk = pd.DataFrame({
+            'phone': np.asarray(phones, dtype=object),
+            'date': pd.to_datetime(np.asarray(dates), errors='coerce') if dates is not None
+            else np.full(count, np.datetime64('NaT'), dtype='datetime64[ns]'),
+            'seconds': np.asarray(seconds, dtype=float) if seconds is not None else np.nan,
+        }, index=pd.RangeIndex(count))
+        if names is not None:
+            chunk['name'] = np.asarray(names, dtype=object)
+        chunk = chunk[chunk['phone'].notna()]
+        self.rows += len(chunk)
+        self.chunks += 1
+        if chunk.empty:
+            return
+
+        summary = self._summarize(chunk)
+        known = summary.index.isin(self.state.index)
+        if known.any():
+            seen = summary[known]
+            self.state.loc[seen.index] = self._combine(self.state.loc[seen.index], seen)
+        self.state = pd.concat([self.state, summary[~known]]) if self.state.size else summary[~known].copy()
+
+        if names is not None:
+            counts = chunk.dropna(subset=['name']).groupby(['phone', 'name'], sort=False).size()
+            if self.name_counts.empty:
+                self.name_counts = counts
+            else:
+                self.name_counts = pd.concat([self.name_counts, counts]).groupby(level=[0, 1], sort=False).sum()
+
+    def _summarize(self, chunk):
+        """Aggregates of one chunk, indexed by phone in first-appearance order"""
+        grouped = chunk.groupby('phone', sort=False)
+        timed = chunk['seconds'] > 0
+        summary = pd.DataFrame({
+            'calls': grouped.size(),
+            'dated_calls': grouped['date'].count(),
+            'timed_calls': timed.groupby(chunk['phone'], sort=False).sum(),
+            'seconds': chunk['seconds'].where(timed, 0.0).groupby(chunk['phone'], sort=False).sum(),
+        })
+        summary['first'] = np.int64(0)
+        summary['last'] = np.int64(0)
+        summary['min_gap'] = np.nan
+        summary['max_gap'] = np.nan
+        summary['gap_ns'] = np.int64(0)
+        summary['call_days'] = np.int64(0)
+        summary['gaps_exact'] = True
+
+        dated = chunk[chunk['date'].notna()]
+        if dated.empty:
+            return summary
+
+        # Consecutive calls of the same phone after one (phone, time) sort
+        dated = dated.sort_values(['phone', 'date'], kind='stable')
+        stamps = dated['date'].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        keys = dated['phone'].to_numpy()
+        same_phone = np.r_[False, keys[1:] == keys[:-1]]
+        gaps = pd.Series(np.r_[0, np.diff(stamps)] / NS_PER_SECOND, index=dated.index)[same_phone]
+        days = stamps // (86_400 * NS_PER_SECOND)
+        new_day = ~(same_phone & np.r_[False, days[1:] == days[:-1]])
+
+        by_phone = dated.groupby('phone', sort=False)['date']
+        summary.loc[by_phone.min().index, 'first'] = by_phone.min().to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        summary.loc[by_phone.max().index, 'last'] = by_phone.max().to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        if len(gaps):
+            gap_groups = gaps.groupby(dated.loc[gaps.index, 'phone'], sort=False)
+            summary.loc[gap_groups.min().index, 'min_gap'] = gap_groups.min().to_numpy()
+            summary.loc[gap_groups.max().index, 'max_gap'] = gap_groups.max().to_numpy()
+            gap_ns = pd.Series(np.diff(stamps)[same_phone[1:]]).groupby(keys[same_phone], sort=False).sum()
+            summary.loc[gap_ns.index, 'gap_ns'] = gap_ns.to_numpy()
+        day_counts = pd.Series(new_day, index=dated.index).groupby(dated['phone'], sort=False).sum()
+        summary.loc[day_counts.index, 'call_days'] = day_counts.to_numpy()
+        return summary
+
+    def _combine(self, old, new):
+        """Merge the running state of some phones with a chunk's aggregates for the same phones"""
+        both_dated = (old['dated_calls'] > 0) & (new['dated_calls'] > 0)
+        in_order = both_dated & (new['first'] >= old['last'])
+        boundary = ((new['first'] - old['last']) / NS_PER_SECOND).where(in_order)
+
+        combined = pd.DataFrame(index=old.index)
+        for col in ['calls', 'dated_calls', 'timed_calls', 'seconds']:
+            combined[col] = old[col] + new[col]
+
+        # Integer nanoseconds; a side without dated calls carries a meaningless 0
+        old_dated = old['dated_calls'] > 0
+        combined['first'] = np.where(both_dated, np.minimum(old['first'], new['first']), np.where(old_dated, old['first'], new['first']))
+        combined['last'] = np.where(both_dated, np.maximum(old['last'], new['last']), np.where(old_dated, old['last'], new['last']))
+
+        combined['min_gap'] = np.fmin(np.fmin(old['min_gap'], new['min_gap']), boundary)
+        combined['max_gap'] = np.fmax(np.fmax(old['max_gap'], new['max_gap']), boundary)
+        # Out of order the chunks' gaps aren't the phone's gaps, but the phone's still add up to last - first
+        combined['gap_ns'] = np.where(both_dated & ~in_order, combined['last'] - combined['first'],
+                                      old['gap_ns'] + new['gap_ns'] + np.where(in_order, new['first'] - old['last'], 0))
+
+        # A chunk starting on the day the previous one ended continues that call day
+        same_day = in_order & (old['last'] // (86_400 * NS_PER_SECOND) == new['first'] // (86_400 * NS_PER_SECOND))
+        combined['call_days'] = old['call_days'] + new['call_days'] - same_day.astype(np.int64)
+        combined['gaps_exact'] = old['gaps_exact'] & new['gaps_exact'] & (in_order | ~both_dated)
+        return combined[old.columns]
+
+    def result(self):
+        """One row per phone (first-appearance order)
+
+        Columns: calls, dated_calls, timed_calls, seconds, first_call,
+        last_call, avg_gap/min_gap/max_gap (seconds, NaN below two dated
+        calls), avg_gap_days (average_gap_days), call_days,
+        gaps_exact and name (most common, None if unknown).
+        """
+        state = self.state
+        dated = state['dated_calls'] > 0
+        result = pd.DataFrame({
+            'calls': state['calls'].astype(np.int64),
+            'dated_calls': state['dated_calls'].astype(np.int64),
+            'timed_calls': state['timed_calls'].astype(np.int64),
+            'seconds': state['seconds'].astype(float),
+            'first_call': pd.to_datetime(state['first'].where(dated).astype('Int64'), unit='ns'),
+            'last_call': pd.to_datetime(state['last'].where(dated).astype('Int64'), unit='ns'),
+        }, index=state.index)
+        result.index.name = 'phone'
+
+        multiple = state['dated_calls'] >= 2
+        result['avg_gap'] = ((state['last'] - state['first']) / NS_PER_SECOND / (state['dated_calls'] - 1)).where(multiple)
+        result['min_gap'] = state['min_gap'].where(multiple)
+        result['max_gap'] = state['max_gap'].where(multiple)
+        result['avg_gap_days'] = pd.Series(average_gap_days(state['gap_ns'].to_numpy(dtype=np.int64),
+                                                            state['dated_calls'].to_numpy() - 1), index=state.index).where(multiple)
+        result['call_days'] = state['call_days'].astype(np.int64)
+        result['gaps_exact'] = state['gaps_exact'].astype(bool)
+
+        result['name'] = None
+        names = self.most_common_names()
+        result.loc[names.index, 'name'] = names.to_numpy()
+        return result
+
+    def most_common_names(self, first_seen=False):
+        """Most common name per phone (phones without a name are left out)
+
+        Ties go to the smallest name, like MetricsCalculator's engines, or
+        with first_seen to the name that came first, like call_gaps.
+        """
+        if self.name_counts.empty:
+            return pd.Series(dtype=object)
+        counts = self.name_counts if first_seen else self.name_counts.sort_index()
+        best = counts.groupby(level=0, sort=False).idxmax()
+        return pd.Series([name for phone, name in best], index=best.index, dtype=object)
+
+    def save(self, path):
+        """Pickle the running totals so a later run can keep folding into them (see load)"""
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            pickle.dump({'version': STATE_VERSION, 'aggregates': self}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Aggregates written by save(), None when missing, unreadable or from another version"""
+        try:
+            with open(path, 'rb') as f:
+                saved = pickle.load(f)
+        except (OSError, EOFError, AttributeError, pickle.UnpicklingError):
+            return None
+        if not isinstance(saved, dict) or saved.get('version') != STATE_VERSION:
+            return None
+        return saved['aggregates']
@@ -0,0 +1,82 @@
+# helpers/column_ops.py
+import numpy as np
+import pandas as pd
+
+BLANK_VALUES = ['', 'nan', 'None']
+
+
+def row_display_dtype(df):
+    """Dtype a single row of df takes when read with df.iloc[idx]
+
+    An all-numeric frame upcasts its rows (ints print as 3.0 next to a float
+    column); anything mixed with text stays object and keeps each value as is.
+    """
+    if len(df) == 0:
+        return None
+    dtype = df.iloc[0].dtype
+    return None if dtype == object else dtype
+
+
+def stripped_text(values, display_dtype=None, blank_values=BLANK_VALUES):
+    """str(value).strip() for every cell, None where the cell is blank or missing
+
+    Missing cells are masked and the rest converted with one astype(str);
+    the strings are then factorized so each distinct one is stripped once.
+    """
+    if display_dtype is not None and values.dtype != display_dtype:
+        values = values.astype(display_dtype)
+
+    missing = values.isna().to_numpy()
+    raw = values.astype(object).where(~missing, '').astype(str).to_numpy(dtype=object)
+    codes, distinct = pd.factorize(raw)
+    cleaned = pd.Series(distinct, dtype=object).str.strip()
+    cleaned = cleaned.where(~cleaned.isin(blank_values), None).to_numpy(dtype=object)
+
+    text = pd.Series(cleaned[codes], index=values.index, dtype=object)
+    text[missing] = None
+    return text
+
+
+def join_labeled_columns(df, columns, separator=' | ', empty_text='No updates'):
+    """Join the non-blank "col: value" parts of each row across columns
+
+    Columnar equivalent of looping over df.iloc[idx][col] for each row:
+    blank cells ('', 'nan', 'None', NaN) are skipped and rows with nothing
+    left get empty_text.
+    """
+    display_dtype = row_display_dtype(df)
+    combined = np.full(len(df), None, dtype=object)
+
+    for col in columns:
+        text = stripped_text(df[col], display_dtype).to_numpy()
+        present = pd.notna(text)
+        if not present.any():
+            continue
+
+        labeled = f"{col}: " + text[present]
+        previous = combined[present]
+        has_previous = pd.notna(previous)
+        labeled[has_previous] = previous[has_previous] + separator + labeled[has_previous]
+        combined[present] = labeled
+
+    combined[pd.isna(combined)] = empty_text
+    return pd.Series(combined, index=df.index, dtype=object)
+
+
+def coalesce_columns(df, columns, default=''):
+    """First non-empty str(value).strip() across columns for each row
+
+    Columnar equivalent of scanning df.iloc[idx][col] left to right and
+    taking the first cell that is not NaN and not blank: empties are masked
+    and the remaining values are back-filled across the columns.
+    """
+    if not columns:
+        return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+    display_dtype = row_display_dtype(df)
+    candidates = pd.DataFrame(
+        {position: stripped_text(df[col], display_dtype, blank_values=['']) for position, col in enumerate(columns)},
+        index=df.index, dtype=object,
+    )
+    first = candidates.bfill(axis=1).iloc[:, 0]
+    return first.where(first.notna(), default).astype(object)
@@ -0,0 +1,120 @@
+# helpers/column_roles.py
+import re
+from functools import lru_cache
+
+# Distinct header strings remembered per classifier
+CACHE_SIZE = 8192
+
+
+class ColumnRoles:
+    """Roles of column headers from one compiled regex, memoized per header string
+
+    patterns maps each role (in priority order) to the substrings - or, with
+    regex=True, the regular expressions - that mark it in a lower-cased
+    header. Every role is an optional lookahead of the same pattern, so one
+    match finds all the roles a header has, and each distinct header is only
+    matched once.
+    """
+
+    def __init__(self, patterns, regex=False):
+        self.names = list(patterns)
+        lookaheads = []
+        for position, role_patterns in enumerate(patterns.values()):
+            alternation = '|'.join(pattern if regex else re.escape(pattern) for pattern in role_patterns)
+            lookaheads.append(f'(?:(?=[\\s\\S]*?(?P<role{position}>{alternation})))?')
+        self.pattern = re.compile(''.join(lookaheads))
+        self._roles = lru_cache(maxsize=CACHE_SIZE)(self._match)
+
+    def _match(self, header):
+        found = self.pattern.match(header.lower())
+        return tuple(name for position, name in enumerate(self.names) if found.group(f'role{position}') is not None)
+
+    def roles(self, header):
+        """Every role the header matches, in priority order"""
+        return self._roles(str(header))
+
+    def role(self, header, default=None):
+        """The header's highest-priority role, default when it matches none"""
+        roles = self.roles(header)
+        return roles[0] if roles else default
+
+    def has(self, header, role):
+        return role in self.roles(header)
+
+    def columns(self, headers, role):
+        """Headers having the role, in order"""
+        return [header for header in headers if role in self.roles(header)]
+
+    def first(self, headers, role):
+        """First header having the role, None if there is none"""
+        return next((header for header in headers if role in self.roles(header)), None)
+
+
+# identify_column_type in merged_app / leads_merge_app: first matching role wins, else 'Other'
+LEAD_COLUMNS = ColumnRoles({
+    'Name': ['name', 'full name', 'fullname', 'first name', 'contact name', 'person'],
+    'Phone': ['phone', 'number', 'phone number', 'contact', 'tel', 'telephone', 'mobile'],
+    'Email': ['email', 'e-mail', 'mail', 'gmail'],
+    'City': ['city', 'town', 'location', 'area', 'district'],
+    'Update': ['update', 'followup', 'follow up', 'status', 'remark', 'comment', 'note', 'call', 'follow', 'weekend'],
+})
+
+# DataCleaner contact columns: each role takes the first column matching it
+CONTACT_COLUMNS = ColumnRoles({
+    'name': ['name', 'fullname', 'contact', 'customer', 'person'],
+    'email': ['email', 'mail'],
+    'phone': ['phone', 'mobile', 'number', 'contact', 'phonenumber'],
+    'city': ['city', 'location', 'area', 'town'],
+})
+
+# DataCleaner updates sheets: update columns are the ones with an update role and no contact role
+UPDATE_COLUMNS = ColumnRoles({
+    'contact': ['name', 'email', 'phone', 'mobile', 'contact', 'city', 'location', 'area', 'town'],
+    'update': ['update', 'call', 'followup', 'follow', '1st', '2nd', '3rd',
+               'first', 'second', 'third', 'status', 'note', 'remark', 'comment'],
+})
+
+# Call log columns: 'date'/'duration'/'type' candidates the metrics parse, 'contact' columns
+# DataCleaner picks out itself and 'kept' columns a lazy read parses
+CALL_LOG_COLUMNS = ColumnRoles({
+    'date': ['date', 'time', 'timestamp'],
+    'duration': ['duration', 'call time', 'length'],
+    'contact': ['name', 'phone', 'mobile', 'number'],
+    'kept': ['date', 'time', 'duration', 'call time', 'length', 'email', 'type'],
+    'type': ['type'],
+})
+
+# app4 LeadsProcessor: contact roles (first matching wins) and numbered call / follow-up columns
+APP4_COLUMNS = ColumnRoles({
+    'Name': ['name', 'fullname', 'full name', 'contact name'],
+    'Email': ['email', 'e-mail', 'mail'],
+    'Phone': ['phone', 'mobile', 'contact', 'number', 'telephone'],
+    'City': ['city', 'location', 'area'],
+})
+APP4_UPDATE_COLUMNS = ColumnRoles({
+    'Update': [
+        # Numbered calls
+        r'.*call.*1.*', r'.*1.*call.*', r'first.*call', r'call.*one',
+        r'.*call.*2.*', r'.*2.*call.*', r'second.*call', r'call.*two',
+        r'.*call.*3.*', r'.*3.*call.*', r'third.*call', r'call.*three',
+        r'.*call.*4.*', r'.*4.*call.*', r'fourth.*call',
+        r'.*call.*5.*', r'.*5.*call.*', r'fifth.*call',
+        r'.*call.*6.*', r'.*6.*call.*', r'sixth.*call',
+        r'.*call.*7.*', r'.*7.*call.*', r'seventh.*call',
+
+        # Follow-ups
+        r'.*follow.*up.*1.*', r'.*1.*follow.*up.*', r'first.*follow.*up',
+        r'.*follow.*up.*2.*', r'.*2.*follow.*up.*', r'second.*follow.*up',
+        r'.*follow.*up.*3.*', r'.*3.*follow.*up.*', r'third.*follow.*up',
+        r'.*follow.*up.*4.*', r'.*4.*follow.*up.*', r'fourth.*follow.*up',
+        r'.*follow.*up.*5.*', r'.*5.*follow.*up.*', r'fifth.*follow.*up',
+        r'.*follow.*up.*6.*', r'.*6.*follow.*up.*', r'sixth.*follow.*up',
+        r'.*follow.*up.*7.*', r'.*7.*follow.*up.*', r'seventh.*follow.*up',
+
+        # Weekend calls
+        r'weekend.*call', r'weekend.*follow.*up',
+
+        # General update patterns
+        r'update', r'followup', r'follow.*up', r'status',
+    ],
+}, regex=True)
@@ -1,12 +1,43 @@
 # helpers/data_cleaning.py
 import pandas as pd
 import os
-import re
+import hashlib
 from datetime import datetime
 
+from phone_normalizer import normalize_phone, normalize_phone_series, LOCAL_FORMAT
+from column_ops import join_labeled_columns
+from file_reader import read_header, read_table, read_tables
+from file_cache import FileCache
+from output_writers import DEFAULT_FORMAT, output_path, write_frame
+from instrumentation import RunProfile, profiled
+from call_log_stream import read_csv_chunks
+from column_roles import CALL_LOG_COLUMNS, CONTACT_COLUMNS, UPDATE_COLUMNS
+from lead_resolution import resolve_leads, canonical_leads
+from schema import LEADS_SCHEMA, UPDATES_SCHEMA, CALL_LOGS_SCHEMA, apply_schema, describe_saving, whole_numbers
+from lead_store import LeadStore
+from call_cube import CALL_CUBE_NAME
+
+# Cleaned per-file frames are kept here, next to the reports - never in the data folder,
+# which may be read-only or shared - with one subfolder per data folder
+CACHE_FOLDER = '.cleaning_cache'
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'results', CACHE_FOLDER)
+
 class DataCleaner:
-    def __init__(self):
+    def __init__(self, max_workers=None, use_cache=True, profile=None, call_log_chunk_rows=None, lazy=False, store_path=None,
+                 cache_dir=None):
         self.timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        self.max_workers = max_workers  # file parsing processes, None = one per CPU
+        self.use_cache = use_cache  # reuse cleaned frames of unchanged files between runs
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR  # where the cleaned-frame cache is kept
+        self.cache = None
+        self.progress_callback = None  # progress(stage, file, done, total, rows) from a background runner
+        self.profile = profile if profile is not None else RunProfile()  # stage timings, saved as run_profile.json
+        self.call_log_chunk_rows = call_log_chunk_rows  # stream call logs in chunks of this many rows instead of merging them
+        self.lazy = lazy  # classify files by their header row and parse only the columns cleaning reads
+        self.store_path = store_path  # SQLite file save_cleaned_data also upserts into (lead_store), None = files only
+        self.call_logs_files = []
+        self._preloaded = {}
+        self._projections = {}  # file -> column positions to parse (lazy mode)
     
     def find_files(self, base_folder):
         """Find all CSV/Excel files in folder structure"""
@@ -21,8 +52,12 @@ class DataCleaner:
         print(f"🔍 Found {len(all_files)} files")
         return all_files
     
-    def categorize_files(self, file_list):
-        """Better file categorization based on filename patterns"""
+    def categorize_files(self, file_list, headers=None):
+        """Better file categorization based on filename patterns
+        
+        A file whose name matches no pattern is classified by its columns when
+        headers ({file: column names}) has it, otherwise it counts as leads.
+        """
         leads_files = []
         updates_files = []
         call_logs_files = []
@@ -43,6 +78,10 @@ class DataCleaner:
             elif any(keyword in filename_lower for keyword in ['call', 'log', 'dial', 'report', 'communication']):
                 call_logs_files.append(file)
             
+            elif headers and headers.get(file) is not None:
+                kind = self._category_from_header(headers[file])
+                {'leads': leads_files, 'updates': updates_files, 'call_logs': call_logs_files}[kind].append(file)
+            
             else:
                 # Default to leads if unsure
                 leads_files.append(file)
@@ -52,27 +91,7 @@ class DataCleaner:
     
     def clean_phone_number(self, phone):
         """Standardize phone number format"""
-        if pd.isna(phone) or phone in ['', 'nan', 'None', 'null']:
-            return None
-        
-        phone_str = str(phone).strip()
-        
-        # Remove all non-digit characters
-        cleaned = re.sub(r'[^\d]', '', phone_str)
-        
-        # Handle Sri Lankan numbers
-        if cleaned.startswith('94'):
-            cleaned = '0' + cleaned[2:]
-        elif cleaned.startswith('+94'):
-            cleaned = '0' + cleaned[3:]
-        elif len(cleaned) == 9 and not cleaned.startswith('0'):
-            cleaned = '0' + cleaned
-        
-        # Ensure valid length (10 digits for Sri Lanka)
-        if len(cleaned) == 10 and cleaned.startswith('0'):
-            return cleaned
-        else:
-            return None
+        return normalize_phone(phone, LOCAL_FORMAT)
     
     def clean_email(self, email):
         """Standardize email format"""
@@ -89,40 +108,15 @@ class DataCleaner:
     
     def extract_contact_info(self, df):
         """Extract name, email, phone, city from dataframe"""
-        result = {'name': None, 'email': None, 'phone': None, 'city': None}
-        
         # Convert all column names to lowercase for matching
         df.columns = [str(col).lower().strip() for col in df.columns]
         
-        # Find name column
-        name_patterns = ['name', 'fullname', 'contact', 'customer', 'person']
-        for col in df.columns:
-            if any(pattern in col for pattern in name_patterns):
-                result['name'] = df[col]
-                break
-        
-        # Find email column
-        email_patterns = ['email', 'mail']
-        for col in df.columns:
-            if any(pattern in col for pattern in email_patterns):
-                result['email'] = df[col]
-                break
-        
-        # Find phone column
-        phone_patterns = ['phone', 'mobile', 'number', 'contact', 'phonenumber']
-        for col in df.columns:
-            if any(pattern in col for pattern in phone_patterns):
-                result['phone'] = df[col]
-                break
-        
-        # Find city column
-        city_patterns = ['city', 'location', 'area', 'town']
-        for col in df.columns:
-            if any(pattern in col for pattern in city_patterns):
-                result['city'] = df[col]
-                break
-        
-        return result
+        roles = self._contact_columns(df.columns)
+        return {role: df[col] if col is not None else None for role, col in roles.items()}
+    
+    def _contact_columns(self, columns):
+        """Name, email, phone and city column (lower-case names), None when a role has no column"""
+        return {role: CONTACT_COLUMNS.first(columns, role) for role in CONTACT_COLUMNS.names}
     
     def extract_updates_info(self, df):
         """Extract all update columns and combine them"""
@@ -132,82 +126,100 @@ class DataCleaner:
         contact_info = self.extract_contact_info(df)
         
         # Find ALL update-related columns (not contact info columns)
-        update_columns = []
-        contact_cols = ['name', 'email', 'phone', 'mobile', 'contact', 'city', 'location', 'area', 'town']
-        
-        for col in df.columns:
-            is_contact_col = any(contact in col for contact in contact_cols)
-            is_update_col = any(keyword in col for keyword in [
-                'update', 'call', 'followup', 'follow', '1st', '2nd', '3rd', 
-                'first', 'second', 'third', 'status', 'note', 'remark', 'comment'
-            ])
-            
-            if not is_contact_col and is_update_col:
-                update_columns.append(col)
+        update_columns = self._update_columns(df.columns)
         
         # If no specific update columns found, use all non-contact columns
         if not update_columns:
-            update_columns = [col for col in df.columns if not any(contact in col for contact in contact_cols)]
+            update_columns = [col for col in df.columns if not UPDATE_COLUMNS.has(col, 'contact')]
         
         return contact_info, update_columns
     
+    def _update_columns(self, columns):
+        """Columns (lower-case names) holding call updates, leaving out contact info columns"""
+        return [col for col in columns if UPDATE_COLUMNS.roles(col) == ('update',)]
+    
+    def _category_from_header(self, header):
+        """'call_logs', 'updates' or 'leads' from a file's column names
+        
+        Date and duration columns make a call log, update columns an updates
+        sheet; anything else is leads.
+        """
+        columns = [str(col).lower().strip() for col in header]
+        has_date = bool(CALL_LOG_COLUMNS.columns(columns, 'date'))
+        has_duration = bool(CALL_LOG_COLUMNS.columns(columns, 'duration'))
+        if has_date and has_duration:
+            return 'call_logs'
+        if self._update_columns(columns):
+            return 'updates'
+        return 'leads'
+    
+    def _projected_columns(self, kind, header):
+        """Positions of the header columns cleaning a `kind` file reads, None to read every column"""
+        columns = [str(col).lower().strip() for col in header]
+        keep = {col for col in self._contact_columns(columns).values() if col is not None}
+        if kind == 'updates':
+            update_columns = self._update_columns(columns)
+            if not update_columns:
+                # extract_updates_info falls back to every non-contact column
+                return None
+            keep.update(update_columns)
+        elif kind == 'call_logs':
+            keep.update(CALL_LOG_COLUMNS.columns(columns, 'kept'))
+        if not keep:
+            return None
+        return [position for position, col in enumerate(columns) if col in keep]
+    
+    def _contact_column(self, values, df):
+        """Contact column as found, or all None when the file has no such column"""
+        if values is None:
+            return pd.Series([None] * len(df), index=df.index, dtype=object)
+        return values
+    
+    @profiled('merge_leads')
     def merge_leads_files(self, leads_files):
         """Merge and clean all leads files - keep name, email, phone, city"""
         all_leads = []
         
-        for file in leads_files:
+        for position, file in enumerate(leads_files):
+            self._report_progress('leads', file, position, len(leads_files), sum(len(df) for df in all_leads))
             try:
-                # Read file
-                if file.endswith('.csv'):
-                    df = pd.read_csv(file)
-                else:
-                    df = pd.read_excel(file)
-                
-                print(f"📖 Reading leads: {os.path.basename(file)}")
-                
-                # Extract contact info (name, email, phone, city)
-                contact_info = self.extract_contact_info(df)
-                
-                # Create standardized dataframe with required columns + city
-                lead_data = {
-                    'name': contact_info['name'],
-                    'email': contact_info['email'] if contact_info['email'] is not None else [None] * len(df),
-                    'phone': contact_info['phone'],
-                    'original_file': os.path.basename(file),
-                    'employee': self._extract_employee_name(file)
-                }
-                
-                # Add city if it exists
-                if contact_info['city'] is not None:
-                    lead_data['city'] = contact_info['city']
-                
-                standardized_df = pd.DataFrame(lead_data)
+                standardized_df = self._standardized_frame(file, 'leads', self._standardize_leads_file)
                 all_leads.append(standardized_df)
                 
-                print(f"✅ Processed leads: {os.path.basename(file)}")
-                if contact_info['city'] is not None:
-                    print(f"   📍 City column found and included")
-                
             except Exception as e:
                 print(f"❌ Error processing {file}: {e}")
         
+        self._report_progress('leads', None, len(leads_files), len(leads_files), sum(len(df) for df in all_leads))
+        
         if all_leads:
             merged_leads = pd.concat(all_leads, ignore_index=True)
             
             # Clean data
-            merged_leads['phone'] = merged_leads['phone'].apply(self.clean_phone_number)
-            merged_leads['email'] = merged_leads['email'].apply(self.clean_email)
-            merged_leads['name'] = merged_leads['name'].astype(str).str.title().str.strip()
-            
-            # Clean city if it exists
-            if 'city' in merged_leads.columns:
-                merged_leads['city'] = merged_leads['city'].astype(str).str.title().str.strip()
+            with self.profile.span('clean_leads', rows_in=len(merged_leads)) as span:
+                merged_leads['phone'] = normalize_phone_series(merged_leads['phone'], LOCAL_FORMAT)
+                merged_leads['email'] = merged_leads['email'].apply(self.clean_email)
+                merged_leads['name'] = merged_leads['name'].astype(str).str.title().str.strip()
+                
+                # Clean city if it exists
+                if 'city' in merged_leads.columns:
+                    merged_leads['city'] = merged_leads['city'].astype(str).str.title().str.strip()
+                span.rows_out = len(merged_leads)
             
             # Remove duplicates based on phone + email
             before_dedup = len(merged_leads)
-            merged_leads = merged_leads.drop_duplicates(subset=['phone', 'email'], keep='first')
+            with self.profile.span('dedup_leads', rows_in=before_dedup) as span:
+                merged_leads = merged_leads.drop_duplicates(subset=['phone', 'email'], keep='first')
+                span.rows_out = len(merged_leads)
             after_dedup = len(merged_leads)
             
+            # Group leads that are the same person under other spellings / contacts (rows are kept)
+            with self.profile.span('resolve_leads', rows_in=after_dedup) as span:
+                merged_leads = resolve_leads(merged_leads)
+                span.rows_out = int(merged_leads['cluster_id'].nunique())
+            print(f"🧩 Leads: {after_dedup - span.rows_out} more records are likely duplicates of another lead ({span.rows_out} people)")
+            
+            merged_leads = self._compact(merged_leads, LEADS_SCHEMA, 'Leads')
+            
             print(f"🎯 Leads: {after_dedup} records (removed {before_dedup - after_dedup} duplicates)")
             if 'city' in merged_leads.columns:
                 print(f"📍 City data included: {merged_leads['city'].notna().sum()} records have city info")
@@ -216,90 +228,45 @@ class DataCleaner:
         else:
             return pd.DataFrame()
     
+    @profiled('merge_updates')
     def merge_updates_files(self, updates_files):
         """Merge and clean all updates files - handle multiple update columns, keep city"""
         all_updates = []
         
-        for file in updates_files:
+        for position, file in enumerate(updates_files):
+            self._report_progress('updates', file, position, len(updates_files), sum(len(df) for df in all_updates))
             try:
-                # Read file
-                if file.endswith('.csv'):
-                    df = pd.read_csv(file)
-                else:
-                    df = pd.read_excel(file)
-                
-                print(f"📖 Reading updates: {os.path.basename(file)}")
-                
-                # Extract contact info and update columns (including city)
-                contact_info, update_columns = self.extract_updates_info(df)
-                
-                print(f"   Found update columns: {update_columns}")
-                
-                # Process each row to combine all update columns
-                processed_rows = []
-                for idx in range(len(df)):
-                    # Get contact info for this row (including city)
-                    row_contact = {}
-                    for key, value in contact_info.items():
-                        if value is not None:
-                            row_contact[key] = value.iloc[idx] if hasattr(value, 'iloc') else value[idx]
-                        else:
-                            row_contact[key] = None
-                    
-                    # Combine all update columns for this row
-                    update_texts = []
-                    for col in update_columns:
-                        update_val = df.iloc[idx][col]
-                        if pd.notna(update_val) and str(update_val).strip() not in ['', 'nan', 'None']:
-                            update_texts.append(f"{col}: {str(update_val).strip()}")
-                    
-                    # Create combined update text
-                    combined_update = " | ".join(update_texts) if update_texts else "No updates"
-                    
-                    # Create row data (including city)
-                    row_data = {
-                        'name': row_contact['name'],
-                        'email': row_contact['email'],
-                        'phone': row_contact['phone'],
-                        'update_text': combined_update,
-                        'original_file': os.path.basename(file),
-                        'employee': self._extract_employee_name(file),
-                        'timestamp': datetime.now()
-                    }
-                    
-                    # Add city if it exists
-                    if row_contact['city'] is not None:
-                        row_data['city'] = row_contact['city']
-                    
-                    processed_rows.append(row_data)
-                
-                standardized_df = pd.DataFrame(processed_rows)
+                standardized_df = self._standardized_frame(file, 'updates', self._standardize_updates_file)
                 all_updates.append(standardized_df)
                 
-                print(f"✅ Processed updates: {os.path.basename(file)}")
-                if contact_info['city'] is not None:
-                    print(f"   📍 City column found and included")
-                
             except Exception as e:
                 print(f"❌ Error processing {file}: {e}")
         
+        self._report_progress('updates', None, len(updates_files), len(updates_files), sum(len(df) for df in all_updates))
+        
         if all_updates:
             merged_updates = pd.concat(all_updates, ignore_index=True)
             
             # Clean data
-            merged_updates['phone'] = merged_updates['phone'].apply(self.clean_phone_number)
-            merged_updates['email'] = merged_updates['email'].apply(self.clean_email)
-            merged_updates['name'] = merged_updates['name'].astype(str).str.title().str.strip()
-            
-            # Clean city if it exists
-            if 'city' in merged_updates.columns:
-                merged_updates['city'] = merged_updates['city'].astype(str).str.title().str.strip()
+            with self.profile.span('clean_updates', rows_in=len(merged_updates)) as span:
+                merged_updates['phone'] = normalize_phone_series(merged_updates['phone'], LOCAL_FORMAT)
+                merged_updates['email'] = merged_updates['email'].apply(self.clean_email)
+                merged_updates['name'] = merged_updates['name'].astype(str).str.title().str.strip()
+                
+                # Clean city if it exists
+                if 'city' in merged_updates.columns:
+                    merged_updates['city'] = merged_updates['city'].astype(str).str.title().str.strip()
+                span.rows_out = len(merged_updates)
             
             # Remove duplicates
             before_dedup = len(merged_updates)
-            merged_updates = merged_updates.drop_duplicates(subset=['name', 'phone', 'update_text'], keep='first')
+            with self.profile.span('dedup_updates', rows_in=before_dedup) as span:
+                merged_updates = merged_updates.drop_duplicates(subset=['name', 'phone', 'update_text'], keep='first')
+                span.rows_out = len(merged_updates)
             after_dedup = len(merged_updates)
             
+            merged_updates = self._compact(merged_updates, UPDATES_SCHEMA, 'Updates')
+            
             print(f"🎯 Updates: {after_dedup} records (removed {before_dedup - after_dedup} duplicates)")
             if 'city' in merged_updates.columns:
                 print(f"📍 City data included: {merged_updates['city'].notna().sum()} records have city info")
@@ -308,63 +275,229 @@ class DataCleaner:
         else:
             return pd.DataFrame()
     
+    @profiled('merge_call_logs')
     def merge_call_logs(self, call_logs_files):
         """Merge call log files WITH phone number standardization"""
         all_call_logs = []
         
-        for file in call_logs_files:
+        for position, file in enumerate(call_logs_files):
+            self._report_progress('call_logs', file, position, len(call_logs_files), sum(len(df) for df in all_call_logs))
             try:
-                # Read file
-                if file.endswith('.csv'):
-                    df = pd.read_csv(file)
-                else:
-                    df = pd.read_excel(file)
-                
-                print(f"📖 Reading call logs: {os.path.basename(file)}")
-                
-                # Extract contact info
-                contact_info = self.extract_contact_info(df)
-                
-                # Create standardized dataframe
-                call_data = {
-                    'name': contact_info['name'],
-                    'phone': contact_info['phone'],
-                    'original_file': os.path.basename(file),
-                    'employee': self._extract_employee_name(file)
-                }
-                
-                # Add all other columns from the original file
-                for col in df.columns:
-                    col_lower = str(col).lower()
-                    if not any(keyword in col_lower for keyword in ['name', 'phone', 'mobile', 'number']):
-                        call_data[col] = df[col]
-                
-                standardized_df = pd.DataFrame(call_data)
+                standardized_df = self._standardized_frame(file, 'call_logs', self._standardize_call_logs_file)
                 all_call_logs.append(standardized_df)
                 
-                print(f"✅ Processed call logs: {os.path.basename(file)}")
-                
             except Exception as e:
                 print(f"❌ Error processing {file}: {e}")
         
+        self._report_progress('call_logs', None, len(call_logs_files), len(call_logs_files), sum(len(df) for df in all_call_logs))
+        
         if all_call_logs:
             # Merge all call logs
             merged_calls = pd.concat(all_call_logs, ignore_index=True)
             
             # Clean phone numbers
-            merged_calls['phone_cleaned'] = merged_calls['phone'].apply(self.clean_phone_number)
-            
-            # Remove rows without valid phone numbers
             before_clean = len(merged_calls)
-            merged_calls = merged_calls[merged_calls['phone_cleaned'].notna()]
+            with self.profile.span('clean_call_log_phones', rows_in=before_clean) as span:
+                merged_calls['phone_cleaned'] = normalize_phone_series(merged_calls['phone'], LOCAL_FORMAT)
+                
+                # Remove rows without valid phone numbers
+                merged_calls = merged_calls[merged_calls['phone_cleaned'].notna()]
+                span.rows_out = len(merged_calls)
             after_clean = len(merged_calls)
             
+            merged_calls = self._compact(merged_calls, CALL_LOGS_SCHEMA, 'Call logs')
+            
             print(f"🎯 Call logs: {after_clean} records with valid phone numbers (removed {before_clean - after_clean} invalid)")
             
             return merged_calls
         else:
             return pd.DataFrame()
     
+    def _standardize_leads_file(self, file, df):
+        """Standardize one leads file - name, email, phone, city"""
+        print(f"📖 Reading leads: {os.path.basename(file)}")
+        
+        # Extract contact info (name, email, phone, city)
+        contact_info = self.extract_contact_info(df)
+        
+        # Create standardized dataframe with required columns + city
+        lead_data = {
+            'name': contact_info['name'],
+            'email': contact_info['email'] if contact_info['email'] is not None else [None] * len(df),
+            'phone': whole_numbers(contact_info['phone']),
+            'original_file': os.path.basename(file),
+            'employee': self._extract_employee_name(file)
+        }
+        
+        # Add city if it exists
+        if contact_info['city'] is not None:
+            lead_data['city'] = contact_info['city']
+        
+        standardized_df = pd.DataFrame(lead_data)
+        
+        print(f"✅ Processed leads: {os.path.basename(file)}")
+        if contact_info['city'] is not None:
+            print(f"   📍 City column found and included")
+        
+        return standardized_df
+    
+    def _standardize_updates_file(self, file, df):
+        """Standardize one updates file - contact info plus combined update text"""
+        print(f"📖 Reading updates: {os.path.basename(file)}")
+        
+        # Extract contact info and update columns (including city)
+        contact_info, update_columns = self.extract_updates_info(df)
+        
+        print(f"   Found update columns: {update_columns}")
+        
+        # Combine all update columns column-wise ("col: value | col: value")
+        update_text = join_labeled_columns(df, update_columns)
+        
+        # Create standardized dataframe (including city); file-level values are broadcast
+        update_data = {
+            'name': self._contact_column(contact_info['name'], df),
+            'email': self._contact_column(contact_info['email'], df),
+            'phone': self._contact_column(whole_numbers(contact_info['phone']), df),
+            'update_text': update_text,
+            'original_file': os.path.basename(file),
+            'employee': self._extract_employee_name(file),
+            'timestamp': datetime.now()
+        }
+        
+        # Add city if it exists
+        if contact_info['city'] is not None:
+            update_data['city'] = contact_info['city']
+        
+        standardized_df = pd.DataFrame(update_data, index=df.index)
+        
+        print(f"✅ Processed updates: {os.path.basename(file)}")
+        if contact_info['city'] is not None:
+            print(f"   📍 City column found and included")
+        
+        return standardized_df
+    
+    def _standardize_call_logs_file(self, file, df):
+        """Standardize one call log file - name, phone and the remaining call columns"""
+        print(f"📖 Reading call logs: {os.path.basename(file)}")
+        
+        standardized_df = self._call_log_frame(file, df)
+        
+        print(f"✅ Processed call logs: {os.path.basename(file)}")
+        
+        return standardized_df
+    
+    def _call_log_frame(self, file, df):
+        """Call log rows with name/phone picked out and the other call columns kept as they are"""
+        # Extract contact info
+        contact_info = self.extract_contact_info(df)
+        
+        # Create standardized dataframe
+        call_data = {
+            'name': contact_info['name'],
+            'phone': whole_numbers(contact_info['phone']),
+            'original_file': os.path.basename(file),
+            'employee': self._extract_employee_name(file)
+        }
+        
+        # Add all other columns from the original file
+        for col in df.columns:
+            if not CALL_LOG_COLUMNS.has(col, 'contact'):
+                call_data[col] = df[col]
+        
+        return pd.DataFrame(call_data)
+    
+    def iter_call_log_chunks(self, call_logs_files, chunk_rows):
+        """Cleaned call log rows in chunks of at most chunk_rows - merge_call_logs without holding every file
+        
+        Each chunk gets the same columns (and phone_cleaned) as merge_call_logs rows.
+        """
+        for position, file in enumerate(call_logs_files):
+            print(f"📖 Streaming call logs: {os.path.basename(file)}")
+            valid_rows = 0
+            try:
+                for chunk in read_csv_chunks(file, chunk_rows, usecols=self._projections.get(file)):
+                    self._report_progress('call_logs', file, position, len(call_logs_files), valid_rows)
+                    chunk = self._call_log_frame(file, chunk)
+                    chunk['phone_cleaned'] = normalize_phone_series(chunk['phone'], LOCAL_FORMAT)
+                    chunk = chunk[chunk['phone_cleaned'].notna()]
+                    valid_rows += len(chunk)
+                    yield chunk
+            except Exception as e:
+                print(f"❌ Error processing {file}: {e}")
+                continue
+            print(f"✅ Streamed call logs: {os.path.basename(file)} ({valid_rows} records with valid phone numbers)")
+        self._report_progress('call_logs', None, len(call_logs_files), len(call_logs_files))
+    
+    def _compact(self, df, schema, label):
+        """Apply the typed schema to a merged frame and report the memory it saved"""
+        with self.profile.span('apply_schema', rows_in=len(df), frame=label) as span:
+            df, before, after = apply_schema(df, schema)
+            span.rows_out = len(df)
+            span.details.update(bytes_before=before, bytes_after=after)
+        print(describe_saving(label, before, after))
+        return df
+    
+    def _report_progress(self, stage, file, done, total, rows=None):
+        """Forward a progress event when running under a background runner"""
+        if self.progress_callback is not None:
+            self.progress_callback(stage, file, done, total, rows)
+    
+    def _standardized_frame(self, file, kind, standardize):
+        """Cleaned frame for one file, from the cache when the file is unchanged"""
+        with self.profile.span(f'{kind}_file', file=os.path.basename(file)) as span:
+            if self.cache is not None:
+                cached_df = self.cache.get(file, self._cache_kind(kind))
+                if cached_df is not None:
+                    print(f"♻️ Unchanged {kind.replace('_', ' ')}: {os.path.basename(file)} (cached)")
+                    span.details['cached'] = True
+                    span.rows_out = len(cached_df)
+                    return cached_df
+                if file not in self._preloaded:
+                    self.cache.stamp([file])
+            
+            # Files not parsed up front by read_tables are read (and timed) here
+            span.details['preloaded'] = file in self._preloaded
+            df = self._read_file(file)
+            span.rows_in = len(df)
+            standardized_df = standardize(file, df)
+            span.rows_out = len(standardized_df)
+            
+            if self.cache is not None:
+                self.cache.put(file, self._cache_kind(kind), standardized_df)
+            return standardized_df
+    
+    def _cache_kind(self, kind):
+        """Cache key kind - projected frames are kept apart from frames with every column"""
+        return f"{kind}:lazy" if self.lazy else kind
+    
+    def _read_headers(self, files):
+        """{file: column names} from each file's header row, None where it can't be read"""
+        headers = {}
+        with self.profile.span('read_headers', files=len(files)):
+            for file in files:
+                try:
+                    headers[file] = read_header(file)
+                except Exception as e:
+                    print(f"⚠️ Could not read the header of {os.path.basename(file)}: {e}")
+                    headers[file] = None
+        return headers
+    
+    def _projected_summary(self, headers):
+        """'parsing 12 of 85 columns in 6 files'"""
+        total = sum(len(headers[file]) for file in self._projections)
+        kept = sum(len(positions) for positions in self._projections.values())
+        return f"parsing {kept} of {total} columns in {len(self._projections)} files"
+    
+    def _read_file(self, file):
+        """Take a file parsed by process_all_data, or read it now"""
+        if file not in self._preloaded:
+            return read_table(file, self._projections.get(file))
+        
+        df, error = self._preloaded.pop(file)
+        if error is not None:
+            raise error
+        return df
+    
     def _extract_employee_name(self, filepath):
         """Extract employee name from immediate subfolder name"""
         path_parts = filepath.split(os.sep)
@@ -381,29 +514,82 @@ class DataCleaner:
         
         return 'Unknown'
     
+    @profiled('process_all_data')
     def process_all_data(self, base_folder):
         """Main method to process all data"""
         print("=" * 50)
         print("🔄 STARTING DATA PROCESSING")
         print("=" * 50)
+        self.call_logs_files = []
         
-        all_files = self.find_files(base_folder)
+        with self.profile.span('find_files') as span:
+            all_files = self.find_files(base_folder)
+            span.details['files'] = len(all_files)
         
         if not all_files:
             print("❌ No files found in the selected folder!")
             return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
         
-        leads_files, updates_files, call_logs_files = self.categorize_files(all_files)
+        headers = self._read_headers(all_files) if self.lazy else None
+        leads_files, updates_files, call_logs_files = self.categorize_files(all_files, headers)
+        
+        # Lazy mode parses only the columns each file's cleaning reads
+        self._projections = {}
+        if self.lazy:
+            for kind, files in [('leads', leads_files), ('updates', updates_files), ('call_logs', call_logs_files)]:
+                for file in files:
+                    if headers.get(file) is not None:
+                        positions = self._projected_columns(kind, headers[file])
+                        if positions is not None:
+                            self._projections[file] = positions
+            print(f"✂️ Projected columns: {self._projected_summary(headers)}")
         
         print(f"\n📊 Processing files...")
         print(f"   Leads: {len(leads_files)} files")
         print(f"   Updates: {len(updates_files)} files")
         print(f"   Call Logs: {len(call_logs_files)} files")
         
+        # Reuse cleaned frames of files that haven't changed since the last run
+        categorized = [(file, 'leads') for file in leads_files]
+        categorized += [(file, 'updates') for file in updates_files]
+        self.call_logs_files = call_logs_files
+        if self.call_log_chunk_rows:
+            # Streamed later through iter_call_log_chunks; never read whole here
+            print(f"🌊 Call logs will be streamed in chunks of {self.call_log_chunk_rows:,} rows")
+        else:
+            categorized += [(file, 'call_logs') for file in call_logs_files]
+        
+        if self.use_cache:
+            folder_key = hashlib.sha1(os.path.abspath(base_folder).encode('utf-8')).hexdigest()[:16]
+            self.cache = FileCache(os.path.join(self.cache_dir, folder_key))
+            removed = self.cache.prune(all_files)
+            if removed:
+                print(f"🗑️ Dropped {removed} cached files that no longer exist")
+            to_read = [file for file, kind in categorized if not self.cache.is_fresh(file, self._cache_kind(kind))]
+            self.cache.stamp(to_read)
+        else:
+            self.cache = None
+            to_read = [file for file, kind in categorized]
+        
+        # Parse new/changed files up front in parallel; the merges below consume them in file order
+        print(f"⚙️ Reading {len(to_read)} of {len(all_files)} files with up to {self.max_workers or os.cpu_count()} workers...")
+        with self.profile.span('read_files', files=len(to_read), workers=self.max_workers) as span:
+            self._preloaded = read_tables(
+                to_read, self.max_workers,
+                on_file_read=lambda file, done, total: self._report_progress('reading', file, done, total),
+                usecols=self._projections
+            )
+            span.rows_out = sum(len(df) for df, error in self._preloaded.values() if df is not None)
+        
         # Process each category
         leads_df = self.merge_leads_files(leads_files)
         updates_df = self.merge_updates_files(updates_files)
-        call_logs_df = self.merge_call_logs(call_logs_files)
+        call_logs_df = pd.DataFrame() if self.call_log_chunk_rows else self.merge_call_logs(call_logs_files)
+        self._preloaded = {}
+        
+        if self.cache is not None:
+            self.cache.save()
+            print(f"♻️ Cache: {self.cache.hits} unchanged, {self.cache.misses} re-parsed")
         
         print("\n" + "=" * 50)
         print("✅ DATA PROCESSING COMPLETE")
@@ -411,8 +597,14 @@ class DataCleaner:
         
         return leads_df, updates_df, call_logs_df
     
-    def save_cleaned_data(self, base_output_folder, leads_df, updates_df, call_logs_df):
-        """Save cleaned data to timestamped folder"""
+    @profiled('save_cleaned_data')
+    def save_cleaned_data(self, base_output_folder, leads_df, updates_df, call_logs_df, output_format=DEFAULT_FORMAT,
+                          call_analysis_df=None, call_cube_df=None):
+        """Save cleaned data to timestamped folder (csv, excel, parquet or feather)
+        
+        call_cube_df is saved with the cleaned files. With a store_path the run is also
+        upserted into the SQLite store, per-phone call totals (call_analysis_df) included.
+        """
         # Create timestamped folder
         timestamp_folder = f"cleaned_data_{self.timestamp}"
         output_folder = os.path.join(base_output_folder, timestamp_folder)
@@ -422,24 +614,45 @@ class DataCleaner:
         
         # Save cleaned files
         if not leads_df.empty:
-            leads_df.to_csv(os.path.join(output_folder, 'cleaned_leads.csv'), index=False)
+            write_frame(leads_df, output_path(output_folder, 'cleaned_leads', output_format))
             print(f"💾 Saved leads: {len(leads_df)} records")
+            if 'cluster_id' in leads_df.columns:
+                canonical_df = canonical_leads(leads_df)
+                write_frame(canonical_df, output_path(output_folder, 'canonical_leads', output_format))
+                print(f"💾 Saved canonical leads: {len(canonical_df)} records")
         
         if not updates_df.empty:
-            updates_df.to_csv(os.path.join(output_folder, 'cleaned_updates.csv'), index=False)
+            write_frame(updates_df, output_path(output_folder, 'cleaned_updates', output_format))
             print(f"💾 Saved updates: {len(updates_df)} records")
         
         if not call_logs_df.empty:
-            call_logs_df.to_csv(os.path.join(output_folder, 'cleaned_call_logs.csv'), index=False)
+            write_frame(call_logs_df, output_path(output_folder, 'cleaned_call_logs', output_format))
             print(f"💾 Saved call logs: {len(call_logs_df)} records")
         
+        if call_cube_df is not None:
+            write_frame(call_cube_df, output_path(output_folder, CALL_CUBE_NAME, output_format))
+            print(f"💾 Saved call cube: {len(call_cube_df)} cells from {int(call_cube_df['calls'].sum())} calls")
+        
         # Create and save overall performance summary
-        self._create_overall_performance(output_folder, leads_df, updates_df, call_logs_df)
+        self._create_overall_performance(output_folder, leads_df, updates_df, call_logs_df, output_format)
+        
+        if self.store_path:
+            self._save_to_store(output_folder, leads_df, updates_df, call_logs_df, call_analysis_df, call_cube_df)
         
         print(f"📁 All files saved to: {output_folder}")
         return output_folder
     
-    def _create_overall_performance(self, output_folder, leads_df, updates_df, call_logs_df):
+    def _save_to_store(self, output_folder, leads_df, updates_df, call_logs_df, call_analysis_df, call_cube_df):
+        """Upsert this run into the SQLite store at self.store_path"""
+        rows_in = len(leads_df) + len(updates_df) + (len(call_analysis_df) if call_analysis_df is not None else 0)
+        with self.profile.span('save_to_store', rows_in=rows_in) as span:
+            with LeadStore(self.store_path) as store:
+                run_id, written = store.save_run(leads_df, updates_df, call_logs_df, call_analysis_df, call_cube_df, output_folder)
+            span.rows_out = sum(written.values())
+        counts = ', '.join(f"{rows} {table}" for table, rows in written.items())
+        print(f"🗄️ Stored run {run_id} in {self.store_path}: {counts}")
+    
+    def _create_overall_performance(self, output_folder, leads_df, updates_df, call_logs_df, output_format=DEFAULT_FORMAT):
         """Create simple overall performance summary"""
         performance_data = []
         
@@ -463,5 +676,5 @@ class DataCleaner:
         
         # Save performance summary
         performance_df = pd.DataFrame(performance_data)
-        performance_df.to_csv(os.path.join(output_folder, 'overall_performance.csv'), index=False)
+        write_frame(performance_df, output_path(output_folder, 'overall_performance', output_format))
         print(f"💾 Saved overall performance: {len(performance_df)} metrics")
\ No newline at end of file
@@ -0,0 +1,82 @@
+# helpers/duration_parser.py
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+# Formats accepted in text cells (case and surrounding spaces are ignored):
+#   "00h 02m 49s", "1h30m", "2 mins 5 secs", "1 hour", "45 sec"  - any of hours/minutes/seconds, in that order
+#   "0:02:49", "02:49"                                            - H:MM:SS and MM:SS
+#   "5", "2.5"                                                    - a bare number is minutes
+# Numbers (numeric columns, or ints/floats inside an Excel object column) are seconds.
+_NUMBER = r'(\d+(?:\.\d+)?)'
+UNITS_PATTERN = (
+    rf'^(?:{_NUMBER}\s*h(?:ours?|rs?)?\.?)?[\s,]*'
+    rf'(?:{_NUMBER}\s*m(?:in(?:ute)?s?)?\.?)?[\s,]*'
+    rf'(?:{_NUMBER}\s*s(?:ec(?:ond)?s?)?\.?)?$'
+)
+CLOCK_PATTERN = rf'^{_NUMBER}:{_NUMBER}(?::{_NUMBER})?$'
+MINUTES_PATTERN = rf'^{_NUMBER}$'
+
+
+def parse_durations(values):
+    """Seconds for a whole Series of call durations; NaN where a cell is missing or unparseable
+
+    Each distinct value is parsed once, so a 5M row dialer export costs one
+    hash pass plus a few str.extract calls over its (few thousand) distinct
+    durations. unparseable_durations() tells missing cells from bad ones.
+    """
+    values = pd.Series(values)
+    if isinstance(values.dtype, pd.api.extensions.ExtensionDtype) and is_numeric_dtype(values.dtype):
+        return pd.Series(values.to_numpy(dtype=float, na_value=np.nan), index=values.index, name=values.name)
+    if is_numeric_dtype(values.dtype) and not is_bool_dtype(values.dtype):
+        return values.astype(float)
+
+    codes, uniques = pd.factorize(values.to_numpy(dtype=object))
+    # Missing values get code -1, which picks the trailing NaN slot
+    lookup = np.full(len(uniques) + 1, np.nan)
+    if len(uniques):
+        lookup[:-1] = _parse_distinct(np.asarray(uniques, dtype=object))
+    return pd.Series(lookup[codes], index=values.index, name=values.name)
+
+
+def parse_duration(value):
+    """Seconds for a single duration (same rules as parse_durations), NaN if it can't be parsed"""
+    return parse_durations(pd.Series([value], dtype=object)).iloc[0]
+
+
+def unparseable_durations(values, seconds):
+    """True where values holds something (not missing/blank) that parse_durations turned into NaN"""
+    values = pd.Series(values)
+    failed = seconds.isna() & values.notna()
+    if failed.any():
+        failed[failed] = values[failed].astype(str).str.strip() != ''
+    return failed
+
+
+def _parse_distinct(uniques):
+    """Seconds for an object array of distinct values"""
+    result = np.full(len(uniques), np.nan)
+    is_number = np.array([isinstance(value, (int, float, np.number)) and not isinstance(value, (bool, np.bool_))
+                          for value in uniques], dtype=bool)
+    if is_number.any():
+        result[is_number] = uniques[is_number].astype(float)
+
+    text_rows = ~is_number
+    if text_rows.any():
+        result[text_rows] = _parse_text(pd.Series(uniques[text_rows]).astype(str).str.strip().str.lower())
+    return result
+
+
+def _parse_text(text):
+    """Seconds for a Series of lower-cased, stripped duration strings"""
+    clock = text.str.extract(CLOCK_PATTERN).astype(float).to_numpy()
+    with_hours = ~np.isnan(clock[:, 2])
+    seconds = np.where(with_hours, clock[:, 0] * 3600 + clock[:, 1] * 60 + clock[:, 2], clock[:, 0] * 60 + clock[:, 1])
+
+    units = text.str.extract(UNITS_PATTERN).astype(float).to_numpy()
+    has_unit = ~np.isnan(units).all(axis=1)
+    units = np.nan_to_num(units)
+    seconds = np.where(np.isnan(seconds) & has_unit, units[:, 0] * 3600 + units[:, 1] * 60 + units[:, 2], seconds)
+
+    minutes = text.str.extract(MINUTES_PATTERN)[0].astype(float).to_numpy()
+    return np.where(np.isnan(seconds), minutes * 60, seconds)
@@ -0,0 +1,132 @@
+# helpers/file_cache.py
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+# Bump when the per-file cleaning changes so old cached frames are dropped
+CACHE_VERSION = 2
+MANIFEST_NAME = 'manifest.json'
+
+
+class FileCache:
+    """Cleaned per-file frames stored as pickles, keyed by path + size + mtime
+
+    The cache only ever saves work: when cache_dir can't be written, frames
+    just aren't stored and the next run re-parses those files.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+        self.entries = self._load_manifest()
+        self._stamps = {}
+        self.hits = 0
+        self.misses = 0
+        self.writable = True  # cleared after the first failed write
+
+    def _load_manifest(self):
+        """Read the manifest, starting empty if it is missing, unreadable or from another version"""
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if manifest.get('version') != CACHE_VERSION:
+            return {}
+        return manifest.get('entries', {})
+
+    def _fingerprint(self, file):
+        """Size and modification time of the file as it is on disk now"""
+        stat = os.stat(file)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def stamp(self, files):
+        """Record fingerprints just before files are read, so an edit made mid-run isn't cached as current"""
+        for file in files:
+            self._stamps[os.path.abspath(file)] = self._fingerprint(file)
+
+    def _data_path(self, file, kind):
+        """Pickle location for a file's cleaned frame"""
+        key = hashlib.sha1(f"{kind}:{os.path.abspath(file)}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def is_fresh(self, file, kind):
+        """True when the cached frame was built from the file's current contents"""
+        entry = self.entries.get(os.path.abspath(file))
+        if entry is None or entry['kind'] != kind:
+            return False
+        try:
+            fingerprint = self._fingerprint(file)
+        except OSError:
+            return False
+        return (entry['size'] == fingerprint['size'] and entry['mtime_ns'] == fingerprint['mtime_ns']
+                and os.path.exists(os.path.join(self.cache_dir, entry['data_file'])))
+
+    def get(self, file, kind):
+        """Cached frame for an unchanged file, None when it has to be re-parsed"""
+        if not self.is_fresh(file, kind):
+            self.misses += 1
+            return None
+        try:
+            df = pd.read_pickle(os.path.join(self.cache_dir, self.entries[os.path.abspath(file)]['data_file']))
+        except Exception:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return df
+
+    def _write_failed(self, error):
+        """Stop writing to the cache for this run, keeping the run itself going"""
+        if self.writable:
+            print(f"⚠️ Cache folder {self.cache_dir} can't be written ({error}) - files will be re-parsed next run")
+        self.writable = False
+
+    def put(self, file, kind, df):
+        """Store a file's cleaned frame with the fingerprint it was read at"""
+        if not self.writable:
+            return
+        data_file = self._data_path(file, kind)
+        temp_file = data_file + '.tmp'
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            df.to_pickle(temp_file)
+            os.replace(temp_file, data_file)
+        except Exception as e:
+            self._write_failed(e)
+            return
+
+        path = os.path.abspath(file)
+        entry = {'kind': kind, 'data_file': os.path.basename(data_file)}
+        entry.update(self._stamps.pop(path, None) or self._fingerprint(file))
+        self.entries[path] = entry
+
+    def prune(self, existing_files):
+        """Forget files that were deleted (or are no longer found) since the last run"""
+        keep = {os.path.abspath(file) for file in existing_files}
+        removed = 0
+        for path in list(self.entries):
+            if path not in keep:
+                data_file = os.path.join(self.cache_dir, self.entries.pop(path)['data_file'])
+                try:
+                    if os.path.exists(data_file):
+                        os.remove(data_file)
+                except OSError as e:
+                    self._write_failed(e)
+                removed += 1
+        return removed
+
+    def save(self):
+        """Write the manifest atomically"""
+        if not self.writable:
+            return
+        temp_path = self.manifest_path + '.tmp'
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'entries': self.entries}, f, indent=2)
+            os.replace(temp_path, self.manifest_path)
+        except OSError as e:
+            self._write_failed(e)
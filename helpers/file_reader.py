@@ -0,0 +1,63 @@
+# helpers/file_reader.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+
+def read_header(file):
+    """Column names of a CSV or Excel file, parsing only its header row"""
+    if file.endswith('.csv'):
+        return list(pd.read_csv(file, nrows=0).columns)
+    return list(pd.read_excel(file, nrows=0).columns)
+
+
+def read_table(file, usecols=None):
+    """Read a CSV or Excel file into a dataframe; usecols (column positions) skips parsing the rest"""
+    if file.endswith('.csv'):
+        return pd.read_csv(file, usecols=usecols)
+    return pd.read_excel(file, usecols=usecols)
+
+
+def _read_table_safely(job):
+    """Worker entry point: return (df, None) or (None, error) so one bad file doesn't stop the pool"""
+    file, usecols = job
+    try:
+        return read_table(file, usecols), None
+    except Exception as e:
+        return None, e
+
+
+def read_tables(files, max_workers=None, on_file_read=None, usecols=None):
+    """Parse files concurrently in worker processes
+
+    Returns {file: (df, error)} in the same order as files. max_workers
+    defaults to the CPU count; 1 (or a single file) reads in this process.
+    on_file_read(file, done, total) is called as each result comes back.
+    usecols maps a file to the column positions to parse (files not in it are read whole).
+    """
+    files = list(files)
+    jobs = [(file, (usecols or {}).get(file)) for file in files]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(files)))
+
+    if max_workers == 1:
+        return _collect(files, map(_read_table_safely, jobs), on_file_read)
+
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        return _collect(files, executor.map(_read_table_safely, jobs), on_file_read)
+    finally:
+        # Drop queued files if the run was cancelled part way through
+        executor.shutdown(cancel_futures=True)
+
+
+def _collect(files, results, on_file_read):
+    """Pair files with their results in order, reporting each one"""
+    tables = {}
+    for done, (file, result) in enumerate(zip(files, results), start=1):
+        tables[file] = result
+        if on_file_read is not None:
+            on_file_read(file, done, len(files))
+    return tables
@@ -0,0 +1,154 @@
+# helpers/instrumentation.py
+import functools
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import psutil
+except ImportError:  # optional - /proc/self/statm is used on Linux without it
+    psutil = None
+
+PROFILE_NAME = 'run_profile.json'
+PROFILE_VERSION = 1
+
+
+def current_rss():
+    """Resident set size of this process in bytes, or None where it can't be read"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+
+def count_rows(value):
+    """Rows in a DataFrame/Series, or summed over a tuple/list of them; None for anything else"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        counts = [count_rows(item) for item in value]
+        counts = [count for count in counts if count is not None]
+        return sum(counts) if counts else None
+    return None
+
+
+class Span:
+    """One timed stage; set rows_in/rows_out (or add details) while it is open"""
+
+    def __init__(self, name, parent=None, rows_in=None, details=None):
+        self.name = name
+        self.parent = parent
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.details = dict(details or {})
+        self.error = None
+        self.wall_seconds = None
+        self.cpu_seconds = None
+        self.rss_start = None
+        self.rss_end = None
+
+    def to_dict(self):
+        record = {
+            'name': self.name,
+            'parent': self.parent,
+            'wall_seconds': round(self.wall_seconds, 6) if self.wall_seconds is not None else None,
+            'cpu_seconds': round(self.cpu_seconds, 6) if self.cpu_seconds is not None else None,
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'rss_mb': _megabytes(self.rss_end),
+            'rss_delta_mb': _megabytes(self.rss_end - self.rss_start)
+            if self.rss_start is not None and self.rss_end is not None else None,
+        }
+        if self.details:
+            record['details'] = self.details
+        if self.error:
+            record['error'] = self.error
+        return record
+
+
+def _megabytes(size):
+    return round(size / 2**20, 2) if size is not None else None
+
+
+class RunProfile:
+    """Collects the spans of one pipeline run and writes them as JSON
+
+    Spans nest: a span opened inside another records it as its parent, so
+    per-file reads sit under their stage. CPU time is process-wide, which
+    includes worker threads but not worker processes.
+    """
+
+    def __init__(self):
+        self.started = datetime.now()
+        self.spans = []
+        self._open = []
+
+    @contextmanager
+    def span(self, name, rows_in=None, **details):
+        """Time the block; yields the Span so the block can set rows_out"""
+        span = Span(name, self._open[-1].name if self._open else None, rows_in, details)
+        self.spans.append(span)
+        self._open.append(span)
+
+        span.rss_start = current_rss()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.wall_seconds = time.perf_counter() - wall_start
+            span.cpu_seconds = time.process_time() - cpu_start
+            span.rss_end = current_rss()
+            self._open.remove(span)
+
+    def to_dict(self):
+        return {
+            'version': PROFILE_VERSION,
+            'started': self.started.isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'max_rss_mb': _megabytes(max((s.rss_end for s in self.spans if s.rss_end is not None), default=None)),
+            'spans': [span.to_dict() for span in self.spans],
+        }
+
+    def save(self, folder, name=PROFILE_NAME):
+        """Write the profile into folder; returns the file path"""
+        path = os.path.join(folder, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+        return path
+
+    def summary(self):
+        """Top-level spans as 'name: 1.23s' lines"""
+        return [f"{span.name}: {span.wall_seconds:.2f}s" for span in self.spans
+                if span.parent is None and span.wall_seconds is not None]
+
+
+def profiled(name):
+    """Method decorator: run the method inside self.profile.span(name)
+
+    rows_in is counted over the DataFrame arguments and rows_out over the
+    returned frame(s).
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            frames = [arg for arg in args if isinstance(arg, pd.DataFrame)]
+            with self.profile.span(name, rows_in=count_rows(frames)) as span:
+                result = method(self, *args, **kwargs)
+                span.rows_out = count_rows(result)
+            return result
+        return wrapper
+    return decorate
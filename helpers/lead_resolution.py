@@ -0,0 +1,284 @@
+# helpers/lead_resolution.py
+import numpy as np
+import pandas as pd
+
+from lead_join import email_keys, phone_keys
+
+# Two names are the same person at or above this Dice similarity of their character bigrams
+NAME_THRESHOLD = 0.8
+
+# Blocks larger than this are compared as a sorted neighbourhood (each lead against
+# the next WINDOW - 1 leads by name) instead of all pairs, so no block is quadratic
+WINDOW = 20
+
+# Leads sharing a phone or an email are linked unless both names are present and differ.
+# A lead without a name joins the named leads it shares one with only when their names
+# agree with each other, so it never bridges two different people.
+# The other blocks only group leads worth comparing: a pair from them needs similar
+# names and a corroborating contact - the same last phone digits or the same email
+# mailbox at another domain - because a shared city or email domain doesn't make two
+# similar names one person. Each block is another sorted pass over the leads, so a
+# pair one block's window misses can still meet in another.
+STRONG_BLOCKS = ('phone', 'email')
+WEAK_BLOCKS = ('phone_tail', 'mailbox', 'email_domain', 'city')
+
+_NAME_PREFIX = 3   # name letters added to the email-domain and city blocks
+_PHONE_TAIL = 7    # subscriber digits that survive a mistyped operator prefix
+
+# Distinct values / value pairs handled per block, bounding the bigram arrays
+CHUNK_SIZE = 100_000
+
+# Bitmap size of a value's bigram set (letters and spaces make a few hundred bigrams)
+BIGRAM_BITS = 512
+
+# Set bits of every byte value, for popcounts on NumPy < 2.0 (no np.bitwise_count)
+_BYTE_BITS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1, dtype=np.int64)
+
+
+def normalize_names(names):
+    """Lower-case letters only, tokens sorted ("Perera,  Nimal" -> "nimal perera"); None when blank"""
+    text = pd.Series(names, dtype=object).where(pd.Series(names).notna().to_numpy(), '').astype(str)
+    text = text.str.lower().str.replace(r'[^\w\s]|[\d_]', ' ', regex=True).str.split()
+    normalized = text.map(lambda tokens: ' '.join(sorted(tokens)) if tokens else None)
+    return normalized.where(~normalized.isin(['nan', 'none', 'null']), None)
+
+
+def blocking_keys(df, name_col='name', phone_col='phone', email_col='email', city_col='city'):
+    """Normalized names plus one integer key column per block; -1 where a lead has no key
+
+    Text is normalized once per distinct value and blocks are integer codes,
+    so a million leads never go through row-by-row string handling.
+    """
+    def column(col):
+        return df[col].reset_index(drop=True) if col in df.columns else pd.Series([None] * len(df), dtype=object)
+
+    names = _per_distinct(column(name_col), normalize_names)
+    phones = _per_distinct(column(phone_col), lambda values: phone_keys(values).to_numpy(dtype=object))
+    emails = _per_distinct(column(email_col), lambda values: email_keys(values).to_numpy(dtype=object))
+    cities = _per_distinct(column(city_col), _normalize_cities)
+
+    prefixes = _per_distinct(names, lambda values: values.str[:_NAME_PREFIX])
+    tails = _per_distinct(phones, lambda values: values.str[-_PHONE_TAIL:])
+    domains = _per_distinct(emails, lambda values: values.str.split('@').str[-1])
+    mailboxes = _per_distinct(emails, lambda values: values.str.split('@').str[0])
+    return pd.DataFrame({
+        'name': names,
+        'phone': _key_codes(phones),
+        'email': _key_codes(emails),
+        'phone_tail': _key_codes(tails),
+        'email_domain': _key_codes(domains, prefixes),
+        'city': _key_codes(cities, prefixes),
+        'mailbox': _key_codes(mailboxes),
+    })
+
+
+def _normalize_cities(cities):
+    text = cities.astype(str).str.strip().str.lower()
+    return text.where(~text.isin(['', 'nan', 'none']), None)
+
+
+def _per_distinct(values, transform):
+    """transform(Series of the distinct values) broadcast back to every row; missing rows stay None"""
+    codes, distinct = pd.factorize(pd.Series(values).to_numpy(dtype=object))
+    transformed = np.asarray(transform(pd.Series(distinct, dtype=object)), dtype=object)
+    lookup = np.append(transformed, None)
+    result = lookup[codes]
+    result[pd.isna(result)] = None
+    return pd.Series(result, dtype=object)
+
+
+def _key_codes(*columns):
+    """One int64 code per row for the combination of the columns' values; -1 where any is missing"""
+    combined = np.zeros(len(columns[0]), dtype=np.int64)
+    present = np.ones(len(columns[0]), dtype=bool)
+    for values in columns:
+        codes, distinct = pd.factorize(values.to_numpy(dtype=object))
+        combined = combined * (len(distinct) + 1) + codes
+        present &= codes >= 0
+    return np.where(present, combined, -1)
+
+
+def candidate_pairs(keys, name_order, window=WINDOW):
+    """(left, right) row positions of leads sharing a key, each pair once with left < right
+
+    keys are blocking_keys codes (-1 = no key) and name_order ranks the rows by
+    normalized name. Rows are sorted by (key, name) and every row is paired
+    with the rows up to window - 1 places after it that share its key:
+    complete for blocks up to `window` leads, a sorted-neighbourhood window
+    for larger ones.
+    """
+    present = np.flatnonzero(keys >= 0)
+    if len(present) < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    rows = present[np.lexsort((name_order[present], keys[present]))]
+    sorted_keys = keys[rows]
+
+    left, right = [], []
+    for offset in range(1, window):
+        same = sorted_keys[offset:] == sorted_keys[:-offset]
+        if not same.any():
+            break
+        left.append(rows[:-offset][same])
+        right.append(rows[offset:][same])
+    if not left:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    left, right = np.concatenate(left), np.concatenate(right)
+    return np.minimum(left, right), np.maximum(left, right)
+
+
+class BigramSets:
+    """Character-bigram sets of a column's distinct values as fixed-size bitmaps
+
+    Each distinct value is padded (' nimal perera ') and its bigrams set bits
+    in a BIGRAM_BITS bitmap, so the bigrams two values share are one AND plus
+    a popcount. Bits are handed out most frequent bigram first; a column with
+    more distinct bigrams than BIGRAM_BITS folds the rarest ones onto shared
+    bits, which can only raise a score slightly.
+    """
+
+    def __init__(self, values):
+        self.codes, distinct = pd.factorize(pd.Series(values).to_numpy(dtype=object))
+        owners, grams = [], []
+        for start in range(0, len(distinct), CHUNK_SIZE):
+            padded = np.asarray([f' {value} ' for value in distinct[start:start + CHUNK_SIZE]], dtype=str)
+            width = padded.dtype.itemsize // 4
+            chars = np.ascontiguousarray(padded).view(np.uint32).reshape(len(padded), width).astype(np.int64)
+            has_gram = chars[:, 1:] != 0
+            grams.append((chars[:, :-1] << 21 | chars[:, 1:])[has_gram])
+            owners.append(np.broadcast_to(np.arange(start, start + len(padded))[:, None], has_gram.shape)[has_gram])
+
+        self.bitmaps = np.zeros((len(distinct), BIGRAM_BITS // 64), dtype=np.uint64)
+        if owners:
+            gram_ids = pd.factorize(np.concatenate(grams))[0]
+            rank = np.empty(gram_ids.max() + 1, dtype=np.int64)
+            rank[np.argsort(-np.bincount(gram_ids), kind='stable')] = np.arange(len(rank))
+            bits = rank[gram_ids] % BIGRAM_BITS
+            np.bitwise_or.at(self.bitmaps, (np.concatenate(owners), bits // 64), np.left_shift(np.uint64(1), (bits % 64).astype(np.uint64)))
+        self.sizes = _popcount(self.bitmaps)
+
+    def similarity(self, left, right):
+        """Dice coefficient of the bigrams of rows left[i] and right[i] (NaN if either is blank)"""
+        similarity = np.full(len(left), np.nan)
+        a, b = self.codes[left], self.codes[right]
+        valid = np.flatnonzero((a >= 0) & (b >= 0))
+        for start in range(0, len(valid), CHUNK_SIZE):
+            rows = valid[start:start + CHUNK_SIZE]
+            x, y = a[rows], b[rows]
+            shared = _popcount(self.bitmaps[x] & self.bitmaps[y])
+            similarity[rows] = 2 * shared / (self.sizes[x] + self.sizes[y])
+        return similarity
+
+
+def _popcount(bitmaps):
+    """Set bits in each row of a uint64 bitmap array"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bitmaps).sum(axis=1, dtype=np.int64)
+    bitmaps = np.ascontiguousarray(bitmaps)
+    return _BYTE_BITS[bitmaps.view(np.uint8)].sum(axis=1, dtype=np.int64)
+
+
+def union_find(count, left, right):
+    """Root (smallest member) of every element after joining each left[i] with right[i]
+
+    Union-find over whole edge arrays: every round hooks the larger root of
+    each edge onto the smaller one, then compresses paths until each element
+    points at its root. Rounds repeat until no edge spans two roots.
+    """
+    parent = np.arange(count)
+    while len(left):
+        left_roots, right_roots = parent[left], parent[right]
+        spanning = left_roots != right_roots
+        if not spanning.any():
+            break
+        low = np.minimum(left_roots[spanning], right_roots[spanning])
+        high = np.maximum(left_roots[spanning], right_roots[spanning])
+        np.minimum.at(parent, high, low)
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+    return parent
+
+
+def resolve_leads(df, name_col='name', phone_col='phone', email_col='email', city_col='city',
+                  threshold=NAME_THRESHOLD, window=WINDOW):
+    """Cluster leads that are the same person; returns df with a cluster_id column
+
+    Leads are only compared inside blocks (shared phone, email, last phone
+    digits, mailbox, email domain or city), never all pairs, and matched
+    pairs are merged with union_find (see STRONG_BLOCKS for the linking
+    rules). cluster_id numbers clusters in order of their first lead.
+    """
+    df = df.reset_index(drop=True)
+    keys = blocking_keys(df, name_col, phone_col, email_col, city_col)
+    name_order = pd.factorize(keys['name'].to_numpy(dtype=object), sort=True)[0]
+    bigrams = BigramSets(keys['name'])
+    tails, mailboxes = keys['phone_tail'].to_numpy(), keys['mailbox'].to_numpy()
+
+    named = keys['name'].notna().to_numpy()
+
+    links_left, links_right = [], []
+    bridges_left, bridges_right = [], []
+    for block in STRONG_BLOCKS + WEAK_BLOCKS:
+        left, right = candidate_pairs(keys[block].to_numpy(), name_order, window)
+        similarity = bigrams.similarity(left, right)
+        if block in STRONG_BLOCKS:
+            # Named-nameless pairs are held back and checked once the named clusters are known
+            bridge = named[left] != named[right]
+            bridges_left.append(np.where(named[left], right, left)[bridge])
+            bridges_right.append(np.where(named[left], left, right)[bridge])
+            linked = (similarity >= threshold) | (~named[left] & ~named[right])
+        else:
+            left, right = left[similarity >= threshold], right[similarity >= threshold]
+            same_tail = (tails[left] == tails[right]) & (tails[left] >= 0)
+            same_mailbox = (mailboxes[left] == mailboxes[right]) & (mailboxes[left] >= 0)
+            linked = same_tail | same_mailbox
+        links_left.append(left[linked])
+        links_right.append(right[linked])
+
+    links_left, links_right = np.concatenate(links_left), np.concatenate(links_right)
+    roots = union_find(len(df), links_left, links_right)
+    nameless, neighbours = _agreeing_bridges(roots, np.concatenate(bridges_left), np.concatenate(bridges_right),
+                                             bigrams, threshold)
+    if len(nameless):
+        roots = union_find(len(df), np.r_[links_left, nameless], np.r_[links_right, neighbours])
+    df['cluster_id'] = pd.factorize(roots)[0]
+    return df
+
+
+def _agreeing_bridges(roots, nameless, neighbours, bigrams, threshold):
+    """The (nameless lead, named lead) links that can't join two different people
+
+    roots are the clusters of the named links plus nameless-nameless links.
+    The named clusters a group of nameless leads touches are joined to it
+    only if the names of its named neighbours (one per cluster) all agree
+    with the first one's; otherwise the group stays a cluster of its own.
+    """
+    bridges = pd.DataFrame({'group': roots[nameless], 'cluster': roots[neighbours],
+                            'nameless': nameless, 'neighbour': neighbours})
+    bridges = bridges.drop_duplicates(['group', 'cluster'])
+    first = bridges.groupby('group', sort=False)['neighbour'].transform('first').to_numpy()
+    agrees = pd.Series(bigrams.similarity(first, bridges['neighbour'].to_numpy()) >= threshold, index=bridges.index)
+    accepted = agrees.groupby(bridges['group'], sort=False).transform('all').to_numpy()
+    return bridges['nameless'].to_numpy()[accepted], bridges['neighbour'].to_numpy()[accepted]
+
+
+def canonical_leads(df, columns=None):
+    """One record per cluster_id: its most complete lead, blanks filled from the other members
+
+    columns defaults to every column except cluster_id; cluster_size counts the leads merged.
+    """
+    columns = [col for col in (columns or df.columns) if col != 'cluster_id']
+    filled = df[columns].astype(object).where(df[columns].notna() & (df[columns].astype(str).apply(lambda col: col.str.strip()) != ''))
+    completeness = filled.notna().sum(axis=1)
+
+    # Most complete lead first inside each cluster (earliest on ties)
+    order = np.lexsort((np.arange(len(df)), -completeness.to_numpy(), df['cluster_id'].to_numpy()))
+    ordered = filled.iloc[order]
+    clusters = df['cluster_id'].to_numpy()[order]
+    canonical = ordered.groupby(clusters, sort=True).first()
+    canonical = canonical.reindex(columns=columns)
+    canonical.insert(0, 'cluster_id', canonical.index.to_numpy())
+    canonical['cluster_size'] = np.bincount(df['cluster_id'].to_numpy())[canonical['cluster_id'].to_numpy()]
+    return canonical.reset_index(drop=True)
@@ -0,0 +1,290 @@
+# helpers/lead_store.py
+import os
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from phone_normalizer import normalize_phone_series, LOCAL_FORMAT
+from schema import whole_numbers
+
+# Default file name of the store, kept in the results folder across runs
+STORE_NAME = 'lead_store.sqlite'
+
+# Rows handed to one executemany call; each table is written in one transaction
+BATCH_ROWS = 50_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    saved_at TEXT NOT NULL,
+    output_folder TEXT,
+    leads INTEGER, updates INTEGER, call_logs INTEGER
+);
+CREATE TABLE IF NOT EXISTS leads (
+    phone TEXT PRIMARY KEY,
+    name TEXT, email TEXT, city TEXT,
+    employee TEXT, original_file TEXT, cluster_id INTEGER,
+    first_run INTEGER NOT NULL, last_run INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS leads_employee ON leads (employee);
+CREATE INDEX IF NOT EXISTS leads_email ON leads (email);
+CREATE TABLE IF NOT EXISTS updates (
+    phone TEXT NOT NULL,
+    employee TEXT NOT NULL DEFAULT '',
+    original_file TEXT NOT NULL DEFAULT '',
+    update_text TEXT NOT NULL DEFAULT '',
+    name TEXT, email TEXT, city TEXT,
+    first_run INTEGER NOT NULL, last_run INTEGER NOT NULL,
+    PRIMARY KEY (phone, employee, original_file, update_text)
+);
+CREATE INDEX IF NOT EXISTS updates_employee ON updates (employee);
+CREATE TABLE IF NOT EXISTS call_summary (
+    phone TEXT PRIMARY KEY,
+    name TEXT, calls INTEGER, talk_seconds REAL,
+    first_call TEXT, last_call TEXT, call_days INTEGER,
+    last_run INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS call_summary_last_call ON call_summary (last_call);
+CREATE TABLE IF NOT EXISTS call_cube (
+    employee TEXT NOT NULL,
+    call_date TEXT NOT NULL,
+    hour INTEGER NOT NULL,
+    call_type TEXT NOT NULL,
+    calls INTEGER, connected_calls INTEGER, talk_seconds REAL,
+    last_run INTEGER NOT NULL,
+    PRIMARY KEY (employee, call_date, hour, call_type)
+);
+CREATE INDEX IF NOT EXISTS call_cube_date ON call_cube (call_date);
+"""
+
+# Upserts: a row for a phone (or update / cube cell) already stored is brought up to date
+# instead of added again; blanks in a newer lead keep the values stored before
+LEAD_UPSERT = """
+INSERT INTO leads (phone, name, email, city, employee, original_file, cluster_id, first_run, last_run)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (phone) DO UPDATE SET
+    name = COALESCE(excluded.name, leads.name),
+    email = COALESCE(excluded.email, leads.email),
+    city = COALESCE(excluded.city, leads.city),
+    employee = COALESCE(excluded.employee, leads.employee),
+    original_file = COALESCE(excluded.original_file, leads.original_file),
+    cluster_id = excluded.cluster_id,
+    last_run = excluded.last_run
+"""
+UPDATE_UPSERT = """
+INSERT INTO updates (phone, employee, original_file, update_text, name, email, city, first_run, last_run)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (phone, employee, original_file, update_text) DO UPDATE SET
+    name = COALESCE(excluded.name, updates.name),
+    email = COALESCE(excluded.email, updates.email),
+    city = COALESCE(excluded.city, updates.city),
+    last_run = excluded.last_run
+"""
+CALL_SUMMARY_UPSERT = """
+INSERT INTO call_summary (phone, name, calls, talk_seconds, first_call, last_call, call_days, last_run)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (phone) DO UPDATE SET
+    name = excluded.name, calls = excluded.calls, talk_seconds = excluded.talk_seconds,
+    first_call = excluded.first_call, last_call = excluded.last_call, call_days = excluded.call_days,
+    last_run = excluded.last_run
+"""
+CALL_CUBE_UPSERT = """
+INSERT INTO call_cube (employee, call_date, hour, call_type, calls, connected_calls, talk_seconds, last_run)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (employee, call_date, hour, call_type) DO UPDATE SET
+    calls = excluded.calls, connected_calls = excluded.connected_calls, talk_seconds = excluded.talk_seconds,
+    last_run = excluded.last_run
+"""
+
+
+def _phones(values):
+    """Normalized local phone numbers (0XXXXXXXXX), the key rows are upserted on; None if invalid"""
+    return normalize_phone_series(whole_numbers(pd.Series(values).reset_index(drop=True)), LOCAL_FORMAT)
+
+
+def _column(df, col, default=None):
+    if col in df.columns:
+        return df[col].reset_index(drop=True)
+    return pd.Series(default, index=range(len(df)), dtype=object)
+
+
+def _rows(columns, keep=None):
+    """Parameter tuples of plain Python values (NaN/NaT -> None) for executemany
+
+    With keep (a row mask) only those rows are written, ordered by the first
+    column - the key - so inserts walk the primary key's B-tree in order.
+    The sort is stable, so of two rows with one key the later still wins.
+    """
+    frame = pd.DataFrame({position: values.to_numpy() for position, values in enumerate(columns)})
+    if keep is not None:
+        frame = frame[keep]
+        frame = frame.iloc[np.argsort(frame[0].to_numpy(dtype=object), kind='stable')]
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.itertuples(index=False, name=None)
+
+
+def _text(values):
+    """Stripped text, None where missing or blank; each distinct value is cleaned once"""
+    codes, distinct = pd.factorize(values.to_numpy(dtype=object))
+    text = pd.Series(distinct, dtype=object).astype(str).str.strip()
+    text = text.where(~text.isin(['', 'nan', 'None']), None)
+    return pd.Series(np.append(text.to_numpy(dtype=object), None)[codes], dtype=object)
+
+
+def _date_text(values, date_format='%Y-%m-%d %H:%M:%S'):
+    return pd.to_datetime(values, errors='coerce').dt.strftime(date_format)
+
+
+class LeadStore:
+    """Cleaned data of every run in one SQLite file, queryable across runs
+
+    save_run upserts a run's leads, updates, per-phone call totals and call
+    cube: rows are keyed by normalized phone (cube cells by employee, day,
+    hour and type), so a lead seen in many runs is one row holding its
+    latest values, and runs only add what is new. Each table is written
+    with executemany in a single transaction.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.execute('PRAGMA synchronous = NORMAL')
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write(self, statement, rows):
+        """executemany in batches of BATCH_ROWS inside one transaction; returns the rows written"""
+        written = 0
+        batch = []
+        with self.connection:
+            for row in rows:
+                batch.append(row)
+                if len(batch) == BATCH_ROWS:
+                    self.connection.executemany(statement, batch)
+                    written += len(batch)
+                    batch = []
+            if batch:
+                self.connection.executemany(statement, batch)
+                written += len(batch)
+        return written
+
+    def save_run(self, leads_df, updates_df, call_logs_df, call_analysis_df=None, call_cube_df=None, output_folder=None):
+        """Record a run and upsert its data; returns (run_id, {table: rows written})"""
+        with self.connection:
+            cursor = self.connection.execute(
+                'INSERT INTO runs (saved_at, output_folder, leads, updates, call_logs) VALUES (?, ?, ?, ?, ?)',
+                (datetime.now().isoformat(timespec='seconds'), output_folder, len(leads_df), len(updates_df), len(call_logs_df)))
+        run_id = cursor.lastrowid
+
+        written = {
+            'leads': self.upsert_leads(leads_df, run_id),
+            'updates': self.upsert_updates(updates_df, run_id),
+        }
+        if call_analysis_df is not None:
+            written['call_summary'] = self.upsert_call_summary(call_analysis_df, run_id)
+        if call_cube_df is not None:
+            written['call_cube'] = self.upsert_call_cube(call_cube_df, run_id)
+        return run_id, written
+
+    def upsert_leads(self, leads_df, run_id):
+        if leads_df.empty or 'phone' not in leads_df.columns:
+            return 0
+        phones = _phones(leads_df['phone'])
+        keep = phones.notna().to_numpy()
+        cluster_ids = pd.to_numeric(_column(leads_df, 'cluster_id'), errors='coerce').astype('Int64')
+        columns = [phones] + [_text(_column(leads_df, col)) for col in ['name', 'email', 'city', 'employee', 'original_file']]
+        columns += [cluster_ids, pd.Series(run_id, index=phones.index), pd.Series(run_id, index=phones.index)]
+        return self._write(LEAD_UPSERT, _rows(columns, keep))
+
+    def upsert_updates(self, updates_df, run_id):
+        if updates_df.empty or 'phone' not in updates_df.columns:
+            return 0
+        phones = _phones(updates_df['phone'])
+        keep = phones.notna().to_numpy()
+        # Key columns are '' rather than NULL, since NULLs never conflict in a primary key
+        keys = [_text(_column(updates_df, col)).fillna('') for col in ['employee', 'original_file', 'update_text']]
+        columns = [phones] + keys + [_text(_column(updates_df, col)) for col in ['name', 'email', 'city']]
+        columns += [pd.Series(run_id, index=phones.index), pd.Series(run_id, index=phones.index)]
+        return self._write(UPDATE_UPSERT, _rows(columns, keep))
+
+    def upsert_call_summary(self, call_analysis_df, run_id):
+        """Per-phone call totals of MetricsCalculator's call analysis table"""
+        if call_analysis_df.empty:
+            return 0
+        phones = _phones(call_analysis_df['phone'])
+        keep = phones.notna().to_numpy()
+        columns = [
+            phones,
+            _text(_column(call_analysis_df, 'name')),
+            pd.to_numeric(_column(call_analysis_df, 'no_of_times_called'), errors='coerce').astype('Int64'),
+            pd.to_numeric(_column(call_analysis_df, 'total_time_spent_seconds'), errors='coerce'),
+            _date_text(_column(call_analysis_df, 'first_call_date')),
+            _date_text(_column(call_analysis_df, 'last_call_date')),
+            pd.to_numeric(_column(call_analysis_df, 'total_call_days'), errors='coerce').astype('Int64'),
+            pd.Series(run_id, index=phones.index),
+        ]
+        return self._write(CALL_SUMMARY_UPSERT, _rows(columns, keep))
+
+    def upsert_call_cube(self, call_cube_df, run_id):
+        """Cells of call_cube.call_cube; calls without a date are kept under call_date ''"""
+        if call_cube_df.empty:
+            return 0
+        cube = call_cube_df.reset_index(drop=True)
+        columns = [
+            cube['employee'].astype(str),
+            _date_text(cube['call_date'], '%Y-%m-%d').fillna(''),
+            cube['hour'].astype(np.int64),
+            cube['call_type'].astype(str),
+            cube['calls'].astype(np.int64),
+            cube['connected_calls'].astype(np.int64),
+            cube['talk_seconds'].astype(float),
+            pd.Series(run_id, index=cube.index),
+        ]
+        return self._write(CALL_CUBE_UPSERT, _rows(columns))
+
+    def query(self, sql, params=()):
+        """Result of any SELECT as a DataFrame"""
+        return pd.read_sql_query(sql, self.connection, params=params)
+
+    def runs(self):
+        return self.query('SELECT * FROM runs ORDER BY run_id')
+
+    def lead(self, phone):
+        """(lead row, its call totals, its updates) for one phone number in any notation"""
+        key = _phones([phone]).iloc[0]
+        return (self.query('SELECT * FROM leads WHERE phone = ?', (key,)),
+                self.query('SELECT * FROM call_summary WHERE phone = ?', (key,)),
+                self.query('SELECT * FROM updates WHERE phone = ? ORDER BY first_run', (key,)))
+
+    def employee_leads(self, employee):
+        return self.query('SELECT * FROM leads WHERE employee = ? ORDER BY phone', (employee,))
+
+    def daily_calls(self, start=None, end=None, employee=None):
+        """Calls, connected calls and talk time per employee and day from the stored cube"""
+        conditions, params = ["call_date != ''"], []
+        if start is not None:
+            conditions.append('call_date >= ?')
+            params.append(pd.Timestamp(start).strftime('%Y-%m-%d'))
+        if end is not None:
+            conditions.append('call_date <= ?')
+            params.append(pd.Timestamp(end).strftime('%Y-%m-%d'))
+        if employee is not None:
+            conditions.append('employee = ?')
+            params.append(employee)
+        return self.query(
+            'SELECT employee, call_date, SUM(calls) AS calls, SUM(connected_calls) AS connected_calls, '
+            'SUM(talk_seconds) AS talk_seconds FROM call_cube WHERE ' + ' AND '.join(conditions) +
+            ' GROUP BY employee, call_date ORDER BY employee, call_date', params)
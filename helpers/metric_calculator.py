@@ -1,22 +1,309 @@
 # helpers/metric_calculator.py
 import pandas as pd
 import os
+import hashlib
 import numpy as np
-import re
 from datetime import datetime, timedelta
 
+from output_writers import DEFAULT_FORMAT, output_path, write_frame
+from instrumentation import RunProfile, profiled
+from call_log_stream import CallAggregates, average_gap_days, row_hashes
+from duration_parser import parse_duration, parse_durations, unparseable_durations
+from lead_join import enrich_leads, match_summary
+from column_roles import CALL_LOG_COLUMNS
+from call_cube import call_cube, combine_cubes, empty_cube
+from visualizations import plotly_available, save_dashboard
+
+# Columns _prepare_call_logs adds to the frame the per-phone loop filters
+CALL_DATETIME = 'call_datetime'
+CALL_SECONDS = 'call_seconds'
+
+# Saved per-phone call totals that update_call_analysis folds new call-log rows into
+CALL_STATE_NAME = 'call_analysis_state.pkl'
+
+# Format of the calls listed in dates_times_called
+CALL_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# A time of day with no date ("2:20 PM", "14:20:05"), which to_datetime would put on today
+TIME_ONLY_PATTERN = r'\d{1,2}:\d{2}(:\d{2})?\s*([AaPp][Mm])?'
+
 class MetricsCalculator:
-    def __init__(self):
+    def __init__(self, profile=None, store_path=None):
         self.timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        self.profile = profile if profile is not None else RunProfile()  # stage timings, saved as run_profile.json
+        self.column_roles = {}  # employee/original_file -> (date column, duration column), detected once per file
+        self.store_path = store_path  # SQLite store the cleaned data is also saved into (DataCleaner.save_cleaned_data)
+        self.cube_columns = {}  # employee/original_file -> (datetime column, duration column, type column) for the call cube
+        self.call_cube = None  # cube folded while streaming, when there are no call logs in memory to build it from
+        self.cleaned_folder = None  # cleaned data folder written by the last save_all_reports
+        self.progress_callback = None  # progress(stage, file, done, total, rows) from a background runner
     
-    def generate_call_analysis_table(self, call_logs_df):
-        """Generate call analysis table - ONE ROW PER PHONE NUMBER"""
+    @profiled('generate_call_analysis_table')
+    def generate_call_analysis_table(self, call_logs_df, engine='groupby'):
+        """Generate call analysis table - ONE ROW PER PHONE NUMBER
+        
+        engine='groupby' computes every phone in one sort + groupby pass,
+        engine='loop' filters the frame once per phone (original implementation).
+        """
         if call_logs_df.empty:
             return pd.DataFrame()
         
         print("📊 Generating call analysis table from call logs...")
+        self.column_roles = {}
+        
+        if engine == 'groupby':
+            analysis_df = self._generate_call_analysis_grouped(call_logs_df)
+        elif engine == 'loop':
+            analysis_df = self._generate_call_analysis_loop(call_logs_df)
+        else:
+            raise ValueError(f"Unknown call analysis engine: {engine}")
+        
+        print(f"✅ Generated analysis for {len(analysis_df)} unique phone numbers")
+        return analysis_df
+    
+    @profiled('generate_call_analysis_streaming')
+    def generate_call_analysis_streaming(self, call_log_chunks):
+        """Call analysis table from an iterable of call log chunks (DataCleaner.iter_call_log_chunks)
+        
+        Chunks are folded into per-phone running totals, so memory doesn't grow
+        with the number of calls. The date and duration columns are picked from
+        each file's first chunk, and dates_times_called (every call listed) is
+        not produced. The call cube is folded from the same chunks (self.call_cube).
+        """
+        print("📊 Generating call analysis table from streamed call logs...")
+        aggregates = CallAggregates()
+        self.column_roles = {}
+        self.cube_columns = {}
+        cubes = []
+        
+        for chunk in call_log_chunks:
+            if chunk.empty:
+                continue
+            dates, seconds = self._prepare_call_logs(chunk)
+            aggregates.add(chunk['phone_cleaned'], dates, seconds, chunk['name'] if 'name' in chunk.columns else None)
+            cubes.append(self._call_cube(chunk))
+        self.call_cube = combine_cubes(cubes)
+        
+        if not aggregates.rows:
+            return pd.DataFrame()
+        
+        summary = aggregates.result()
+        analysis_df = self._analysis_from_aggregates(summary)
+        
+        inexact = int((~summary['gaps_exact']).sum())
+        if inexact:
+            print(f"⚠️ {inexact} phones had calls out of time order across chunks - their min/max gaps and call days are approximate")
+        print(f"✅ Generated analysis for {len(analysis_df)} unique phone numbers from {aggregates.rows} streamed calls")
+        return analysis_df
+    
+    @profiled('update_call_analysis')
+    def update_call_analysis(self, call_logs_df, state_path):
+        """Call analysis table from a saved per-phone state plus only the call rows it hasn't seen
+        
+        Rows are counted per source file (employee + original_file) together
+        with a fingerprint of those rows: the rows past what the state at
+        state_path already folded are parsed and merged into it, and the state
+        is saved back. The table equals generate_call_analysis_table on all of
+        call_logs_df. When anything other than an append happened to a file -
+        rows edited, removed or reordered, or the file gone - or a phone's new
+        calls go back before its last one, the state is rebuilt from every row
+        so it stays exact.
+        
+        Only aggregation is incremental: every run still reads and hashes all
+        call rows to check the files were only appended to, and the state keeps
+        every call time per phone for dates_times_called, so both grow with the
+        full call history.
+        """
+        if call_logs_df.empty:
+            return pd.DataFrame()
+        
+        print("📊 Updating call analysis table from new call records...")
+        sources = self._call_log_sources(call_logs_df)
+        hashes = self._source_row_hashes(call_logs_df, sources)
+        aggregates = CallAggregates.load(state_path) if os.path.exists(state_path) else None
+        if aggregates is not None and not self._only_appended(aggregates.sources, hashes):
+            print("⚠️ Call logs changed other than by added rows since the saved state - rebuilding it from all calls")
+            aggregates = None
         
+        rebuilt = aggregates is None
+        if not rebuilt:
+            # Position of each row within its file, compared with the rows already folded
+            seen = sources.map({source: rows for source, (rows, fingerprint) in aggregates.sources.items()}).fillna(0).to_numpy()
+            new_rows = sources.groupby(sources, sort=False).cumcount().to_numpy() >= seen
+            self._fold_call_logs(aggregates, call_logs_df[new_rows])
+            if not aggregates.state['gaps_exact'].all():
+                print("⚠️ New calls go back before calls already counted - rebuilding the state from all calls")
+                rebuilt = True
+        if rebuilt:
+            aggregates = CallAggregates()
+            self._fold_call_logs(aggregates, call_logs_df)
+        
+        aggregates.sources = {source: (len(rows), self._fingerprint(rows)) for source, rows in hashes.items()}
+        aggregates.save(state_path)
+        
+        # Phones in first-appearance order of call_logs_df, like generate_call_analysis_table
+        phones = pd.unique(call_logs_df['phone_cleaned'].dropna())
+        summary = aggregates.result().reindex(np.asarray(phones, dtype=object))
+        analysis_df = self._analysis_from_aggregates(summary)
+        analysis_df['phone'] = phones
+        analysis_df['dates_times_called'] = aggregates.dates_called.reindex(summary.index).fillna("No date/time data").to_numpy()
+        
+        added = len(call_logs_df) if rebuilt else int(new_rows.sum())
+        print(f"✅ Updated analysis for {len(analysis_df)} unique phone numbers ({added} new call records)")
+        return analysis_df
+    
+    def _call_log_sources(self, call_logs_df):
+        """Source file of every call row - employee/original_file, the same file name can sit in several folders"""
+        parts = [call_logs_df[col].astype(str) for col in ['employee', 'original_file'] if col in call_logs_df.columns]
+        if not parts:
+            return pd.Series('call_logs', index=call_logs_df.index)
+        return parts[0].str.cat(parts[1:], sep='/') if len(parts) > 1 else parts[0]
+    
+    def _source_groups(self, call_logs_df):
+        """(source, row positions) of every source file in call_logs_df, in first-appearance order"""
+        sources = self._call_log_sources(call_logs_df)
+        return list(sources.groupby(sources, sort=False).indices.items())
+    
+    def _source_row_hashes(self, call_logs_df, sources):
+        """source -> row_hashes of its rows in order, over the columns the source has values in"""
+        hashes = {}
+        for source, positions in sources.groupby(sources, sort=False).indices.items():
+            rows = call_logs_df.iloc[positions]
+            columns = sorted((col for col in rows.columns if rows[col].notna().any()), key=str)
+            hashes[source] = row_hashes(rows[columns])
+        return hashes
+    
+    def _fingerprint(self, hashes):
+        return hashlib.blake2b(hashes.tobytes(), digest_size=16).hexdigest()
+    
+    def _only_appended(self, saved_sources, hashes):
+        """Whether every source the state folded still starts with exactly the rows it folded"""
+        for source, (rows, fingerprint) in saved_sources.items():
+            current = hashes.get(source)
+            if current is None or len(current) < rows or self._fingerprint(current[:rows]) != fingerprint:
+                return False
+        return True
+    
+    def _fold_call_logs(self, aggregates, call_logs_df):
+        """Parse rows with the state's column roles and merge them into the aggregates"""
+        self.column_roles = aggregates.column_roles
+        if call_logs_df.empty:
+            return
+        dates, seconds = self._prepare_call_logs(call_logs_df)
+        aggregates.add(call_logs_df['phone_cleaned'], dates, seconds, call_logs_df['name'] if 'name' in call_logs_df.columns else None)
+        
+        # dates_times_called: each phone's new calls in time order after the ones already listed
+        # (new calls never go back before those, or the state is rebuilt)
+        dated = dates.notna() & call_logs_df['phone_cleaned'].notna()
+        calls = pd.DataFrame({'phone': call_logs_df.loc[dated, 'phone_cleaned'].to_numpy(dtype=object),
+                              'date': dates[dated].to_numpy()})
+        calls = calls.sort_values(['phone', 'date'], kind='stable')
+        added = calls['date'].dt.strftime(CALL_TIME_FORMAT).groupby(calls['phone'].to_numpy(), sort=False).agg(' | '.join).astype(object)
+        listed = aggregates.dates_called.astype(object)
+        known = added.index.isin(listed.index)
+        if known.any():
+            phones = added.index[known]
+            listed.loc[phones] = listed.loc[phones].str.cat(added[known].to_numpy(dtype=object), sep=' | ').to_numpy(dtype=object)
+        aggregates.dates_called = pd.concat([listed, added[~known]])
+    
+    def _analysis_from_aggregates(self, summary):
+        """Call analysis columns (except dates_times_called) from CallAggregates.result()"""
+        analysis_df = pd.DataFrame({
+            'phone': summary.index.to_numpy(),
+            'no_of_times_called': summary['calls'].to_numpy(),
+            'name': summary['name'].fillna('Unknown').to_numpy(),
+        })
+        
+        # Same columns and defaults as the in-memory engines, gaps in days
+        multiple = summary['dated_calls'].to_numpy() >= 2
+        analysis_df['avg_gap_between_calls'] = np.where(multiple, np.round(summary['avg_gap_days'].to_numpy(), 2), 0)
+        for col, gap in [('min_gap_between_calls', 'min_gap'), ('max_gap_between_calls', 'max_gap')]:
+            analysis_df[col] = np.where(multiple, np.round(summary[gap].to_numpy() / (24 * 3600), 2), 0)
+        analysis_df['first_call_date'] = summary['first_call'].dt.strftime('%Y-%m-%d %H:%M:%S').fillna('Unknown').to_numpy()
+        analysis_df['last_call_date'] = summary['last_call'].dt.strftime('%Y-%m-%d %H:%M:%S').fillna('Unknown').to_numpy()
+        analysis_df['total_call_days'] = summary['call_days'].to_numpy()
+        
+        timed = summary['timed_calls'].to_numpy() > 0
+        totals = summary['seconds'].to_numpy()
+        averages = np.round(np.divide(totals, summary['timed_calls'].to_numpy(), out=np.zeros(len(summary)), where=timed), 2)
+        analysis_df['total_time_spent_seconds'] = np.where(timed, totals, 0)
+        analysis_df['avg_time_per_call_seconds'] = np.where(timed, averages, 0)
+        analysis_df['total_time_spent'] = [self._format_duration(value) for value in analysis_df['total_time_spent_seconds']]
+        analysis_df['avg_time_per_call'] = [self._format_duration(value) for value in analysis_df['avg_time_per_call_seconds']]
+        return analysis_df
+    
+    @profiled('build_call_cube')
+    def build_call_cube(self, call_logs_df):
+        """Employee x day x hour x call type cube of the call logs (call_cube.call_cube)"""
+        self.cube_columns = {}
+        return self._call_cube(call_logs_df)
+    
+    def _call_cube(self, call_logs_df):
+        """call_cube of a call log frame; columns are detected once per source file (self.cube_columns)"""
+        if call_logs_df.empty:
+            return empty_cube()
+        moments = pd.Series(pd.NaT, index=call_logs_df.index, dtype='datetime64[ns]')
+        seconds = pd.Series(np.nan, index=call_logs_df.index)
+        types = pd.Series(None, index=call_logs_df.index, dtype=object)
+        for source, positions in self._source_groups(call_logs_df):
+            rows = call_logs_df.iloc[positions]
+            if source not in self.cube_columns:
+                type_col = next((col for col in CALL_LOG_COLUMNS.columns(rows.columns, 'type') if rows[col].notna().any()), None)
+                self.cube_columns[source] = (self._find_datetime_column(rows), self._find_duration_column(rows), type_col)
+            datetime_col, duration_col, type_col = self.cube_columns[source]
+            if datetime_col in rows.columns:
+                moments.iloc[positions] = pd.to_datetime(rows[datetime_col], errors='coerce').to_numpy(dtype='datetime64[ns]')
+            if duration_col in rows.columns:
+                seconds.iloc[positions] = parse_durations(rows[duration_col]).to_numpy()
+            if type_col in rows.columns:
+                types.iloc[positions] = rows[type_col].to_numpy(dtype=object)
+        
+        employees = call_logs_df['employee'] if 'employee' in call_logs_df.columns else None
+        return call_cube(employees, moments, seconds, types)
+    
+    @profiled('enrich_leads')
+    def enrich_leads(self, leads_df, call_analysis_df, call_logs_df=None):
+        """Leads with each lead's call history and metrics attached (lead_join.enrich_leads)"""
+        enriched = enrich_leads(leads_df, call_analysis_df, call_logs_df)
+        print(f"🔗 {match_summary(enriched)}")
+        return enriched
+    
+    def _prepare_call_logs(self, call_logs_df):
+        """Dates and duration seconds for every call row, parsed once per source file
+        
+        Each source file's (employee/original_file) date and duration columns
+        are detected on its own rows (_find_date_column / _find_duration_column)
+        and kept in self.column_roles, so later chunks of the same file reuse
+        them. Exports are named by date range, so two employees' files often
+        share an original_file name but not their columns.
+        Returns (datetime64 Series, float Series) aligned with call_logs_df,
+        NaT/NaN where a row has no usable value.
+        """
+        dates = pd.Series(pd.NaT, index=call_logs_df.index, dtype='datetime64[ns]')
+        seconds = pd.Series(np.nan, index=call_logs_df.index)
+        sources = self._source_groups(call_logs_df)
+        for position, (source, positions) in enumerate(sources):
+            self._report_progress('analysis', source, position, len(sources), len(call_logs_df))
+            rows = call_logs_df.iloc[positions]
+            if source not in self.column_roles:
+                self.column_roles[source] = (self._find_date_column(rows), self._find_duration_column(rows))
+            date_col, duration_col = self.column_roles[source]
+            if date_col in rows.columns:
+                dates.iloc[positions] = pd.to_datetime(rows[date_col], errors='coerce').to_numpy(dtype='datetime64[ns]')
+            if duration_col in rows.columns:
+                seconds.iloc[positions] = self._parse_duration_column(rows[duration_col]).to_numpy()
+        return dates, seconds
+    
+    def _report_progress(self, stage, file, done, total, rows=None):
+        """Forward a progress event when running under a background runner"""
+        if self.progress_callback is not None:
+            self.progress_callback(stage, file, done, total, rows)
+    
+    def _generate_call_analysis_loop(self, call_logs_df):
+        """Per-phone loop engine - re-filters the frame for every phone number"""
         analysis_data = []
+        dates, seconds = self._prepare_call_logs(call_logs_df)
+        call_logs_df = call_logs_df.assign(**{CALL_DATETIME: dates, CALL_SECONDS: seconds})
         
         # Group by cleaned phone number
         for phone in call_logs_df['phone_cleaned'].unique():
@@ -31,11 +318,121 @@ class MetricsCalculator:
             analysis_data.append(metrics)
         
         # Create final dataframe
-        analysis_df = pd.DataFrame(analysis_data)
+        return pd.DataFrame(analysis_data)
+    
+    def _generate_call_analysis_grouped(self, call_logs_df):
+        """Vectorized engine - same columns as the loop engine from one sort + groupby pass"""
+        # Group keys in first-appearance order (same order as .unique() in the loop engine)
+        codes, phones = pd.factorize(call_logs_df['phone_cleaned'])
+        valid = codes >= 0
+        df = call_logs_df[valid]
+        key = pd.Series(codes[valid], index=df.index)
+        n_groups = len(phones)
+        group_index = pd.RangeIndex(n_groups)
+        
+        analysis_df = pd.DataFrame({
+            'phone': phones,
+            'no_of_times_called': key.value_counts().reindex(group_index, fill_value=0).to_numpy(),
+        })
+        analysis_df['name'] = self._most_common_names_grouped(df, key, n_groups)
+        
+        dates, seconds = self._prepare_call_logs(df)
+        date_metrics = self._date_metrics_grouped(dates, key, n_groups)
+        time_metrics = self._time_metrics_grouped(seconds, key, n_groups)
+        
+        # Same column order as _calculate_phone_metrics
+        for col in list(self._get_default_date_metrics()) + list(self._get_default_time_metrics()):
+            source = date_metrics if col in date_metrics.columns else time_metrics
+            analysis_df[col] = source[col].to_numpy()
+        analysis_df['dates_times_called'] = date_metrics['dates_times_called'].to_numpy()
         
-        print(f"✅ Generated analysis for {len(analysis_df)} unique phone numbers")
         return analysis_df
     
+    def _most_common_names_grouped(self, df, key, n_groups):
+        """Most common non-null name per group (ties resolved like Series.mode)"""
+        names = pd.Series('Unknown', index=pd.RangeIndex(n_groups), dtype=object)
+        if 'name' not in df.columns:
+            return names.to_numpy()
+        
+        present = df['name'].notna()
+        if present.any():
+            # Sorted by (phone, name) so idxmax picks the smallest name among ties
+            counts = df.loc[present, 'name'].groupby(key[present]).value_counts(sort=False).sort_index()
+            counts = counts.reset_index(name='count')
+            best = counts.loc[counts.groupby(counts.columns[0], sort=False)['count'].idxmax()]
+            names.loc[best.iloc[:, 0].to_numpy()] = best.iloc[:, 1].to_numpy()
+        return names.to_numpy()
+    
+    def _date_metrics_grouped(self, dates, key, n_groups):
+        """Gap, first/last call, call-day and dates_times_called columns for all phones at once"""
+        metrics = pd.DataFrame(self._get_default_date_metrics(), index=pd.RangeIndex(n_groups))
+        metrics['dates_times_called'] = "No date/time data"
+        
+        dated = dates.notna()
+        if not dated.any():
+            return metrics
+        
+        # One global sort by (phone, datetime)
+        calls = pd.DataFrame({'key': key[dated].to_numpy(), 'date': dates[dated].to_numpy()})
+        calls = calls.sort_values(['key', 'date'], kind='stable', ignore_index=True)
+        grouped = calls.groupby('key', sort=True)
+        
+        first = grouped['date'].min()
+        last = grouped['date'].max()
+        counts = grouped.size()
+        
+        # Gaps between consecutive calls of the same phone (in days)
+        same_phone = calls['key'].eq(calls['key'].shift())
+        differences = calls['date'].diff()[same_phone]
+        gaps = differences.dt.total_seconds() / (24 * 3600)
+        gap_groups = gaps.groupby(calls.loc[same_phone, 'key'])
+        gap_ns = pd.Series(differences.to_numpy(dtype='timedelta64[ns]').astype(np.int64), index=gaps.index)
+        gap_sums = gap_ns.groupby(calls.loc[same_phone, 'key']).sum()
+        
+        multi = counts.index[counts >= 2]
+        if len(multi):
+            for col in ['avg_gap_between_calls', 'min_gap_between_calls', 'max_gap_between_calls']:
+                metrics[col] = metrics[col].astype(float)
+            averages = average_gap_days(gap_sums.reindex(multi).to_numpy(), gap_groups.size().reindex(multi).to_numpy())
+            metrics.loc[multi, 'avg_gap_between_calls'] = np.round(averages, 2)
+            metrics.loc[multi, 'min_gap_between_calls'] = np.round(gap_groups.min().reindex(multi).to_numpy(), 2)
+            metrics.loc[multi, 'max_gap_between_calls'] = np.round(gap_groups.max().reindex(multi).to_numpy(), 2)
+        
+        metrics.loc[first.index, 'first_call_date'] = first.dt.strftime('%Y-%m-%d %H:%M:%S').to_numpy()
+        metrics.loc[last.index, 'last_call_date'] = last.dt.strftime('%Y-%m-%d %H:%M:%S').to_numpy()
+        
+        call_days = calls.assign(day=calls['date'].dt.normalize()).drop_duplicates(['key', 'day'])
+        metrics.loc[counts.index, 'total_call_days'] = call_days.groupby('key').size().reindex(counts.index).to_numpy()
+        
+        formatted = calls['date'].dt.strftime(CALL_TIME_FORMAT)
+        joined = formatted.groupby(calls['key'], sort=True).agg(' | '.join)
+        metrics.loc[joined.index, 'dates_times_called'] = joined.to_numpy()
+        
+        return metrics
+    
+    def _time_metrics_grouped(self, seconds, key, n_groups):
+        """Total/average call time columns for all phones at once"""
+        defaults = self._get_default_time_metrics()
+        metrics = pd.DataFrame(defaults, index=pd.RangeIndex(n_groups))
+        
+        positive = seconds > 0
+        if not positive.any():
+            return metrics
+        
+        totals = seconds[positive].groupby(key[positive]).sum()
+        valid_counts = positive.groupby(key).sum()
+        valid_counts = valid_counts[valid_counts > 0]
+        avg = np.round(totals.reindex(valid_counts.index).to_numpy() / valid_counts.to_numpy(), 2)
+        
+        metrics['total_time_spent_seconds'] = metrics['total_time_spent_seconds'].astype(float)
+        metrics['avg_time_per_call_seconds'] = metrics['avg_time_per_call_seconds'].astype(float)
+        metrics.loc[valid_counts.index, 'total_time_spent_seconds'] = totals.reindex(valid_counts.index).to_numpy()
+        metrics.loc[valid_counts.index, 'avg_time_per_call_seconds'] = avg
+        metrics.loc[valid_counts.index, 'total_time_spent'] = [self._format_duration(value) for value in totals.reindex(valid_counts.index)]
+        metrics.loc[valid_counts.index, 'avg_time_per_call'] = [self._format_duration(value) for value in avg]
+        
+        return metrics
+    
     def _calculate_phone_metrics(self, phone_calls, phone):
         """Calculate all metrics for a specific phone number from call logs"""
         metrics = {
@@ -71,32 +468,28 @@ class MetricsCalculator:
         """Calculate date-based metrics like average gap between calls"""
         metrics = {}
         
-        # Find date column
-        date_col = self._find_date_column(phone_calls)
-        if date_col:
-            dates = pd.to_datetime(phone_calls[date_col], errors='coerce').dropna()
+        # Dates parsed once per file by _prepare_call_logs
+        dates = phone_calls[CALL_DATETIME].dropna()
+        if len(dates) >= 2:
+            dates_sorted = dates.sort_values()
+            # Calculate gaps between consecutive calls (in days)
+            gaps = (dates_sorted.diff().dropna()).dt.total_seconds() / (24 * 3600)  # Convert to days
+            gap_ns = dates_sorted.diff().dropna().to_numpy(dtype='timedelta64[ns]').astype(np.int64)
             
-            if len(dates) >= 2:
-                dates_sorted = dates.sort_values()
-                # Calculate gaps between consecutive calls (in days)
-                gaps = (dates_sorted.diff().dropna()).dt.total_seconds() / (24 * 3600)  # Convert to days
-                
-                metrics['avg_gap_between_calls'] = round(gaps.mean(), 2)
-                metrics['min_gap_between_calls'] = round(gaps.min(), 2)
-                metrics['max_gap_between_calls'] = round(gaps.max(), 2)
-                metrics['first_call_date'] = dates_sorted.min().strftime('%Y-%m-%d %H:%M:%S')
-                metrics['last_call_date'] = dates_sorted.max().strftime('%Y-%m-%d %H:%M:%S')
-                metrics['total_call_days'] = len(dates_sorted.dt.date.unique())
-            elif len(dates) == 1:
-                single_date = dates.iloc[0]
-                metrics['avg_gap_between_calls'] = 0
-                metrics['min_gap_between_calls'] = 0
-                metrics['max_gap_between_calls'] = 0
-                metrics['first_call_date'] = single_date.strftime('%Y-%m-%d %H:%M:%S')
-                metrics['last_call_date'] = single_date.strftime('%Y-%m-%d %H:%M:%S')
-                metrics['total_call_days'] = 1
-            else:
-                metrics.update(self._get_default_date_metrics())
+            metrics['avg_gap_between_calls'] = round(average_gap_days(gap_ns.sum(), len(gap_ns)), 2)
+            metrics['min_gap_between_calls'] = round(gaps.min(), 2)
+            metrics['max_gap_between_calls'] = round(gaps.max(), 2)
+            metrics['first_call_date'] = dates_sorted.min().strftime('%Y-%m-%d %H:%M:%S')
+            metrics['last_call_date'] = dates_sorted.max().strftime('%Y-%m-%d %H:%M:%S')
+            metrics['total_call_days'] = len(dates_sorted.dt.date.unique())
+        elif len(dates) == 1:
+            single_date = dates.iloc[0]
+            metrics['avg_gap_between_calls'] = 0
+            metrics['min_gap_between_calls'] = 0
+            metrics['max_gap_between_calls'] = 0
+            metrics['first_call_date'] = single_date.strftime('%Y-%m-%d %H:%M:%S')
+            metrics['last_call_date'] = single_date.strftime('%Y-%m-%d %H:%M:%S')
+            metrics['total_call_days'] = 1
         else:
             metrics.update(self._get_default_date_metrics())
         
@@ -106,26 +499,17 @@ class MetricsCalculator:
         """Calculate time-based metrics like total call time"""
         metrics = {}
         
-        # Find duration column
-        duration_col = self._find_duration_column(phone_calls)
-        if duration_col:
-            # Parse all durations to seconds
-            total_seconds = 0
-            valid_durations = 0
-            
-            for duration in phone_calls[duration_col].dropna():
-                seconds = self._parse_duration_to_seconds(duration)
-                if seconds > 0:
-                    total_seconds += seconds
-                    valid_durations += 1
-            
-            if valid_durations > 0:
-                metrics['total_time_spent_seconds'] = total_seconds
-                metrics['avg_time_per_call_seconds'] = round(total_seconds / valid_durations, 2)
-                metrics['total_time_spent'] = self._format_duration(total_seconds)
-                metrics['avg_time_per_call'] = self._format_duration(metrics['avg_time_per_call_seconds'])
-            else:
-                metrics.update(self._get_default_time_metrics())
+        # Durations parsed once per file by _prepare_call_logs
+        seconds = phone_calls[CALL_SECONDS]
+        positive = seconds[seconds > 0]
+        total_seconds = positive.sum()
+        valid_durations = len(positive)
+        
+        if valid_durations > 0:
+            metrics['total_time_spent_seconds'] = total_seconds
+            metrics['avg_time_per_call_seconds'] = round(total_seconds / valid_durations, 2)
+            metrics['total_time_spent'] = self._format_duration(total_seconds)
+            metrics['avg_time_per_call'] = self._format_duration(metrics['avg_time_per_call_seconds'])
         else:
             metrics.update(self._get_default_time_metrics())
         
@@ -133,18 +517,16 @@ class MetricsCalculator:
     
     def _get_all_dates_times(self, phone_calls):
         """Get all dates and times when this number was called"""
-        date_col = self._find_date_column(phone_calls)
-        if date_col:
-            dates = pd.to_datetime(phone_calls[date_col], errors='coerce').dropna()
-            if not dates.empty:
-                # Format as readable dates and times
-                formatted_dates = dates.dt.strftime('%Y-%m-%d %H:%M:%S').tolist()
-                return ' | '.join(sorted(formatted_dates))
+        dates = phone_calls[CALL_DATETIME].dropna()
+        if not dates.empty:
+            # Format as readable dates and times
+            formatted_dates = dates.dt.strftime('%Y-%m-%d %H:%M:%S').tolist()
+            return ' | '.join(sorted(formatted_dates))
         return "No date/time data"
     
     def _find_date_column(self, df):
         """Find the most likely date/time column"""
-        date_columns = [col for col in df.columns if any(keyword in str(col).lower() for keyword in ['date', 'time', 'timestamp'])]
+        date_columns = CALL_LOG_COLUMNS.columns(df.columns, 'date')
         
         for col in date_columns:
             sample = df[col].head(5).dropna()
@@ -156,9 +538,26 @@ class MetricsCalculator:
                     continue
         return None
     
+    def _find_datetime_column(self, df):
+        """Date column that also carries the time of day (for the hourly call cube), else _find_date_column's pick"""
+        # Headers naming a date first, so a 'Date Time' column wins over a time-only 'Time'
+        candidates = sorted(CALL_LOG_COLUMNS.columns(df.columns, 'date'), key=lambda col: 'date' not in str(col).lower())
+        for col in candidates:
+            sample = df[col].head(5).dropna()
+            if len(sample) > 0:
+                if sample.astype(str).str.strip().str.fullmatch(TIME_ONLY_PATTERN).all():
+                    continue
+                try:
+                    parsed = pd.to_datetime(sample, errors='raise')
+                except:
+                    continue
+                if (parsed != parsed.dt.normalize()).any():
+                    return col
+        return self._find_date_column(df)
+    
     def _find_duration_column(self, df):
         """Find the most likely duration column"""
-        duration_columns = [col for col in df.columns if any(keyword in str(col).lower() for keyword in ['duration', 'call time', 'length'])]
+        duration_columns = CALL_LOG_COLUMNS.columns(df.columns, 'duration')
         
         for col in duration_columns:
             sample = df[col].head(5).dropna()
@@ -167,47 +566,17 @@ class MetricsCalculator:
         return None
     
     def _parse_duration_to_seconds(self, duration):
-        """Convert various duration formats to seconds"""
-        try:
-            # If it's already a number, assume seconds
-            if isinstance(duration, (int, float)):
-                return float(duration)
-            
-            duration_str = str(duration).lower().strip()
-            
-            # Handle HH:MM:SS format
-            if ':' in duration_str:
-                parts = duration_str.split(':')
-                if len(parts) == 3:  # HH:MM:SS
-                    hours, minutes, seconds = map(float, parts)
-                    return hours * 3600 + minutes * 60 + seconds
-                elif len(parts) == 2:  # MM:SS
-                    minutes, seconds = map(float, parts)
-                    return minutes * 60 + seconds
-            
-            # Handle text formats like "5 minutes", "1 hour"
-            if 'hour' in duration_str or 'hr' in duration_str:
-                numbers = re.findall(r'\d+', duration_str)
-                hours = float(numbers[0]) if numbers else 1
-                return hours * 3600
-            elif 'min' in duration_str:
-                numbers = re.findall(r'\d+', duration_str)
-                minutes = float(numbers[0]) if numbers else 5
-                return minutes * 60
-            elif 'sec' in duration_str:
-                numbers = re.findall(r'\d+', duration_str)
-                seconds = float(numbers[0]) if numbers else 30
-                return seconds
-            
-            # Try to extract any number and assume minutes
-            numbers = re.findall(r'\d+', duration_str)
-            if numbers:
-                return float(numbers[0]) * 60  # Assume minutes
-            
-        except:
-            pass
-        
-        return 0  # Default if cannot parse
+        """Convert one duration to seconds (duration_parser rules), 0 if it can't be parsed"""
+        seconds = parse_duration(duration)
+        return 0 if pd.isna(seconds) else seconds
+    
+    def _parse_duration_column(self, durations):
+        """Seconds for a whole duration column; unparseable cells are reported and become NaN"""
+        seconds = parse_durations(durations)
+        unparseable = int(unparseable_durations(durations, seconds).sum())
+        if unparseable:
+            print(f"⚠️ {unparseable} '{durations.name}' values could not be parsed as durations - not counted as call time")
+        return seconds
     
     def _format_duration(self, total_seconds):
         """Format seconds into HH:MM:SS"""
@@ -241,39 +610,74 @@ class MetricsCalculator:
             'avg_time_per_call': '0:00'
         }
     
-    def save_all_reports(self, base_output_folder, leads_df, updates_df, call_logs_df, call_analysis_df):
-        """Save all reports including the new call analysis"""
-        # Create timestamped folder
-        timestamp_folder = f"lead_analysis_{self.timestamp}"
-        output_folder = os.path.join(base_output_folder, timestamp_folder)
-        
-        if not os.path.exists(output_folder):
-            os.makedirs(output_folder)
-        
-        print(f"💾 Saving all reports to: {output_folder}")
-        
-        # Save cleaned data files (using DataCleaner's method)
-        from data_cleaning import DataCleaner
-        cleaner = DataCleaner()
-        cleaner.save_cleaned_data(base_output_folder, leads_df, updates_df, call_logs_df)
-        
-        # Save the call analysis table
-        if not call_analysis_df.empty:
-            # Select and order the most important columns
-            important_columns = [
-                'phone', 'name', 'no_of_times_called', 
-                'total_time_spent', 'avg_time_per_call',
-                'avg_gap_between_calls', 'min_gap_between_calls', 'max_gap_between_calls',
-                'first_call_date', 'last_call_date', 'total_call_days',
-                'dates_times_called'
-            ]
+    @profiled('save_dashboard')
+    def save_dashboard(self, output_folder, cube_df, call_analysis_df, leads_df, updates_df, enriched_df):
+        """Offline HTML dashboard drawn from the call cube, the call analysis and the lead funnel (visualizations)"""
+        if not plotly_available():
+            print("⚠️ plotly is not installed - skipping the dashboard ('pip install plotly')")
+            return None
+        dashboard_path = save_dashboard(output_folder, cube_df, call_analysis_df, leads_df, updates_df, enriched_df)
+        print(f"📈 Saved dashboard: {dashboard_path} ({os.path.getsize(dashboard_path) / 1024 / 1024:.1f} MB)")
+        return dashboard_path
+    
+    def save_all_reports(self, base_output_folder, leads_df, updates_df, call_logs_df, call_analysis_df, output_format=DEFAULT_FORMAT):
+        """Save all reports including the new call analysis (csv, excel, parquet or feather)
+        
+        The run profile (stage timings) and the call cube go next to overall_performance in the cleaned data folder,
+        the HTML dashboard next to the reports.
+        """
+        frames = [leads_df, updates_df, call_logs_df, call_analysis_df]
+        with self.profile.span('save_all_reports', rows_in=sum(len(df) for df in frames)):
+            # Create timestamped folder
+            timestamp_folder = f"lead_analysis_{self.timestamp}"
+            output_folder = os.path.join(base_output_folder, timestamp_folder)
+            
+            if not os.path.exists(output_folder):
+                os.makedirs(output_folder)
+            
+            print(f"💾 Saving all reports to: {output_folder}")
+            
+            # Call counts and talk time per employee, day, hour and call type
+            cube_df = None
+            if self.call_cube is not None or not call_logs_df.empty:
+                cube_df = self.call_cube if self.call_cube is not None else self.build_call_cube(call_logs_df)
+            
+            # Save cleaned data files (using DataCleaner's method)
+            from data_cleaning import DataCleaner
+            cleaner = DataCleaner(profile=self.profile, store_path=self.store_path)
+            cleaned_folder = cleaner.save_cleaned_data(base_output_folder, leads_df, updates_df, call_logs_df, output_format,
+                                                       call_analysis_df, cube_df)
+            self.cleaned_folder = cleaned_folder
+            
+            # Save the call analysis table
+            if not call_analysis_df.empty:
+                # Select and order the most important columns
+                important_columns = [
+                    'phone', 'name', 'no_of_times_called', 
+                    'total_time_spent', 'avg_time_per_call',
+                    'avg_gap_between_calls', 'min_gap_between_calls', 'max_gap_between_calls',
+                    'first_call_date', 'last_call_date', 'total_call_days',
+                    'dates_times_called'
+                ]
+                
+                # Only include columns that exist in the dataframe
+                available_columns = [col for col in important_columns if col in call_analysis_df.columns]
+                final_df = call_analysis_df[available_columns]
+                
+                write_frame(final_df, output_path(output_folder, 'call_analysis_table', output_format))
+                print(f"💾 Saved call analysis table: {len(final_df)} unique phone numbers")
+            
+            # Leads joined to their call history
+            enriched_df = None
+            if not leads_df.empty:
+                enriched_df = self.enrich_leads(leads_df, call_analysis_df, call_logs_df)
+                write_frame(enriched_df, output_path(output_folder, 'enriched_leads', output_format))
+                print(f"💾 Saved enriched leads: {len(enriched_df)} leads")
             
-            # Only include columns that exist in the dataframe
-            available_columns = [col for col in important_columns if col in call_analysis_df.columns]
-            final_df = call_analysis_df[available_columns]
+            self.save_dashboard(output_folder, cube_df, call_analysis_df, leads_df, updates_df, enriched_df)
             
-            final_df.to_csv(os.path.join(output_folder, 'call_analysis_table.csv'), index=False)
-            print(f"💾 Saved call analysis table: {len(final_df)} unique phone numbers")
+            print(f"✅ All reports saved successfully!")
         
-        print(f"✅ All reports saved successfully!")
+        profile_path = self.profile.save(cleaned_folder)
+        print(f"⏱️ Saved run profile: {profile_path}")
         return output_folder
\ No newline at end of file
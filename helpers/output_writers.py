@@ -0,0 +1,101 @@
+# helpers/output_writers.py
+import importlib.util
+import os
+
+import pandas as pd
+
+DEFAULT_FORMAT = 'csv'
+
+
+def _require_pyarrow(output_format):
+    """Parquet and Feather are written through pyarrow, which is an optional dependency"""
+    if importlib.util.find_spec('pyarrow') is None:
+        raise ImportError(f"{output_format} output needs pyarrow - install it with 'pip install pyarrow' or choose csv/excel")
+
+
+def _columnar_ready(df):
+    """Copy of df that Arrow can store with typed columns
+
+    Datetime and numeric columns pass through untouched; object columns that
+    mix types (phones read as int in one file and text in another) become strings.
+    """
+    df = df.reset_index(drop=True)
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) not in ('string', 'empty', 'boolean'):
+            text = df[col].map(str)
+            df[col] = text.where(df[col].notna(), None)
+    df.columns = [str(col) for col in df.columns]
+    return df
+
+
+def _write_csv(df, path):
+    df.to_csv(path, index=False)
+
+
+def _write_excel(df, path):
+    df.to_excel(path, index=False)
+
+
+def _write_parquet(df, path):
+    _require_pyarrow('parquet')
+    _columnar_ready(df).to_parquet(path, index=False, compression='zstd')
+
+
+def _write_feather(df, path):
+    _require_pyarrow('feather')
+    _columnar_ready(df).to_feather(path, compression='zstd')
+
+
+# format name -> (file extension, writer(df, path)); add entries with register_writer
+WRITERS = {
+    'csv': ('.csv', _write_csv),
+    'excel': ('.xlsx', _write_excel),
+    'parquet': ('.parquet', _write_parquet),
+    'feather': ('.feather', _write_feather),
+}
+
+# Formats that store text, so datetimes are pre-formatted for people reading them
+TEXT_FORMATS = ['csv', 'excel']
+
+
+def register_writer(output_format, extension, writer):
+    """Add (or replace) an output format"""
+    WRITERS[output_format] = (extension, writer)
+
+
+def ensure_available(output_format):
+    """Fail before a long run instead of at save time when a format can't be written"""
+    if output_format not in WRITERS:
+        raise ValueError(f"Unknown output format '{output_format}', expected one of {output_formats()}")
+    if output_format in ['parquet', 'feather']:
+        _require_pyarrow(output_format)
+
+
+def output_formats():
+    """Names of the available output formats"""
+    return list(WRITERS)
+
+
+def output_path(folder, name, output_format=DEFAULT_FORMAT):
+    """folder/name with the extension of the output format"""
+    if output_format not in WRITERS:
+        raise ValueError(f"Unknown output format '{output_format}', expected one of {output_formats()}")
+    return os.path.join(folder, name + WRITERS[output_format][0])
+
+
+def format_for_path(path):
+    """Output format matching a file's extension"""
+    extension = os.path.splitext(path)[1].lower()
+    for output_format, (format_extension, _) in WRITERS.items():
+        if extension == format_extension:
+            return output_format
+    raise ValueError(f"No output format writes '{extension}' files, expected one of {output_formats()}")
+
+
+def write_frame(df, path, output_format=None):
+    """Write df to path; the format defaults to the one matching the extension"""
+    output_format = output_format or format_for_path(path)
+    if output_format not in WRITERS:
+        raise ValueError(f"Unknown output format '{output_format}', expected one of {output_formats()}")
+    WRITERS[output_format][1](df, path)
+    return path
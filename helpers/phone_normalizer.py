@@ -0,0 +1,400 @@
+# helpers/phone_normalizer.py
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype, is_bool_dtype, is_float_dtype, is_numeric_dtype
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # optional - text is normalized from Python strings without it
+    pa = None
+
+# Output formats
+LOCAL_FORMAT = 'local'          # 0XXXXXXXXX  (DataCleaner)
+COUNTRY_CODE_FORMAT = '94'      # 94XXXXXXXXX (UnifiedProcessor, CallLogProcessor, LeadsProcessor)
+
+# Rows are normalized in blocks so one very long cell cannot blow up the digit matrix
+CHUNK_SIZE = 100_000
+
+# Floats at or above this print in exponent form, so str() no longer holds their digits
+_MAX_PLAIN_FLOAT = 1e16
+_POWERS_OF_TEN = 10 ** np.arange(19, dtype=np.int64)
+
+_ZERO = ord('0')
+_NINE = ord('9')
+_FOUR = ord('4')
+
+
+def normalize_phone_series(phones, output_format=LOCAL_FORMAT):
+    """Normalize a whole Series of Sri Lankan phone numbers at once
+
+    LOCAL_FORMAT returns 0XXXXXXXXX or None for anything that is not a valid
+    10 digit local number. COUNTRY_CODE_FORMAT returns a 94-prefixed number
+    and leaves values it cannot standardize unchanged.
+    """
+    if output_format not in (LOCAL_FORMAT, COUNTRY_CODE_FORMAT):
+        raise ValueError(f"Unknown phone output format: {output_format}")
+
+    phones = pd.Series(phones)
+    if len(phones) == 0:
+        return pd.Series([], index=phones.index, name=phones.name, dtype=object)
+
+    if _is_arrow_string(phones.dtype):
+        result = _normalize_arrow_strings(pa.array(phones.array), phones.array, output_format)
+    elif isinstance(phones.dtype, pd.api.extensions.ExtensionDtype) and phones.dtype.kind in 'if':
+        # Nullable Int64/Float64 (call-log numbers after schema.whole_numbers): the numeric path
+        # on the plain values, with None for <NA> as a mixed Excel column gives
+        missing = phones.isna().to_numpy()
+        values = phones.to_numpy(dtype=np.int64 if phones.dtype.kind == 'i' else np.float64, na_value=0)
+        result = _normalize_distinct(values, output_format, _normalize_numeric_values)
+        result[missing] = None
+    elif isinstance(phones.dtype, pd.api.extensions.ExtensionDtype) and is_numeric_dtype(phones.dtype):
+        # Other nullable numbers: plain Python numbers with None for <NA>
+        result = _normalize_object_values(phones.to_numpy(dtype=object, na_value=None), output_format)
+    elif is_numeric_dtype(phones.dtype) and not is_bool_dtype(phones.dtype):
+        result = _normalize_distinct(phones.to_numpy(), output_format, _normalize_numeric_values)
+    else:
+        result = _normalize_object_values(phones.to_numpy(dtype=object), output_format)
+
+    return pd.Series(result, index=phones.index, name=phones.name, dtype=object, copy=False)
+
+
+def normalize_phone(phone, output_format=LOCAL_FORMAT):
+    """Normalize a single phone number (same rules as normalize_phone_series)"""
+    return normalize_phone_series(pd.Series([phone], dtype=object), output_format).iloc[0]
+
+
+def _is_arrow_string(dtype):
+    """Arrow-backed text: pandas 3's default str dtype (what read_csv returns), string[pyarrow], ArrowDtype strings"""
+    if isinstance(dtype, pd.StringDtype):
+        return dtype.storage in ('pyarrow', 'pyarrow_numpy')
+    if isinstance(dtype, getattr(pd, 'ArrowDtype', ())):
+        return pa.types.is_string(dtype.pyarrow_dtype) or pa.types.is_large_string(dtype.pyarrow_dtype)
+    return False
+
+
+def _normalize_strings(values, output_format):
+    """Normalize an object array of strings (None/NaN for missing)"""
+    if pa is None:
+        return _normalize_distinct(values, output_format, _normalize_in_chunks)
+    # Copying into Arrow is much cheaper than hashing every Python string
+    array = pa.array(values, type=pa.large_string(), from_pandas=True)
+    return _normalize_arrow_strings(array, values, output_format)
+
+
+def _normalize_arrow_strings(array, originals, output_format):
+    """Normalize an Arrow string array straight from its UTF-8 buffer
+
+    Each row's digits are read as one integer, so no row becomes a Python
+    string on the way in. The distinct digit strings then go through the same
+    rules as numeric columns. Rows with more digits than int64 holds keep the
+    text rules. `originals` holds the values COUNTRY_CODE_FORMAT leaves unchanged.
+    """
+    keys = np.empty(len(array), dtype=np.int64)
+    lengths = np.empty(len(array), dtype=np.uint8)
+    for start in range(0, len(array), CHUNK_SIZE):
+        block = slice(start, start + CHUNK_SIZE)
+        keys[block], lengths[block] = _arrow_digits(array.slice(start, CHUNK_SIZE))
+
+    # Missing rows read as no digits, which no rule accepts; too long rows are redone below
+    too_long = lengths > 18
+    keys[too_long] = 1
+    codes, uniques = pd.factorize(keys)
+    digit_lengths = _count_digits(uniques) - 1
+    digits = uniques - _POWERS_OF_TEN[digit_lengths]
+
+    if output_format == LOCAL_FORMAT:
+        valid, numbers = _local_from_digits(digits, digit_lengths)
+        number_lengths = np.full(len(numbers), 10)
+    else:
+        valid, numbers, number_lengths = _country_code_from_digits(digits, digit_lengths)
+
+    lookup = np.full(len(uniques), None, dtype=object)
+    lookup[valid] = _format_numbers(numbers[valid], number_lengths[valid])
+    result = lookup[codes]
+
+    if output_format == COUNTRY_CODE_FORMAT:
+        unchanged = ~valid[codes] & ~too_long
+        result[unchanged] = np.asarray(originals[unchanged], dtype=object)   # left unchanged
+    if too_long.any():
+        result[too_long] = _normalize_in_chunks(np.asarray(originals[too_long], dtype=object), output_format)
+    return result
+
+
+def _arrow_digits(array):
+    """Digits of every row of an Arrow string array as int('1' + digits), plus the digit count
+
+    Arrow right-aligns the rows into a fixed-width byte matrix, which is then
+    read one byte position at a time. The leading 1 keeps leading zeros apart
+    ('077' vs '77'); keys are only meaningful for rows with at most 18 digits.
+    Multi-byte UTF-8 characters never contain ASCII digit bytes.
+    """
+    width = pc.max(pc.binary_length(array)).as_py() or 1
+    padded = pc.ascii_lpad(array.fill_null(''), width=width, padding=' ')
+    if isinstance(padded, pa.ChunkedArray):   # e.g. after pd.concat
+        padded = padded.combine_chunks()
+
+    offset_type = np.int64 if pa.types.is_large_string(padded.type) else np.int32
+    _, offset_buffer, data_buffer = padded.buffers()
+    first = int(np.frombuffer(offset_buffer, dtype=offset_type)[padded.offset])
+    matrix = np.frombuffer(data_buffer, dtype=np.uint8)[first:first + len(padded) * width].reshape(len(padded), width)
+
+    keys = np.ones(len(padded), dtype=np.int64)
+    lengths = np.zeros(len(padded), dtype=np.uint8)
+    for column in np.ascontiguousarray(matrix.T):
+        digit = column - np.uint8(_ZERO)
+        is_digit = digit < 10
+        keys = np.where(is_digit, keys * 10 + digit, keys)
+        lengths += is_digit
+    return keys, lengths
+
+
+def _normalize_object_values(values, output_format):
+    """Normalize text/mixed values"""
+    if infer_dtype(values, skipna=True) == 'string':
+        return _normalize_strings(values, output_format)
+
+    # Mixed Excel columns: group by exact type first, because 1 and 1.0 hash
+    # alike but print differently. Each group is then deduped on its own.
+    kind_codes, kinds = pd.factorize(_value_types(values))
+    result = np.empty(len(values), dtype=object)
+    for code, kind in enumerate(kinds):
+        rows = kind_codes == code
+        if kind is str:
+            result[rows] = _normalize_strings(values[rows], output_format)
+        elif kind in (float, np.float64):
+            result[rows] = _normalize_distinct(values[rows].astype(np.float64), output_format, _normalize_numeric_values)
+        elif kind in (int, np.int64):
+            result[rows] = _normalize_distinct(values[rows].astype(np.int64), output_format, _normalize_numeric_values)
+        else:
+            result[rows] = _normalize_in_chunks(values[rows], output_format)
+    return result
+
+
+_value_types = np.frompyfunc(type, 1, 1)
+
+
+def _normalize_distinct(values, output_format, normalize):
+    """Run `normalize` on each distinct value once and broadcast the results back"""
+    codes, uniques = pd.factorize(values)
+
+    # Missing values get code -1, which picks the trailing None slot
+    lookup = np.full(len(uniques) + 1, None, dtype=object)
+    if len(uniques):
+        lookup[:-1] = normalize(np.asarray(uniques), output_format)
+    result = lookup[codes]
+
+    if output_format == COUNTRY_CODE_FORMAT:
+        missing = codes < 0
+        if missing.any():
+            result[missing] = values[missing]
+    return result
+
+
+def _normalize_in_chunks(values, output_format):
+    """Apply the digit-matrix rules block by block"""
+    result = np.empty(len(values), dtype=object)
+    normalize = _normalize_local if output_format == LOCAL_FORMAT else _normalize_country_code
+    for start in range(0, len(values), CHUNK_SIZE):
+        result[start:start + CHUNK_SIZE] = normalize(values[start:start + CHUNK_SIZE])
+    return result
+
+
+def _normalize_numeric_values(values, output_format):
+    """Normalize int/float columns with integer arithmetic instead of string handling
+
+    str(9476724296.0) is '9476724296.0', so a whole float contributes its
+    integer digits plus one trailing zero - exactly what the text rules see.
+    """
+    if is_float_dtype(values.dtype):
+        missing = np.isnan(values)
+        plain = ~missing & (np.abs(values) < _MAX_PLAIN_FLOAT) & (values == np.trunc(values))
+        whole = np.abs(np.where(plain, values, 0)).astype(np.int64)
+        digits = whole * 10
+        lengths = _count_digits(whole) + 1
+    else:
+        missing = np.zeros(len(values), dtype=bool)
+        plain = np.ones(len(values), dtype=bool)
+        digits = np.abs(values.astype(np.int64))
+        lengths = _count_digits(digits)
+
+    if output_format == LOCAL_FORMAT:
+        result = np.full(len(values), None, dtype=object)
+        valid, numbers = _local_from_digits(digits, lengths)
+        valid &= plain
+        result[valid] = _format_numbers(numbers[valid], np.full(valid.sum(), 10))
+    else:
+        result = np.empty(len(values), dtype=object)
+        valid, numbers, number_lengths = _country_code_from_digits(digits, lengths)
+        valid &= plain
+        result[valid] = _format_numbers(numbers[valid], number_lengths[valid])
+        result[~valid] = values[~valid].astype(object)   # left unchanged
+
+    # Exponent-form and fractional floats keep the exact text rules
+    fallback = ~plain & ~missing
+    if fallback.any():
+        result[fallback] = _normalize_in_chunks(values[fallback].astype(object), output_format)
+    return result
+
+
+def _count_digits(numbers):
+    """Number of decimal digits of non-negative int64 values (0 has one digit)"""
+    return np.maximum(np.searchsorted(_POWERS_OF_TEN, numbers, side='right'), 1)
+
+
+def _leading_digits(numbers, lengths, count):
+    """First `count` digits of a zero-padded number of the given length, as an int"""
+    shift = np.clip(lengths - count, 0, 18)
+    return numbers // _POWERS_OF_TEN[shift]
+
+
+def _format_numbers(numbers, lengths):
+    """Zero-padded decimal strings of int64 numbers (no per-value Python formatting)"""
+    result = np.empty(len(numbers), dtype=object)
+    present = np.flatnonzero(np.bincount(lengths))
+    for length in present:
+        rows = lengths == length if len(present) > 1 else slice(None)
+        remaining = numbers[rows]
+        # One contiguous row per digit position, transposed once at the end
+        matrix = np.empty((length, len(remaining)), dtype=np.uint32)
+        for position in range(length - 1, -1, -1):
+            quotient = remaining // 10
+            matrix[position] = remaining - quotient * 10
+            remaining = quotient
+        matrix += _ZERO
+        result[rows] = _to_strings(matrix.T)
+    return result
+
+
+def _local_from_digits(digits, lengths):
+    """LOCAL_FORMAT rules on a digit string held as (number, length)"""
+    starts_94 = (lengths >= 2) & (_leading_digits(digits, lengths, 2) == 94)
+    first_digit = _leading_digits(digits, lengths, 1)
+
+    from_94 = starts_94 & (lengths == 11)
+    from_9 = ~starts_94 & (lengths == 9) & (first_digit != 0)
+    already_local = ~starts_94 & (lengths == 10) & (first_digit == 0)
+
+    numbers = np.where(from_94, digits % 10**9, digits)
+    return from_94 | from_9 | already_local, numbers
+
+
+def _country_code_from_digits(digits, lengths):
+    """COUNTRY_CODE_FORMAT rules on a digit string held as (number, length)"""
+    # Strip trailing zeros
+    stripped = digits.copy()
+    stripped_lengths = lengths.copy()
+    # Each pass only revisits the rows that still end in 0
+    trailing = np.flatnonzero((stripped > 0) & (stripped % 10 == 0))
+    while len(trailing):
+        stripped[trailing] //= 10
+        stripped_lengths[trailing] -= 1
+        trailing = trailing[stripped[trailing] % 10 == 0]
+    stripped_lengths = np.where(stripped == 0, 0, stripped_lengths)
+
+    starts_94 = (stripped_lengths >= 2) & (_leading_digits(stripped, stripped_lengths, 2) == 94)
+    valid = (stripped_lengths > 0) & ~(starts_94 & (stripped_lengths < 9))
+
+    segment_lengths = np.minimum(stripped_lengths, 9)
+    segment = np.where(stripped_lengths > 9, stripped % 10**9, stripped)
+    prefixed = 94 * _POWERS_OF_TEN[np.clip(segment_lengths, 0, 16)] + segment
+
+    numbers = np.where(starts_94, stripped, prefixed)
+    number_lengths = np.where(starts_94, stripped_lengths, segment_lengths + 2)
+    return valid, numbers, number_lengths
+
+
+def _digit_matrix(values, min_width):
+    """Left-align the digits of str(value) for every value in a (rows x width) code-point matrix"""
+    text = np.asarray(values, dtype=str)
+    width = max(text.dtype.itemsize // 4, 1)
+    codes = np.ascontiguousarray(text).view(np.uint32).reshape(len(text), width)
+
+    is_digit = (codes >= _ZERO) & (codes <= _NINE)
+    lengths = is_digit.sum(axis=1)
+
+    # Gather each row's digits (row-major order) back into a left-aligned matrix
+    flat_digits = codes[is_digit]
+    starts = np.cumsum(lengths) - lengths
+    positions = np.arange(max(width, min_width))
+    source = np.minimum(starts[:, None] + positions[None, :], max(len(flat_digits) - 1, 0))
+    if len(flat_digits) == 0:
+        return np.zeros((len(text), len(positions)), dtype=np.uint32), lengths
+    digits = np.where(positions[None, :] < lengths[:, None], flat_digits[source], 0).astype(np.uint32)
+    return digits, lengths
+
+
+def _to_strings(matrix):
+    """Turn a (rows x width) code-point matrix back into Python strings"""
+    matrix = np.ascontiguousarray(matrix, dtype=np.uint32)
+    return matrix.view(f'U{matrix.shape[1]}').ravel().astype(object)
+
+
+def _normalize_local(values):
+    """Vectorized DataCleaner rules: 94XXXXXXXXX / XXXXXXXXX / 0XXXXXXXXX -> 0XXXXXXXXX"""
+    result = np.full(len(values), None, dtype=object)
+    if len(values) == 0:
+        return result
+
+    # Missing and placeholder values ('', 'nan', 'None', 'null') have no digits and end up invalid
+    missing = pd.isna(values)
+    digits, lengths = _digit_matrix(values, 11)
+
+    starts_94 = (lengths >= 2) & (digits[:, 0] == ord('9')) & (digits[:, 1] == _FOUR)
+    starts_0 = digits[:, 0] == _ZERO
+
+    from_94 = starts_94 & (lengths == 11)                # 94XXXXXXXXX -> 0XXXXXXXXX
+    from_9 = ~starts_94 & (lengths == 9) & ~starts_0     # XXXXXXXXX   -> 0XXXXXXXXX
+    already_local = ~starts_94 & (lengths == 10) & starts_0
+
+    out = np.full((len(values), 10), _ZERO, dtype=np.uint32)
+    out[from_94, 1:] = digits[from_94, 2:11]
+    out[from_9, 1:] = digits[from_9, :9]
+    out[already_local] = digits[already_local, :10]
+
+    valid = (from_94 | from_9 | already_local) & ~missing
+    result[valid] = _to_strings(out[valid])
+    return result
+
+
+def _normalize_country_code(values):
+    """Vectorized UnifiedProcessor rules: strip non-digits and trailing zeros, then prefix 94"""
+    result = np.array(values, dtype=object)
+    if len(values) == 0:
+        return result
+
+    digits, _ = _digit_matrix(values, 2)
+    n_rows, width = digits.shape
+
+    # Length after removing trailing zeros
+    significant = (digits != 0) & (digits != _ZERO)
+    has_significant = significant.any(axis=1)
+    lengths = np.where(has_significant, width - np.argmax(significant[:, ::-1], axis=1), 0)
+
+    starts_94 = (lengths >= 2) & (digits[:, 0] == ord('9')) & (digits[:, 1] == _FOUR)
+
+    # Values returned unchanged: missing/empty, no significant digits, or a too-short 94 number
+    missing = pd.isna(values) | (values == '')
+    keep_original = missing | (lengths == 0) | (starts_94 & (lengths < 9))
+
+    # Numbers that already start with 94 are kept as-is, everything else gets a 94 prefix.
+    # Longer numbers keep their last 9 digits (this also covers 0XXXXXXXXX -> 94XXXXXXXXX).
+    prefixed = ~starts_94
+    start = np.where(prefixed & (lengths > 9), lengths - 9, 0)
+    segment_lengths = lengths - start
+
+    segment_width = max(int(segment_lengths.max()), 1)
+    offsets = np.arange(segment_width)
+    source = np.minimum(start[:, None] + offsets[None, :], width - 1)
+    segment = np.take_along_axis(digits, source, axis=1)
+    segment[offsets[None, :] >= segment_lengths[:, None]] = 0
+
+    out = np.zeros((n_rows, segment_width + 2), dtype=np.uint32)
+    out[prefixed, 0] = ord('9')
+    out[prefixed, 1] = _FOUR
+    out[prefixed, 2:] = segment[prefixed]
+    out[~prefixed, :segment_width] = segment[~prefixed]
+
+    converted = ~keep_original
+    result[converted] = _to_strings(out[converted])
+    return result
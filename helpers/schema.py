@@ -0,0 +1,95 @@
+# helpers/schema.py
+import pandas as pd
+from pandas.api.types import is_float_dtype
+
+CATEGORY = 'category'   # few distinct values repeated on many rows - stored as int codes + one copy of each value
+DATETIME = 'datetime'   # parsed once here; unparseable cells become NaT
+INTEGER = 'Int64'       # float columns that only hold whole numbers (raw phones read as 9476724296.0)
+
+# Cleaned DataCleaner frames
+LEADS_SCHEMA = {
+    'employee': CATEGORY,
+    'original_file': CATEGORY,
+    'city': CATEGORY,
+}
+UPDATES_SCHEMA = {
+    'employee': CATEGORY,
+    'original_file': CATEGORY,
+    'city': CATEGORY,
+    'timestamp': DATETIME,
+}
+CALL_LOGS_SCHEMA = {
+    'employee': CATEGORY,
+    'original_file': CATEGORY,
+    'type': CATEGORY,
+    'platform': CATEGORY,
+    # Each number repeats once per call; local numbers keep their leading 0 as category keys
+    'phone_cleaned': CATEGORY,
+}
+
+# UnifiedProcessor frames
+UNIFIED_CALL_LOGS_SCHEMA = {
+    'To Number': CATEGORY,
+    'Type': CATEGORY,
+    'Date': CATEGORY,
+    'Time': CATEGORY,
+    'Date Time': DATETIME,
+}
+UNIFIED_LEADS_SCHEMA = {
+    'City': CATEGORY,
+}
+
+
+def frame_memory(df):
+    """Bytes held by df, counting the strings inside object columns"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def whole_numbers(values):
+    """Float column holding only whole numbers as Int64; anything else (or None) unchanged
+
+    Exports with a blank cell read phone numbers as floats, and the text of
+    9476724296.0 carries an extra trailing 0 into phone normalization.
+    """
+    if values is None or not is_float_dtype(values.dtype):
+        return values
+    present = values.dropna()
+    if not (present == present.round()).all() or (present.abs() >= 2**53).any():
+        return values
+    return values.astype(INTEGER)
+
+
+def _convert(values, kind):
+    if kind == CATEGORY:
+        return values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype('category')
+    if kind == DATETIME:
+        return values if pd.api.types.is_datetime64_any_dtype(values) else pd.to_datetime(values, errors='coerce')
+    if kind == INTEGER:
+        return whole_numbers(values)
+    return values.astype(kind)
+
+
+def apply_schema(df, schema):
+    """Convert the schema's columns present in df; returns (df, bytes before, bytes after)
+
+    Columns missing from df are skipped, and a column that can't be converted
+    keeps its original dtype.
+    """
+    before = frame_memory(df)
+    columns = {}
+    for col, kind in schema.items():
+        if col not in df.columns:
+            continue
+        try:
+            columns[col] = _convert(df[col], kind)
+        except (TypeError, ValueError) as e:
+            print(f"⚠️ Kept {col} as {df[col].dtype}: {e}")
+    if columns:
+        df = df.assign(**columns)
+    return df, before, frame_memory(df)
+
+
+def describe_saving(label, before, after):
+    """One progress line: 'Leads: 3.2 MB -> 1.1 MB (66% smaller)'"""
+    saved = (1 - after / before) * 100 if before else 0
+    return f"🗜️ {label}: {before / 2**20:.1f} MB -> {after / 2**20:.1f} MB ({saved:.0f}% smaller)"
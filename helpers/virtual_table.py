@@ -0,0 +1,224 @@
+# helpers/virtual_table.py
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+import pandas as pd
+
+ALL_COLUMNS = 'All columns'
+DEFAULT_ROW_HEIGHT = 20
+HEADER_HEIGHT = 25
+
+
+def format_cell(value):
+    """Default cell text: blank for missing/empty values, str() otherwise"""
+    if not isinstance(value, (list, tuple, np.ndarray)) and (pd.isna(value) or value == ''):
+        return ''
+    return str(value)
+
+
+def format_datetime(value):
+    """Cell text for call dates"""
+    return value.strftime('%Y-%m-%d %H:%M') if pd.notna(value) else 'N/A'
+
+
+class VirtualTable:
+    """Shows a DataFrame in an existing ttk.Treeview without inserting every row
+
+    Only the rows that fit in the widget exist as tree items; scrolling,
+    sorting (click a heading) and filtering move a window over an index
+    into the frame and refresh those few items in place.
+    """
+
+    def __init__(self, tree, v_scrollbar):
+        self.tree = tree
+        self.v_scrollbar = v_scrollbar
+        self.data = pd.DataFrame()
+        self.columns = {}       # tree column id -> DataFrame column
+        self.formatters = {}    # tree column id -> value -> text
+        self.view = np.array([], dtype=np.int64)  # row positions after filter + sort
+        self.first = 0
+        self.sort_column = None
+        self.sort_ascending = True
+        self.filter_text = ''
+        self.filter_column = ALL_COLUMNS
+        self._filter_column_var = None
+        self._filter_box = None
+        self.count_label = None
+
+        # The scrollbar drives our window instead of the tree's own yview
+        self.tree.configure(yscrollcommand='')
+        self.v_scrollbar.configure(command=self.yview)
+        for sequence in ['<MouseWheel>', '<Button-4>', '<Button-5>']:
+            self.tree.bind(sequence, self._on_mousewheel)
+        self.tree.bind('<Prior>', lambda event: self._scroll_by(-self.visible_rows()) or 'break')
+        self.tree.bind('<Next>', lambda event: self._scroll_by(self.visible_rows()) or 'break')
+        self.tree.bind('<Configure>', lambda event: self.refresh())
+
+    # ----- data -----
+
+    def set_data(self, df, columns=None, formatters=None):
+        """Show df; columns maps tree column ids to DataFrame columns (default: every column as is)"""
+        self.data = df.reset_index(drop=True)
+        self.formatters = formatters or {}
+
+        if columns is None:
+            self.columns = {str(col): col for col in self.data.columns}
+            self.tree['columns'] = list(self.columns)
+            for column_id in self.columns:
+                self.tree.column(column_id, width=150, minwidth=100)
+        else:
+            self.columns = dict(columns)
+
+        for column_id in self.columns:
+            heading = self.tree.heading(column_id, 'text') or column_id
+            self.tree.heading(column_id, text=heading.rstrip(' ▲▼'),
+                              command=lambda column_id=column_id: self.sort_by(column_id))
+
+        self.sort_column = None
+        self.filter_text = ''
+        self.filter_column = ALL_COLUMNS
+        if self._filter_box is not None:
+            self._filter_box['values'] = [ALL_COLUMNS] + list(self.columns)
+            self._filter_column_var.set(ALL_COLUMNS)
+        self._apply_view()
+
+    def _apply_view(self):
+        """Recompute the row order from the current filter and sort"""
+        positions = np.arange(len(self.data))
+
+        if self.filter_text:
+            if self.filter_column == ALL_COLUMNS:
+                source_columns = list(self.columns.values())
+            else:
+                source_columns = [self.columns[self.filter_column]]
+            matches = np.zeros(len(self.data), dtype=bool)
+            for col in source_columns:
+                text = self.data[col].astype(str)
+                matches |= text.str.contains(self.filter_text, case=False, regex=False).to_numpy(dtype=bool, na_value=False)
+            positions = positions[matches]
+
+        if self.sort_column is not None:
+            values = self.data[self.columns[self.sort_column]].iloc[positions]
+            try:
+                order = values.reset_index(drop=True).sort_values(
+                    ascending=self.sort_ascending, kind='stable', na_position='last').index.to_numpy()
+            except TypeError:
+                # Mixed types: fall back to sorting the displayed text
+                order = values.astype(str).reset_index(drop=True).sort_values(
+                    ascending=self.sort_ascending, kind='stable').index.to_numpy()
+            positions = positions[order]
+
+        self.view = positions
+        self.first = 0
+        self.refresh()
+
+    # ----- sorting and filtering -----
+
+    def sort_by(self, column_id):
+        """Sort by a column; clicking the same heading again reverses the order"""
+        if self.sort_column == column_id:
+            self.sort_ascending = not self.sort_ascending
+        else:
+            self.sort_column = column_id
+            self.sort_ascending = True
+
+        for other in self.columns:
+            text = self.tree.heading(other, 'text').rstrip(' ▲▼')
+            if other == column_id:
+                text += ' ▲' if self.sort_ascending else ' ▼'
+            self.tree.heading(other, text=text)
+        self._apply_view()
+
+    def set_filter(self, text, column_id=ALL_COLUMNS):
+        """Keep rows whose column (or any column) contains text, case-insensitively"""
+        self.filter_text = text.strip()
+        self.filter_column = column_id if column_id in self.columns else ALL_COLUMNS
+        self._apply_view()
+
+    def build_filter_bar(self, parent):
+        """Filter entry + column picker; the caller places the returned frame"""
+        frame = ttk.Frame(parent)
+        ttk.Label(frame, text="Filter:").pack(side=tk.LEFT, padx=5)
+
+        filter_var = tk.StringVar()
+        entry = ttk.Entry(frame, textvariable=filter_var, width=30)
+        entry.pack(side=tk.LEFT, padx=5)
+
+        self._filter_column_var = tk.StringVar(value=ALL_COLUMNS)
+        self._filter_box = ttk.Combobox(frame, textvariable=self._filter_column_var,
+                                        values=[ALL_COLUMNS] + list(self.columns), state='readonly', width=20)
+        self._filter_box.pack(side=tk.LEFT, padx=5)
+
+        self.count_label = ttk.Label(frame, text="")
+        self.count_label.pack(side=tk.LEFT, padx=10)
+
+        apply_filter = lambda *args: self.set_filter(filter_var.get(), self._filter_column_var.get())
+        entry.bind('<KeyRelease>', apply_filter)
+        self._filter_box.bind('<<ComboboxSelected>>', apply_filter)
+        return frame
+
+    # ----- scrolling -----
+
+    def visible_rows(self):
+        """How many rows fit in the tree right now"""
+        row_height = ttk.Style().lookup('Treeview', 'rowheight') or DEFAULT_ROW_HEIGHT
+        height = self.tree.winfo_height()
+        if height <= 1:
+            height = int(self.tree.cget('height')) * int(row_height) + HEADER_HEIGHT
+        return max(1, (height - HEADER_HEIGHT) // int(row_height))
+
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'|'pages')"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self.first = int(float(args[1]) * len(self.view))
+            self.refresh()
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if args[2] == 'pages':
+                step *= self.visible_rows()
+            self._scroll_by(step)
+
+    def _scroll_by(self, rows):
+        self.first += rows
+        self.refresh()
+
+    def _on_mousewheel(self, event):
+        if getattr(event, 'num', None) == 4 or getattr(event, 'delta', 0) > 0:
+            self._scroll_by(-3)
+        else:
+            self._scroll_by(3)
+        return 'break'
+
+    # ----- drawing -----
+
+    def refresh(self):
+        """Fill the tree items with the rows of the current window"""
+        visible = self.visible_rows()
+        total = len(self.view)
+        self.first = max(0, min(self.first, total - visible))
+        window = self.view[self.first:self.first + visible]
+
+        # Reuse the existing items; only add or drop the difference
+        items = list(self.tree.get_children())
+        for item in items[len(window):]:
+            self.tree.delete(item)
+        for _ in range(len(window) - len(items)):
+            items.append(self.tree.insert('', tk.END))
+
+        rows = self.data.iloc[window]
+        cells = []
+        for column_id, col in self.columns.items():
+            formatter = self.formatters.get(column_id, format_cell)
+            cells.append([formatter(value) for value in rows[col].tolist()])
+        for item, values in zip(items, zip(*cells)):
+            self.tree.item(item, values=values)
+
+        if total:
+            self.v_scrollbar.set(self.first / total, min(1.0, (self.first + visible) / total))
+        else:
+            self.v_scrollbar.set(0, 1)
+        if self.count_label is not None:
+            self.count_label.config(text=f"{total:,} of {len(self.data):,} rows")
@@ -0,0 +1,133 @@
+# helpers/visualizations.py
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+except ImportError:  # optional - reports are saved without the dashboard
+    go = None
+
+from call_cube import rollup
+from lead_join import phone_keys
+
+DASHBOARD_NAME = 'dashboard.html'
+
+# Line traces switch to WebGL (Scattergl) above this many points in total
+WEBGL_POINTS = 1000
+
+# Daily points per employee before the calls chart rolls up to weeks, then months
+MAX_TRACE_POINTS = 400
+
+# Histograms are binned here and only the bin counts go into the HTML; values
+# above the CLIP_QUANTILE are counted in the last bin so outliers don't flatten the rest
+HISTOGRAM_BINS = 40
+CLIP_QUANTILE = 0.99
+
+# total_time_spent of a phone that was called but never talked to (MetricsCalculator._format_duration(0))
+NO_TALK_TIME = '0:00'
+
+
+def plotly_available():
+    return go is not None
+
+
+def binned(values, bins=HISTOGRAM_BINS, clip_quantile=CLIP_QUANTILE):
+    """(bin left edges, bin right edges, counts) of the finite values; the last bin also counts the outliers"""
+    values = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float)
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return np.empty(0), np.empty(0), np.empty(0, dtype=np.int64)
+    top = np.quantile(values, clip_quantile)
+    top = top if top > values.min() else values.min() + 1
+    counts, edges = np.histogram(np.minimum(values, top), bins=bins, range=(values.min(), top))
+    return edges[:-1], edges[1:], counts
+
+
+def calls_per_day(cube):
+    """(period, rollup by employee) of the cube - days, or weeks/months when an employee would get too many points"""
+    for period in ['day', 'week', 'month']:
+        daily = rollup(cube, by='employee', period=period)
+        daily = daily[daily['period'].notna()]
+        if period == 'month' or daily.empty or daily.groupby('employee').size().max() <= MAX_TRACE_POINTS:
+            return period, daily
+
+
+def contact_funnel(leads_df, updates_df=None, enriched_df=None):
+    """Lead counts at each step: all leads, called, talked to, followed up (phone in the updates)"""
+    stages = [('Leads', len(leads_df))]
+    if enriched_df is not None and 'call_match' in enriched_df.columns:
+        called = enriched_df['call_match'].notna()
+        stages.append(('Called', int(called.sum())))
+        if 'total_time_spent' in enriched_df.columns:
+            talked = called & enriched_df['total_time_spent'].notna() & (enriched_df['total_time_spent'] != NO_TALK_TIME)
+            stages.append(('Talked to', int(talked.sum())))
+    if updates_df is not None and not updates_df.empty and 'phone' in leads_df.columns and 'phone' in updates_df.columns:
+        updated = phone_keys(leads_df['phone']).isin(set(phone_keys(updates_df['phone']).dropna()))
+        stages.append(('Followed up', int(updated.sum())))
+    return pd.DataFrame(stages, columns=['stage', 'leads'])
+
+
+def _histogram_bars(values, name, unit):
+    left, right, counts = binned(values)
+    return go.Bar(
+        x=(left + right) / 2, y=counts, width=right - left, name=name, showlegend=False,
+        customdata=np.column_stack([left, right]) if len(left) else None,
+        hovertemplate=f"%{{customdata[0]:.1f}} - %{{customdata[1]:.1f}} {unit}: %{{y}}<extra></extra>",
+    )
+
+
+def build_dashboard(cube=None, call_analysis_df=None, leads_df=None, updates_df=None, enriched_df=None):
+    """Plotly figure with calls per employee per day, talk-time and gap histograms and the contact funnel
+
+    Every chart is drawn from aggregates - the call cube, the per-phone call
+    analysis binned into HISTOGRAM_BINS bars and funnel counts - so the size
+    of the figure doesn't grow with the number of calls.
+    """
+    period = 'day'
+    daily = None
+    if cube is not None and not cube.empty:
+        period, daily = calls_per_day(cube)
+    figure = make_subplots(rows=2, cols=2, vertical_spacing=0.14, subplot_titles=[
+        f"Calls per employee per {period}", "Average talk time per call (per phone)",
+        "Average gap between calls (per phone)", "Contact funnel",
+    ])
+
+    if daily is not None and len(daily):
+        scatter = go.Scattergl if len(daily) > WEBGL_POINTS else go.Scatter
+        for employee, calls in daily.groupby('employee', sort=True):
+            figure.add_trace(scatter(x=calls['period'], y=calls['calls'], mode='lines', name=str(employee),
+                                     legendgroup='employees'), row=1, col=1)
+
+    if call_analysis_df is not None and not call_analysis_df.empty:
+        if 'avg_time_per_call_seconds' in call_analysis_df.columns:
+            talk = call_analysis_df['avg_time_per_call_seconds']
+            figure.add_trace(_histogram_bars(talk[talk > 0], 'Talk time', 'seconds'), row=1, col=2)
+        if 'avg_gap_between_calls' in call_analysis_df.columns:
+            repeated = call_analysis_df['no_of_times_called'] >= 2
+            figure.add_trace(_histogram_bars(call_analysis_df.loc[repeated, 'avg_gap_between_calls'], 'Gap', 'days'), row=2, col=1)
+
+    if leads_df is not None and not leads_df.empty:
+        funnel = contact_funnel(leads_df, updates_df, enriched_df)
+        figure.add_trace(go.Funnel(y=funnel['stage'], x=funnel['leads'], textinfo='value+percent initial',
+                                   showlegend=False), row=2, col=2)
+
+    figure.update_xaxes(title_text='seconds', row=1, col=2)
+    figure.update_xaxes(title_text='days', row=2, col=1)
+    figure.update_yaxes(title_text='calls', row=1, col=1)
+    figure.update_yaxes(title_text='phones', row=1, col=2)
+    figure.update_yaxes(title_text='phones', row=2, col=1)
+    figure.update_layout(title_text='Lead analysis dashboard', height=900, bargap=0)
+    return figure
+
+
+def save_dashboard(output_folder, cube=None, call_analysis_df=None, leads_df=None, updates_df=None, enriched_df=None):
+    """Write build_dashboard as a self-contained offline HTML file; returns its path, None without plotly"""
+    if not plotly_available():
+        return None
+    figure = build_dashboard(cube, call_analysis_df, leads_df, updates_df, enriched_df)
+    path = os.path.join(output_folder, DASHBOARD_NAME)
+    figure.write_html(path, include_plotlyjs=True, full_html=True, config={'displaylogo': False})
+    return path
@@ -4,7 +4,15 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import os
 import glob
-import re
+import sys
+
+# Add helpers to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'helpers'))
+
+from phone_normalizer import normalize_phone, normalize_phone_series, COUNTRY_CODE_FORMAT
+from column_ops import coalesce_columns
+from column_roles import LEAD_COLUMNS
+from virtual_table import VirtualTable
 
 class LeadsProcessor:
     def __init__(self):
@@ -15,81 +23,13 @@ class LeadsProcessor:
         """Standardize phone number to start with 94 country code"""
         # Handle Series input properly
         if isinstance(phone_str, pd.Series):
-            return phone_str.apply(self.standardize_phone_number)
-        
-        # Handle individual values
-        if pd.isna(phone_str) or str(phone_str).strip() == '':
-            return phone_str
-            
-        # Convert to string and remove all non-digit characters using regex
-        clean_number = re.sub(r'\D', '', str(phone_str))
-        
-        # Remove trailing zeros
-        clean_number = clean_number.rstrip('0')
+            return normalize_phone_series(phone_str, COUNTRY_CODE_FORMAT)
         
-        # If number is empty after cleaning, return as is
-        if not clean_number:
-            return phone_str
-            
-        # Standardize to 94 country code
-        if clean_number.startswith('94'):
-            # Already starts with 94, ensure proper length
-            if len(clean_number) >= 9:  # 94 + 7 digits minimum
-                return clean_number
-            else:
-                return phone_str  # Return original if too short
-        elif len(clean_number) == 9:
-            # 9-digit number without country code, add 94
-            return '94' + clean_number
-        elif len(clean_number) == 10 and clean_number.startswith('0'):
-            # 10-digit number starting with 0, replace 0 with 94
-            return '94' + clean_number[1:]
-        elif len(clean_number) == 7:
-            # 7-digit local number, add 94
-            return '94' + clean_number
-        else:
-            # For other formats, try to make it start with 94
-            if len(clean_number) > 9:
-                # If longer than 9 digits, assume it includes country code but not 94
-                # Try to extract last 9 digits and add 94
-                last_9_digits = clean_number[-9:]
-                return '94' + last_9_digits
-            else:
-                return '94' + clean_number  # Default: add 94 prefix
+        return normalize_phone(phone_str, COUNTRY_CODE_FORMAT)
     
     def identify_column_type(self, column_name):
-        """Identify what type of column this is based on name patterns"""
-        col_lower = str(column_name).lower()
-        
-        # Name patterns
-        name_patterns = ['name', 'full name', 'fullname', 'first name', 'contact name', 'person']
-        if any(pattern in col_lower for pattern in name_patterns):
-            return 'Name'
-        
-        # Phone patterns
-        phone_patterns = ['phone', 'number', 'phone number', 'contact', 'tel', 'telephone', 'mobile']
-        if any(pattern in col_lower for pattern in phone_patterns):
-            return 'Phone'
-        
-        # Email patterns
-        email_patterns = ['email', 'e-mail', 'mail', 'gmail']
-        if any(pattern in col_lower for pattern in email_patterns):
-            return 'Email'
-        
-        # City patterns
-        city_patterns = ['city', 'town', 'location', 'area', 'district']
-        if any(pattern in col_lower for pattern in city_patterns):
-            return 'City'
-        
-        # Update patterns
-        update_patterns = [
-            'update', 'followup', 'follow up', 'status', 'remark', 'comment', 'note',
-            'call', 'follow', 'weekend'
-        ]
-        if any(pattern in col_lower for pattern in update_patterns):
-            return 'Update'
-        
-        return 'Other'
+        """Identify what type of column this is based on name patterns (column_roles.LEAD_COLUMNS)"""
+        return LEAD_COLUMNS.role(column_name, 'Other')
     
     def load_files_from_folder(self, folder_path):
         """Load and merge all leads files from a folder"""
@@ -173,16 +113,7 @@ class LeadsProcessor:
                     # For main columns, combine all similar columns
                     if columns:
                         # Create combined column (take first non-null value from any of the source columns)
-                        combined_values = []
-                        for idx in range(len(self.df)):
-                            value = ''
-                            for col in columns:
-                                if pd.notna(self.df.iloc[idx][col]) and str(self.df.iloc[idx][col]).strip() != '':
-                                    value = str(self.df.iloc[idx][col]).strip()
-                                    break
-                            combined_values.append(value)
-                        
-                        standard_columns[col_type] = combined_values
+                        standard_columns[col_type] = coalesce_columns(self.df, columns)
                 elif col_type == 'Update':
                     # For update columns, we'll merge them later
                     standard_columns['Update_Columns'] = columns
@@ -218,7 +149,7 @@ class LeadsProcessor:
             
             # STEP 4: Standardize phone numbers
             if 'Phone' in self.df.columns:
-                self.df['Phone'] = self.df['Phone'].apply(self.standardize_phone_number)
+                self.df['Phone'] = normalize_phone_series(self.df['Phone'], COUNTRY_CODE_FORMAT)
             
             # STEP 5: Merge update columns
             update_columns = [col for col in self.df.columns if self.identify_column_type(col) == 'Update']
@@ -333,6 +264,10 @@ class LeadsApp:
         v_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         h_scrollbar.grid(row=1, column=0, sticky=(tk.W, tk.E))
         
+        # Virtualized rows with sorting (click a heading) and filtering
+        self.table = VirtualTable(self.tree, v_scrollbar)
+        self.table.build_filter_bar(results_frame).grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        
         # Save button
         ttk.Button(main_frame, text="Save Results", 
                  command=self.save_results).grid(row=3, column=0, pady=10)
@@ -374,30 +309,8 @@ class LeadsApp:
     
     def display_results(self, results):
         """Display results in the treeview"""
-        # Clear existing data
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Clear existing columns
-        for col in self.tree["columns"]:
-            self.tree.heading(col, text="")
-        
-        # Configure treeview columns based on data
-        self.tree["columns"] = list(results.columns)
-        for col in results.columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=150, minwidth=100)
-        
-        # Add data to treeview
-        for _, row in results.iterrows():
-            values = []
-            for col in results.columns:
-                value = row[col]
-                if pd.isna(value) or value == '':
-                    values.append('')
-                else:
-                    values.append(str(value))
-            self.tree.insert('', tk.END, values=values)
+        # Only the visible window of rows is materialized in the tree; columns follow the data
+        self.table.set_data(results)
     
     def save_results(self):
         """Save processed results to file"""
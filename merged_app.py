@@ -5,90 +5,61 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import os
 import glob
-import re
+import sys
+
+# Add helpers to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'helpers'))
+
+from phone_normalizer import normalize_phone, normalize_phone_series, COUNTRY_CODE_FORMAT
+from column_ops import coalesce_columns
+from column_roles import LEAD_COLUMNS
+from output_writers import DEFAULT_FORMAT, TEXT_FORMATS, format_for_path, output_formats, output_path, write_frame
+from background_task import BackgroundTask, poll_events
+from virtual_table import VirtualTable, format_datetime
+from duration_parser import parse_durations, unparseable_durations
+from lead_resolution import resolve_leads
+from call_log_stream import CallAggregates, DEFAULT_CHUNK_ROWS, SeenRows, csv_columns, read_csv_chunks, row_hashes
+from call_gaps import NS_PER_HOUR, phone_call_records
+from schema import UNIFIED_CALL_LOGS_SCHEMA, UNIFIED_LEADS_SCHEMA, apply_schema, describe_saving
+
+# Call log CSVs adding up to more than this are streamed in chunks instead of loaded whole
+STREAM_THRESHOLD_BYTES = 256 * 1024 * 1024
+
+# 'All Dates and Times' of streamed call logs, which keep per-phone totals instead of every call
+NOT_STREAMED = 'Not kept when call logs are streamed'
 
 class UnifiedProcessor:
-    def __init__(self):
+    def __init__(self, call_log_chunk_rows=None):
+        self.call_log_chunk_rows = call_log_chunk_rows  # rows per chunk to always stream call logs, None = only above STREAM_THRESHOLD_BYTES
         self.call_logs_df = None
         self.leads_df = None
         self.processed_call_logs = None
         self.processed_leads = None
+        self.progress_callback = None  # progress(stage, file, done, total, rows) from a background runner
+    
+    def _report_progress(self, stage, file=None, done=0, total=0, rows=None):
+        """Forward a progress event when running under a background runner"""
+        if self.progress_callback is not None:
+            self.progress_callback(stage, file, done, total, rows)
         
     # ===== CALL LOGS PROCESSING METHODS =====
     
     def standardize_phone_number(self, phone_str):
         """Standardize phone number to start with 94 country code"""
-        if pd.isna(phone_str) or phone_str == '':
-            return phone_str
-            
-        # Convert to string and remove all non-digit characters using regex
-        clean_number = re.sub(r'\D', '', str(phone_str))
-        
-        # Remove trailing zeros
-        clean_number = clean_number.rstrip('0')
-        
-        # If number is empty after cleaning, return as is
-        if not clean_number:
-            return phone_str
-            
-        # Standardize to 94 country code
-        if clean_number.startswith('94'):
-            # Already starts with 94, ensure proper length
-            if len(clean_number) >= 9:  # 94 + 7 digits minimum
-                return clean_number
-            else:
-                return phone_str  # Return original if too short
-        elif len(clean_number) == 9:
-            # 9-digit number without country code, add 94
-            return '94' + clean_number
-        elif len(clean_number) == 10 and clean_number.startswith('0'):
-            # 10-digit number starting with 0, replace 0 with 94
-            return '94' + clean_number[1:]
-        elif len(clean_number) == 7:
-            # 7-digit local number, add 94
-            return '94' + clean_number
-        else:
-            # For other formats, try to make it start with 94
-            if len(clean_number) > 9:
-                # If longer than 9 digits, assume it includes country code but not 94
-                # Try to extract last 9 digits and add 94
-                last_9_digits = clean_number[-9:]
-                return '94' + last_9_digits
-            else:
-                return '94' + clean_number  # Default: add 94 prefix
+        return normalize_phone(phone_str, COUNTRY_CODE_FORMAT)
 
     def parse_duration(self, duration_str):
-        """Convert duration string to total seconds"""
-        try:
-            if pd.isna(duration_str) or duration_str == '':
-                return 0
-            
-            # Handle different duration formats
-            if 'h' in duration_str and 'm' in duration_str and 's' in duration_str:
-                # Format: "00h 00m 00s"
-                parts = duration_str.split()
-                hours = int(parts[0].replace('h', '')) if len(parts) > 0 else 0
-                minutes = int(parts[1].replace('m', '')) if len(parts) > 1 else 0
-                seconds = int(parts[2].replace('s', '')) if len(parts) > 2 else 0
-                return hours * 3600 + minutes * 60 + seconds
-            else:
-                return 0
-        except:
-            return 0
-
-    def calculate_time_gaps(self, dates):
-        """Calculate average gap between consecutive calls"""
-        if len(dates) <= 1:
-            return 0
-        
-        dates_sorted = sorted(dates)
-        gaps = []
-        
-        for i in range(1, len(dates_sorted)):
-            gap = (dates_sorted[i] - dates_sorted[i-1]).total_seconds() / 3600  # Gap in hours
-            gaps.append(gap)
-        
-        return np.mean(gaps) if gaps else 0
+        """Convert duration string to total seconds (0 if missing or unparseable)"""
+        return int(self.parse_duration_column(pd.Series([duration_str], dtype=object), report=False).iloc[0])
+    
+    def parse_duration_column(self, durations, report=True):
+        """Whole seconds for a Duration column; missing and unparseable cells count as 0"""
+        seconds = parse_durations(durations)
+        if report:
+            unparseable = int(unparseable_durations(durations, seconds).sum())
+            if unparseable:
+                print(f"⚠️ {unparseable} durations could not be parsed and count as 0 seconds")
+        return seconds.fillna(0).round().astype(np.int64)
 
     def process_call_logs(self, folder_path):
         """Process call log files from folder"""
@@ -99,10 +70,18 @@ class UnifiedProcessor:
             if not csv_files:
                 return False, "No CSV files found for call logs"
             
+            # Oversized exports are folded into per-phone aggregates chunk by chunk
+            chunk_rows = self.call_log_chunk_rows
+            if chunk_rows is None and sum(os.path.getsize(file_path) for file_path in csv_files) > STREAM_THRESHOLD_BYTES:
+                chunk_rows = DEFAULT_CHUNK_ROWS
+            if chunk_rows:
+                return self._process_call_logs_streaming(csv_files, chunk_rows)
+            
             # List to store all dataframes
             all_dfs = []
             
-            for file_path in csv_files:
+            for position, file_path in enumerate(csv_files):
+                self._report_progress('call_logs', file_path, position, len(csv_files))
                 try:
                     # Read each CSV file
                     df = pd.read_csv(file_path)
@@ -127,14 +106,14 @@ class UnifiedProcessor:
             self.call_logs_df['Date Time'] = pd.to_datetime(self.call_logs_df['Date Time'], errors='coerce')
             
             # Clean and standardize phone numbers
-            self.call_logs_df['To Number'] = self.call_logs_df['To Number'].apply(self.standardize_phone_number)
+            self.call_logs_df['To Number'] = normalize_phone_series(self.call_logs_df['To Number'], COUNTRY_CODE_FORMAT)
             
             # Remove scientific notation numbers and invalid phone numbers
             self.call_logs_df = self.call_logs_df[~self.call_logs_df['To Number'].str.contains('E', na=False)]
             self.call_logs_df = self.call_logs_df[self.call_logs_df['To Number'].str.len() >= 9]  # Minimum 9 digits (94 + 7)
             
             # Convert Duration to seconds
-            self.call_logs_df['Duration_Seconds'] = self.call_logs_df['Duration'].apply(self.parse_duration)
+            self.call_logs_df['Duration_Seconds'] = self.parse_duration_column(self.call_logs_df['Duration'])
             
             # Remove duplicates
             initial_count = len(self.call_logs_df)
@@ -142,92 +121,104 @@ class UnifiedProcessor:
             duplicates_removed = initial_count - len(self.call_logs_df)
             print(f"Removed {duplicates_removed} exact duplicate call records")
             
-            # Process the call data
-            records = []
+            # Repeated numbers, dates and call types as categories
+            self.call_logs_df, before, after = apply_schema(self.call_logs_df, UNIFIED_CALL_LOGS_SCHEMA)
+            print(describe_saving("Call logs", before, after))
             
-            # Group by phone number
-            for phone_number, group in self.call_logs_df.groupby('To Number'):
-                total_calls = len(group)
-                total_duration = group['Duration_Seconds'].sum()
-                call_dates = group['Date Time'].tolist()
-                call_times = group['Time'].tolist()
-                
-                # Calculate metrics
-                avg_gap_hours = self.calculate_time_gaps(call_dates)
-                first_call = min(call_dates) if call_dates else None
-                last_call = max(call_dates) if call_dates else None
-                
-                # Get name (most frequent one)
-                names = group['Name'].value_counts()
-                most_common_name = names.index[0] if len(names) > 0 else 'Unknown'
-                
-                # Format date-time called column - ALL dates and times
-                date_time_called = []
-                for date, time in zip(call_dates, call_times):
-                    if pd.notna(date):
-                        date_str = date.strftime('%Y-%m-%d')
-                        date_time_called.append(f"{date_str} {time}")
-                    else:
-                        date_time_called.append(f"Unknown Date {time}")
-                
-                # Join all dates and times with comma separation
-                all_dates_times = ', '.join(date_time_called)
-                
-                records.append({
-                    'Phone Number': phone_number,
-                    'Name': most_common_name,
-                    'Total Calls': total_calls,
-                    'Total Duration (seconds)': total_duration,
-                    'Total Duration (HH:MM:SS)': str(timedelta(seconds=int(total_duration))),
-                    'First Call Date': first_call,
-                    'Last Call Date': last_call,
-                    'Avg Gap (hours)': round(avg_gap_hours, 2),
-                    'All Dates and Times': all_dates_times,  # All dates and times in one column
-                    'Call Dates': call_dates,
-                    'Call Times': call_times
-                })
-            
-            self.processed_call_logs = pd.DataFrame(records)
+            # One record per phone, all phones at once: one sort by (phone, time) instead of a loop per phone
+            phone_count = self.call_logs_df['To Number'].nunique()
+            self._report_progress('call_records', None, 0, phone_count, len(self.call_logs_df))
+            self.processed_call_logs = phone_call_records(self.call_logs_df)
+            self._report_progress('call_records', None, phone_count, phone_count, len(self.call_logs_df))
             return True, f"Processed {len(csv_files)} call log files, {len(self.processed_call_logs)} unique numbers, removed {duplicates_removed} duplicates"
             
         except Exception as e:
             return False, f"Error processing call logs: {str(e)}"
+    
+    def _process_call_logs_streaming(self, csv_files, chunk_rows):
+        """process_call_logs in bounded memory: read chunk_rows rows at a time into running per-phone totals
+        
+        Exact duplicates are dropped across all chunks and files through a hash
+        per row (SeenRows), so counts and durations match the in-memory path.
+        Only per-phone aggregates are kept, so 'All Dates and Times' holds
+        NOT_STREAMED and 'Median Gap (hours)' is left empty.
+        """
+        print(f"Streaming call logs in chunks of {chunk_rows:,} rows")
+        aggregates = CallAggregates()
+        seen_rows = SeenRows()
+        columns = csv_columns(csv_files)
+        loaded_files = 0
+        duplicates_removed = 0
+        
+        for position, file_path in enumerate(csv_files):
+            self._report_progress('call_logs', file_path, position, len(csv_files), aggregates.rows)
+            try:
+                for chunk in read_csv_chunks(file_path, chunk_rows):
+                    # Same cleaning as the in-memory path, one chunk at a time
+                    chunk = chunk.dropna(subset=['To Number'])
+                    chunk['To Number'] = normalize_phone_series(chunk['To Number'], COUNTRY_CODE_FORMAT)
+                    chunk = chunk[~chunk['To Number'].str.contains('E', na=False)]
+                    chunk = chunk[chunk['To Number'].str.len() >= 9]
+                    chunk['Date Time'] = pd.to_datetime(chunk['Date Time'], errors='coerce')
+                    
+                    # Duplicates of rows in earlier chunks and files count too
+                    first_seen = seen_rows.first_seen(row_hashes(chunk, columns))
+                    duplicates_removed += int((~first_seen).sum())
+                    chunk = chunk[first_seen]
+                    
+                    aggregates.add(
+                        chunk['To Number'],
+                        chunk['Date Time'],
+                        self.parse_duration_column(chunk['Duration']).to_numpy(),
+                        chunk['Name'],
+                    )
+                    self._report_progress('call_logs', file_path, position, len(csv_files), aggregates.rows)
+                loaded_files += 1
+                print(f"Streamed call log file: {os.path.basename(file_path)} ({aggregates.rows} records so far)")
+            except Exception as e:
+                print(f"Error loading file {os.path.basename(file_path)}: {str(e)}")
+                continue
+        
+        if not loaded_files:
+            return False, "No valid call log files could be loaded"
+        
+        summary = aggregates.result().sort_index()
+        # Names and the average gap the way call_gaps.phone_call_records works them out
+        names = aggregates.most_common_names(first_seen=True).reindex(summary.index)
+        first = summary['first_call'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        last = summary['last_call'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        dated_calls = summary['dated_calls'].to_numpy()
+        avg_gap = np.where(dated_calls > 1, (last - first) / NS_PER_HOUR / np.maximum(dated_calls - 1, 1), np.nan)
+        
+        self.call_logs_df = None
+        self.processed_call_logs = pd.DataFrame({
+            'Phone Number': summary.index.to_numpy(),
+            'Name': names.fillna('Unknown').to_numpy(),
+            'Total Calls': summary['calls'].to_numpy(),
+            'Total Duration (seconds)': summary['seconds'].astype(np.int64).to_numpy(),
+            'Total Duration (HH:MM:SS)': [str(timedelta(seconds=int(total))) for total in summary['seconds']],
+            'First Call Date': summary['first_call'].to_numpy(),
+            'Last Call Date': summary['last_call'].to_numpy(),
+            'Avg Gap (hours)': pd.Series(avg_gap).fillna(0).round(2).to_numpy(),
+            'Min Gap (hours)': (summary['min_gap'] / 3600).round(2).to_numpy(),
+            'Max Gap (hours)': (summary['max_gap'] / 3600).round(2).to_numpy(),
+            'Median Gap (hours)': np.nan,
+            'All Dates and Times': NOT_STREAMED,
+        })
+        message = (f"Streamed {loaded_files} call log files ({aggregates.rows} records), "
+                   f"{len(self.processed_call_logs)} unique numbers, removed {duplicates_removed} duplicates. "
+                   f"Streamed call logs have no 'Median Gap (hours)' or 'All Dates and Times' (inputs over "
+                   f"{STREAM_THRESHOLD_BYTES // (1024 * 1024)} MB are streamed)")
+        out_of_order = int((~summary['gaps_exact']).sum())
+        if out_of_order:
+            message += f"; Min/Max Gap are approximate for {out_of_order} numbers whose calls were not in time order"
+        return True, message
 
     # ===== LEADS PROCESSING METHODS =====
 
     def identify_column_type(self, column_name):
-        """Identify what type of column this is based on name patterns"""
-        col_lower = str(column_name).lower()
-        
-        # Name patterns
-        name_patterns = ['name', 'full name', 'fullname', 'first name', 'contact name', 'person']
-        if any(pattern in col_lower for pattern in name_patterns):
-            return 'Name'
-        
-        # Phone patterns
-        phone_patterns = ['phone', 'number', 'phone number', 'contact', 'tel', 'telephone', 'mobile']
-        if any(pattern in col_lower for pattern in phone_patterns):
-            return 'Phone'
-        
-        # Email patterns
-        email_patterns = ['email', 'e-mail', 'mail', 'gmail']
-        if any(pattern in col_lower for pattern in email_patterns):
-            return 'Email'
-        
-        # City patterns
-        city_patterns = ['city', 'town', 'location', 'area', 'district']
-        if any(pattern in col_lower for pattern in city_patterns):
-            return 'City'
-        
-        # Update patterns
-        update_patterns = [
-            'update', 'followup', 'follow up', 'status', 'remark', 'comment', 'note',
-            'call', 'follow', 'weekend'
-        ]
-        if any(pattern in col_lower for pattern in update_patterns):
-            return 'Update'
-        
-        return 'Other'
+        """Identify what type of column this is based on name patterns (column_roles.LEAD_COLUMNS)"""
+        return LEAD_COLUMNS.role(column_name, 'Other')
 
     def process_leads(self, folder_path):
         """Process leads files from folder"""
@@ -258,7 +249,8 @@ class UnifiedProcessor:
             # List to store all dataframes
             all_dfs = []
             
-            for file_path in leads_files:
+            for position, file_path in enumerate(leads_files):
+                self._report_progress('leads', file_path, position, len(leads_files))
                 try:
                     # Determine file type and read accordingly
                     file_ext = os.path.splitext(file_path)[1].lower()
@@ -306,16 +298,7 @@ class UnifiedProcessor:
                     # For main columns, combine all similar columns
                     if columns:
                         # Create combined column (take first non-null value from any of the source columns)
-                        combined_values = []
-                        for idx in range(len(self.leads_df)):
-                            value = ''
-                            for col in columns:
-                                if pd.notna(self.leads_df.iloc[idx][col]) and str(self.leads_df.iloc[idx][col]).strip() != '':
-                                    value = str(self.leads_df.iloc[idx][col]).strip()
-                                    break
-                            combined_values.append(value)
-                        
-                        standard_columns[col_type] = combined_values
+                        standard_columns[col_type] = coalesce_columns(self.leads_df, columns)
                 elif col_type == 'Update':
                     # For update columns, we'll merge them later
                     standard_columns['Update_Columns'] = columns
@@ -351,7 +334,7 @@ class UnifiedProcessor:
             
             # STEP 4: Standardize phone numbers
             if 'Phone' in self.leads_df.columns:
-                self.leads_df['Phone'] = self.leads_df['Phone'].apply(self.standardize_phone_number)
+                self.leads_df['Phone'] = normalize_phone_series(self.leads_df['Phone'], COUNTRY_CODE_FORMAT)
             
             # STEP 5: Merge update columns
             update_columns = [col for col in self.leads_df.columns if self.identify_column_type(col) == 'Update']
@@ -388,6 +371,13 @@ class UnifiedProcessor:
             # STEP 8: Fill NaN values with empty strings for cleaner display
             self.leads_df = self.leads_df.fillna('')
             
+            # STEP 9: Group leads that are the same person (spelling variants, missing emails)
+            self.leads_df = resolve_leads(self.leads_df, 'Name', 'Phone', 'Email', 'City').rename(columns={'cluster_id': 'Cluster ID'})
+            print(f"Found {len(self.leads_df) - self.leads_df['Cluster ID'].nunique()} likely duplicate leads records ({self.leads_df['Cluster ID'].nunique()} people)")
+            
+            self.leads_df, before, after = apply_schema(self.leads_df, UNIFIED_LEADS_SCHEMA)
+            print(describe_saving("Leads", before, after))
+            
             self.processed_leads = self.leads_df.copy()
             
             return True, f"Processed {len(leads_files)} leads files, {len(self.processed_leads)} records, removed {duplicates_removed} duplicates"
@@ -418,8 +408,8 @@ class UnifiedProcessor:
 
     # ===== AUTO-SAVE METHODS =====
 
-    def auto_save_results(self, base_folder_path):
-        """Automatically save both files to timestamped folder"""
+    def auto_save_results(self, base_folder_path, output_format=DEFAULT_FORMAT):
+        """Automatically save both files to timestamped folder (Excel only when output_format='excel')"""
         try:
             # Create timestamp for folder name
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -433,7 +423,7 @@ class UnifiedProcessor:
             
             # Save call logs if available
             if self.processed_call_logs is not None:
-                call_logs_path = os.path.join(output_folder_path, "Processed_Call_Logs.xlsx")
+                call_logs_path = output_path(output_folder_path, "Processed_Call_Logs", output_format)
                 success, message = self.save_call_logs(call_logs_path)
                 if success:
                     saved_files.append(f"✓ Call Logs: {os.path.basename(call_logs_path)}")
@@ -442,7 +432,7 @@ class UnifiedProcessor:
             
             # Save leads if available
             if self.processed_leads is not None:
-                leads_path = os.path.join(output_folder_path, "Processed_Leads.xlsx")
+                leads_path = output_path(output_folder_path, "Processed_Leads", output_format)
                 success, message = self.save_leads(leads_path)
                 if success:
                     saved_files.append(f"✓ Leads: {os.path.basename(leads_path)}")
@@ -455,32 +445,33 @@ class UnifiedProcessor:
             return False, "", [f"Error creating output folder: {str(e)}"]
 
     def save_call_logs(self, file_path):
-        """Save processed call logs to Excel file"""
+        """Save processed call logs; the format follows the file extension"""
         if self.processed_call_logs is None:
             return False, "No processed call logs data to save"
         
         try:
             # Create export version - KEEP the 'All Dates and Times' column
             export_df = self.processed_call_logs.copy()
-            export_df = export_df.drop(['Call Dates', 'Call Times'], axis=1)
             
-            # Format dates
-            export_df['First Call Date'] = export_df['First Call Date'].dt.strftime('%Y-%m-%d %H:%M:%S')
-            export_df['Last Call Date'] = export_df['Last Call Date'].dt.strftime('%Y-%m-%d %H:%M:%S')
+            # Format dates for text outputs; Parquet/Feather keep them as datetimes
+            output_format = format_for_path(file_path)
+            if output_format in TEXT_FORMATS:
+                export_df['First Call Date'] = export_df['First Call Date'].dt.strftime('%Y-%m-%d %H:%M:%S')
+                export_df['Last Call Date'] = export_df['Last Call Date'].dt.strftime('%Y-%m-%d %H:%M:%S')
             
-            export_df.to_excel(file_path, index=False)
+            write_frame(export_df, file_path, output_format)
             return True, f"Call logs saved to {file_path}"
             
         except Exception as e:
             return False, f"Error saving call logs file: {str(e)}"
 
     def save_leads(self, file_path):
-        """Save processed leads to Excel file"""
+        """Save processed leads; the format follows the file extension"""
         if self.processed_leads is None:
             return False, "No processed leads data to save"
         
         try:
-            self.processed_leads.to_excel(file_path, index=False)
+            write_frame(self.processed_leads, file_path)
             return True, f"Leads saved to {file_path}"
             
         except Exception as e:
@@ -493,6 +484,7 @@ class UnifiedApp:
         self.root.geometry("1200x800")
         
         self.processor = UnifiedProcessor()
+        self.task = None
         
         self.setup_ui()
     
@@ -520,8 +512,17 @@ class UnifiedApp:
         self.file_label.grid(row=0, column=1, padx=5)
         
         # Process button
-        ttk.Button(main_frame, text="Process All Files & Auto-Save", 
-                 command=self.process_files).grid(row=3, column=0, pady=10)
+        self.process_button = ttk.Button(main_frame, text="Process All Files & Auto-Save", 
+                                         command=self.process_files)
+        self.process_button.grid(row=3, column=0, pady=10)
+        
+        # Output format (Excel is slow to write, so it is only produced when chosen here)
+        format_frame = ttk.Frame(main_frame)
+        format_frame.grid(row=3, column=1, pady=10, sticky=tk.W)
+        ttk.Label(format_frame, text="Save as:").pack(side=tk.LEFT, padx=5)
+        self.output_format = tk.StringVar(value=DEFAULT_FORMAT)
+        ttk.Combobox(format_frame, textvariable=self.output_format, values=output_formats(),
+                     state="readonly", width=10).pack(side=tk.LEFT)
         
         # Results frame with notebook for tabs
         self.notebook = ttk.Notebook(main_frame)
@@ -547,6 +548,17 @@ class UnifiedApp:
         self.output_label = ttk.Label(main_frame, text="", foreground="green", font=("Arial", 9))
         self.output_label.grid(row=6, column=0, columnspan=2, pady=2)
         
+        # Progress bar and cancel button for the background run
+        progress_frame = ttk.Frame(main_frame)
+        progress_frame.grid(row=7, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+        progress_frame.columnconfigure(0, weight=1)
+        
+        self.progress = ttk.Progressbar(progress_frame, mode='determinate', maximum=100)
+        self.progress.grid(row=0, column=0, sticky=(tk.W, tk.E), padx=5)
+        
+        self.cancel_button = ttk.Button(progress_frame, text="Cancel", command=self.cancel_processing, state=tk.DISABLED)
+        self.cancel_button.grid(row=0, column=1, padx=5)
+        
         # Configure grid weights
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
@@ -583,6 +595,10 @@ class UnifiedApp:
         self.call_logs_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         
+        # Virtualized rows with sorting (click a heading) and filtering
+        self.call_logs_table = VirtualTable(self.call_logs_tree, scrollbar)
+        self.call_logs_table.build_filter_bar(self.call_logs_frame).grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        
         self.call_logs_frame.columnconfigure(0, weight=1)
         self.call_logs_frame.rowconfigure(0, weight=1)
     
@@ -601,6 +617,10 @@ class UnifiedApp:
         v_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         h_scrollbar.grid(row=1, column=0, sticky=(tk.W, tk.E))
         
+        # Virtualized rows with sorting (click a heading) and filtering
+        self.leads_table = VirtualTable(self.leads_tree, v_scrollbar)
+        self.leads_table.build_filter_bar(self.leads_frame).grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        
         self.leads_frame.columnconfigure(0, weight=1)
         self.leads_frame.rowconfigure(0, weight=1)
     
@@ -622,19 +642,83 @@ class UnifiedApp:
             messagebox.showwarning("Warning", "Please select a folder first")
             return
         
+        if self.task is not None and self.task.is_running():
+            return
+        
         self.status_label.config(text="Processing files...", foreground="orange")
         self.output_label.config(text="")
-        self.root.update()
+        self.progress['value'] = 0
+        self.process_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
         
-        # Process both call logs and leads
-        success, message = self.processor.process_all_files(self.current_folder)
+        # Processing runs on a worker thread; progress comes back as events polled with after()
+        self.task = BackgroundTask(self.run_processing, self.current_folder, self.output_format.get()).start()
+        poll_events(self.root, self.task, self.handle_task_event)
+    
+    def run_processing(self, reporter, folder_path, output_format):
+        """Worker thread: process and auto-save - must not touch Tk widgets"""
+        self.processor.progress_callback = reporter.progress
+        try:
+            # Process both call logs and leads
+            success, message = self.processor.process_all_files(folder_path)
+            if not success:
+                return success, message, None
+            
+            # Auto-save results to timestamped folder - the last cancellation point, saving runs to the end
+            reporter.progress('saving', done=0, total=1)
+            return success, message, self.processor.auto_save_results(folder_path, output_format)
+        finally:
+            self.processor.progress_callback = None
+    
+    def cancel_processing(self):
+        if self.task is not None and self.task.is_running():
+            self.task.cancel()
+            self.cancel_button.config(state=tk.DISABLED)
+            self.status_label.config(text="Cancelling...", foreground="orange")
+    
+    def handle_task_event(self, event):
+        """Tk thread: apply one event from the worker"""
+        kind = event['kind']
+        
+        if kind == 'progress':
+            self.show_progress(event)
+            if event['stage'] == 'saving':
+                # Saving can't be interrupted
+                self.cancel_button.config(state=tk.DISABLED)
+            return
+        if kind == 'log':
+            return
+        
+        self.process_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
         
+        if kind == 'cancelled':
+            self.progress['value'] = 0
+            self.status_label.config(text="Processing cancelled", foreground="red")
+        elif kind == 'error':
+            self.progress['value'] = 0
+            self.status_label.config(text="Processing failed", foreground="red")
+            messagebox.showerror("Processing Error", str(event['error']))
+        else:
+            self.progress['value'] = 100
+            self.show_processing_result(*event['result'])
+    
+    def show_progress(self, event):
+        """Determinate bar: each stage owns a slice of the bar, filled by done/total"""
+        stages = ['call_logs', 'call_records', 'leads', 'saving']
+        position = stages.index(event['stage']) if event['stage'] in stages else 0
+        fraction = event['done'] / event['total'] if event['total'] else 0
+        self.progress['value'] = 100 * (position + fraction) / len(stages)
+        
+        text = f"{event['stage'].replace('_', ' ').title()}: {event['done']}/{event['total']}"
+        if event['file']:
+            text += f" - {os.path.basename(event['file'])}"
+        self.status_label.config(text=text, foreground="orange")
+    
+    def show_processing_result(self, success, message, auto_save):
+        """Show the outcome of a finished run"""
         if success:
-            self.status_label.config(text="Processing completed! Auto-saving files...", foreground="orange")
-            self.root.update()
-            
-            # Auto-save results to timestamped folder
-            auto_save_success, output_folder_path, saved_files = self.processor.auto_save_results(self.current_folder)
+            auto_save_success, output_folder_path, saved_files = auto_save
             
             if auto_save_success:
                 self.status_label.config(text="Processing and Auto-Save completed successfully!", foreground="green")
@@ -664,48 +748,25 @@ class UnifiedApp:
     
     def display_call_logs_results(self, results):
         """Display call logs results in the treeview"""
-        # Clear existing data
-        for item in self.call_logs_tree.get_children():
-            self.call_logs_tree.delete(item)
-        
-        # Add new data
-        for _, row in results.iterrows():
-            self.call_logs_tree.insert('', tk.END, values=(
-                row['Phone Number'],
-                row['Name'],
-                row['Total Calls'],
-                row['Total Duration (HH:MM:SS)'],
-                row['First Call Date'].strftime('%Y-%m-%d %H:%M') if pd.notna(row['First Call Date']) else 'N/A',
-                row['Last Call Date'].strftime('%Y-%m-%d %H:%M') if pd.notna(row['Last Call Date']) else 'N/A',
-                row['Avg Gap (hours)']
-            ))
+        # Only the visible window of rows is materialized in the tree
+        self.call_logs_table.set_data(
+            results,
+            columns={
+                'Phone': 'Phone Number',
+                'Name': 'Name',
+                'Total Calls': 'Total Calls',
+                'Total Duration': 'Total Duration (HH:MM:SS)',
+                'First Call': 'First Call Date',
+                'Last Call': 'Last Call Date',
+                'Avg Gap': 'Avg Gap (hours)'
+            },
+            formatters={'First Call': format_datetime, 'Last Call': format_datetime}
+        )
     
     def display_leads_results(self, results):
         """Display leads results in the treeview"""
-        # Clear existing data
-        for item in self.leads_tree.get_children():
-            self.leads_tree.delete(item)
-        
-        # Clear existing columns
-        for col in self.leads_tree["columns"]:
-            self.leads_tree.heading(col, text="")
-        
-        # Configure treeview columns based on data
-        self.leads_tree["columns"] = list(results.columns)
-        for col in results.columns:
-            self.leads_tree.heading(col, text=col)
-            self.leads_tree.column(col, width=150, minwidth=100)
-        
-        # Add data to treeview
-        for _, row in results.iterrows():
-            values = []
-            for col in results.columns:
-                value = row[col]
-                if pd.isna(value) or value == '':
-                    values.append('')
-                else:
-                    values.append(str(value))
-            self.leads_tree.insert('', tk.END, values=values)
+        # Only the visible window of rows is materialized in the tree; columns follow the data
+        self.leads_table.set_data(results)
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,42 @@
+# tests/test_call_log_columns.py
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'helpers'))
+
+from metric_calculator import MetricsCalculator
+
+REPORT = 'Report 2025-01-01 00_00_00 to 2025-10-23 23_59_59.csv'
+
+
+def same_named_exports():
+    """Two employees' exports sharing one file name, each with its own date/duration columns"""
+    ann = pd.DataFrame({
+        'Date Time': ['01/06/2025 10:00', '01/07/2025 11:00', '01/08/2025 12:00'],
+        'Duration': ['02m 00s', '02m 00s', '02m 00s'],
+        'phone_cleaned': ['0771111111'] * 3,
+        'employee': 'Ann',
+    })
+    bob = pd.DataFrame({
+        'Call Date': ['01/06/2025 10:00', '01/07/2025 11:00', '01/08/2025 12:00'],
+        'Call Duration': ['02m 00s', '02m 00s', '02m 00s'],
+        'phone_cleaned': ['0772222222'] * 3,
+        'employee': 'Bob',
+    })
+    return pd.concat([ann, bob], ignore_index=True).assign(original_file=REPORT, name='Lead')
+
+
+def test_columns_are_detected_per_employee_file():
+    for engine in ['groupby', 'loop']:
+        analysis = MetricsCalculator().generate_call_analysis_table(same_named_exports(), engine=engine)
+        bob = analysis.set_index('phone').loc['0772222222']
+        assert bob['total_time_spent_seconds'] == 360
+        assert bob['total_call_days'] == 3
+        assert bob['first_call_date'] == '2025-01-06 10:00:00'
+
+
+def test_call_cube_columns_are_detected_per_employee_file():
+    cube = MetricsCalculator().build_call_cube(same_named_exports())
+    assert cube.groupby('employee', observed=True)['talk_seconds'].sum().to_dict() == {'Ann': 360, 'Bob': 360}
@@ -0,0 +1,99 @@
+# tests/test_incremental_call_analysis.py
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'helpers'))
+
+from metric_calculator import MetricsCalculator
+
+
+def make_call_logs(rows=3000, phones=400, files=3, seed=0):
+    """Cleaned call logs as DataCleaner.merge_call_logs returns them: chronological rows per file"""
+    rng = np.random.default_rng(seed)
+    subscribers = rng.integers(700_000_000, 789_999_999, phones)
+    names = np.array([f"Lead {number}" for number in range(phones)], dtype=object)
+    callee = rng.integers(0, phones, rows)
+    start = pd.Timestamp('2025-01-01').value // 10**9
+    moments = pd.to_datetime(np.sort(rng.integers(start, start + 200 * 86_400, rows)), unit='s')
+    talk = rng.exponential(90, rows).astype(int) * (rng.random(rows) < 0.6)
+    file = rng.integers(0, files, rows)
+    return pd.DataFrame({
+        'name': names[callee],
+        'phone': 94 * 10**9 + subscribers[callee],
+        'original_file': [f"Report {number}.csv" for number in file],
+        'employee': [f"Employee {number % 2}" for number in file],
+        'Date Time': moments.strftime('%m/%d/%Y %H:%M'),
+        'Duration': [f"{seconds // 60:02d}m {seconds % 60:02d}s" for seconds in talk],
+        'phone_cleaned': ['0' + str(number) for number in subscribers[callee]],
+    }).sort_values('original_file', kind='stable', ignore_index=True)
+
+
+def full_analysis(call_logs_df):
+    return MetricsCalculator().generate_call_analysis_table(call_logs_df)
+
+
+def incremental_analysis(call_logs_df, state_path):
+    return MetricsCalculator().update_call_analysis(call_logs_df, state_path)
+
+
+def by_file_prefix(call_logs_df, share):
+    """The first share of every file's rows - the call logs as an earlier export held them"""
+    position = call_logs_df.groupby('original_file', sort=False).cumcount()
+    size = call_logs_df.groupby('original_file', sort=False)['original_file'].transform('size')
+    return call_logs_df[position < size * share].reset_index(drop=True)
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    return str(tmp_path / 'call_analysis_state.pkl')
+
+
+def test_first_run_equals_full_recompute(state_path):
+    call_logs = make_call_logs()
+    pd.testing.assert_frame_equal(incremental_analysis(call_logs, state_path), full_analysis(call_logs))
+
+
+def test_appended_rows_equal_full_recompute(state_path):
+    call_logs = make_call_logs()
+    incremental_analysis(by_file_prefix(call_logs, 0.6), state_path)
+
+    updated = incremental_analysis(call_logs, state_path)
+    pd.testing.assert_frame_equal(updated, full_analysis(call_logs))
+
+
+def test_edited_rows_equal_full_recompute(state_path):
+    call_logs = make_call_logs()
+    incremental_analysis(call_logs, state_path)
+
+    edited = call_logs.copy()
+    edited.loc[:49, 'Duration'] = '59m 59s'
+    pd.testing.assert_frame_equal(incremental_analysis(edited, state_path), full_analysis(edited))
+
+
+def test_edited_and_appended_rows_equal_full_recompute(state_path):
+    call_logs = make_call_logs()
+    incremental_analysis(by_file_prefix(call_logs, 0.5), state_path)
+
+    edited = call_logs.copy()
+    edited.loc[:9, 'name'] = 'Renamed Lead'
+    pd.testing.assert_frame_equal(incremental_analysis(edited, state_path), full_analysis(edited))
+
+
+def test_removed_file_equals_full_recompute(state_path):
+    call_logs = make_call_logs()
+    incremental_analysis(call_logs, state_path)
+
+    remaining = call_logs[call_logs['original_file'] != 'Report 0.csv'].reset_index(drop=True)
+    pd.testing.assert_frame_equal(incremental_analysis(remaining, state_path), full_analysis(remaining))
+
+
+def test_engines_round_the_same_average_gap(state_path):
+    # Averages landing on a rounding tie once rounded differently per engine
+    call_logs = make_call_logs(rows=20_000, phones=3000, seed=1)
+    loop = MetricsCalculator().generate_call_analysis_table(call_logs, engine='loop')
+    pd.testing.assert_frame_equal(full_analysis(call_logs), loop)
+    pd.testing.assert_frame_equal(incremental_analysis(call_logs, state_path), loop)